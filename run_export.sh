@@ -49,7 +49,7 @@ install_dependencies() {
         exit 1
     fi
     
-    if ! python3 -c "import requests, pandas" &> /dev/null; then
+    if ! python3 -c "import requests" &> /dev/null; then
         print_warning "Required dependencies not found. Installing..."
         pip3 install -r requirements.txt
         print_success "Dependencies installed"
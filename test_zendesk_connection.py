@@ -7,9 +7,12 @@ Run this before the main export script to ensure everything is working.
 import requests
 import argparse
 import sys
+from typing import Optional
 from zendesk_export import load_config_from_file
+from zendesk_http import ZendeskAuthError, create_session
+from zendesk_http_cache import HttpCache
 
-def test_zendesk_connection(subdomain: str, email: str, api_token: str) -> bool:
+def test_zendesk_connection(subdomain: str, email: str, api_token: str, http_cache_dir: Optional[str] = None) -> bool:
     """
     Test connection to Zendesk API.
     
@@ -17,18 +20,15 @@ def test_zendesk_connection(subdomain: str, email: str, api_token: str) -> bool:
         subdomain: Zendesk subdomain
         email: Zendesk email
         api_token: Zendesk API token
+        http_cache_dir: Directory for an on-disk HTTP cache (optional)
         
     Returns:
         True if connection successful, False otherwise
     """
     base_url = f"https://{subdomain}.zendesk.com/api/v2"
     
-    session = requests.Session()
-    session.auth = (f"{email}/token", api_token)
-    session.headers.update({
-        'Content-Type': 'application/json',
-        'Accept': 'application/json'
-    })
+    http_cache = HttpCache(http_cache_dir) if http_cache_dir else None
+    session = create_session(email, api_token, http_cache=http_cache)
     
     print(f"🔍 Testing connection to {base_url}...")
     
@@ -69,14 +69,21 @@ def test_zendesk_connection(subdomain: str, email: str, api_token: str) -> bool:
         else:
             print("⚠️  Could not retrieve user information")
         
+        if http_cache:
+            print(f"ℹ️  HTTP Cache: {http_cache.summary()}")
+        
         return True
         
+    except ZendeskAuthError as e:
+        print(f"❌ Connection failed: {e}")
+        print("   This usually means invalid credentials (email or API token)")
+        
+        return False
+        
     except requests.exceptions.RequestException as e:
         print(f"❌ Connection failed: {e}")
         
-        if "401" in str(e):
-            print("   This usually means invalid credentials (email or API token)")
-        elif "403" in str(e):
+        if "403" in str(e):
             print("   This usually means insufficient permissions")
         elif "404" in str(e):
             print("   This usually means invalid subdomain")
@@ -89,6 +96,7 @@ def main():
     parser.add_argument('--email', help='Your Zendesk email address')
     parser.add_argument('--api-token', help='Your Zendesk API token')
     parser.add_argument('--config-file', help='Path to .env file containing configuration')
+    parser.add_argument('--http-cache', help='Directory for an on-disk HTTP cache with ETag revalidation (optional)')
     
     args = parser.parse_args()
     
@@ -111,7 +119,7 @@ def main():
         sys.exit(1)
     
     # Test connection
-    success = test_zendesk_connection(subdomain, email, api_token)
+    success = test_zendesk_connection(subdomain, email, api_token, args.http_cache)
     
     if success:
         print("\n🎉 Connection test successful! You can now run the main export script.")
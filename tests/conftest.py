@@ -0,0 +1,44 @@
+"""Shared fixtures: a local mock Zendesk server and exporters pointed at it."""
+
+import csv
+import os
+import sys
+
+import pytest
+
+# The exporters are top-level scripts, not a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zendesk_mock_server import MockZendeskServer, SyntheticHelpCenter  # noqa: E402
+
+# 450 articles make five listing pages of 100, the last one partial
+ARTICLES = 450
+
+
+@pytest.fixture
+def help_center():
+    return SyntheticHelpCenter(articles=ARTICLES, users=12, body_size=100)
+
+
+@pytest.fixture
+def server(help_center):
+    with MockZendeskServer(help_center) as mock_server:
+        yield mock_server
+
+
+@pytest.fixture
+def make_exporter(server, tmp_path, monkeypatch):
+    """Build exporters that talk to the mock server and write into a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+
+    def make(exporter_class, **kwargs):
+        exporter = exporter_class('acme', 'agent@example.com', 'token', **kwargs)
+        exporter.base_url = server.base_url
+        return exporter
+
+    return make
+
+
+def read_csv(filename):
+    with open(filename, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
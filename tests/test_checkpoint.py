@@ -0,0 +1,157 @@
+"""Resumable exports and failing listings."""
+
+import json
+import os
+
+import pytest
+import requests
+
+from conftest import ARTICLES, read_csv
+from zendesk_api import iter_offset_pages_parallel
+from zendesk_checkpoint import ExportCheckpoint
+from zendesk_export_improved import ZendeskExporter
+
+
+class Interrupted(Exception):
+    """Stands in for a crash or Ctrl-C in the middle of an export."""
+
+
+def interrupt_after(exporter, monkeypatch, articles: int):
+    process_article = exporter.process_article
+    calls = 0
+
+    def interrupting_process_article(*args):
+        nonlocal calls
+        calls += 1
+        if calls > articles:
+            raise Interrupted()
+        return process_article(*args)
+
+    monkeypatch.setattr(exporter, 'process_article', interrupting_process_article)
+
+
+def count_processed(exporter, monkeypatch):
+    process_article = exporter.process_article
+    processed = []
+
+    def counting_process_article(article, *args):
+        processed.append(article.get('id'))
+        return process_article(article, *args)
+
+    monkeypatch.setattr(exporter, 'process_article', counting_process_article)
+    return processed
+
+
+def record_rows(exporter, monkeypatch):
+    process_article = exporter.process_article
+    rows = []
+
+    def recording_process_article(*args):
+        rows.append(process_article(*args))
+        return rows[-1]
+
+    monkeypatch.setattr(exporter, 'process_article', recording_process_article)
+    return rows
+
+
+def spooled_ids(checkpoint_path):
+    with open(f"{checkpoint_path}.rows.jsonl", 'r', encoding='utf-8') as f:
+        return [json.loads(line)['article_id'] for line in f]
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_interrupted_export_resumes_to_the_rows_of_a_clean_run(make_exporter, monkeypatch, workers):
+    clean_rows = read_csv(make_exporter(ZendeskExporter, workers=workers).run_export('clean.csv'))
+
+    first = make_exporter(ZendeskExporter, workers=workers, checkpoint=ExportCheckpoint('export.ckpt'))
+    interrupt_after(first, monkeypatch, 250)
+    with pytest.raises(Interrupted):
+        first.run_export('articles.csv')
+
+    # Whole pages were recorded before the interruption
+    spooled = spooled_ids('export.ckpt')
+    assert len(spooled) == 200
+    assert not os.path.exists('articles.csv')
+
+    second = make_exporter(ZendeskExporter, workers=workers, checkpoint=ExportCheckpoint('export.ckpt'))
+    processed = count_processed(second, monkeypatch)
+    filename = second.run_export()
+
+    assert filename == 'articles.csv'
+    assert read_csv(filename) == clean_rows
+    # Spooled articles are not enriched again
+    assert len(processed) == ARTICLES - len(spooled)
+    assert not set(processed) & set(spooled)
+    assert not os.path.exists('export.ckpt')
+    assert not os.path.exists('export.ckpt.rows.jsonl')
+
+
+def test_resume_recovers_from_a_torn_spool_line(make_exporter, monkeypatch):
+    clean = make_exporter(ZendeskExporter)
+    processed_rows = record_rows(clean, monkeypatch)
+    clean_rows = read_csv(clean.run_export('clean.csv'))
+
+    first = make_exporter(ZendeskExporter, checkpoint=ExportCheckpoint('export.ckpt'))
+    interrupt_after(first, monkeypatch, 250)
+    with pytest.raises(Interrupted):
+        first.run_export('articles.csv')
+
+    # A crash while spooling the next page: one row made it to disk, the next one only partly
+    written = len(spooled_ids('export.ckpt'))
+    next_row, torn_row = processed_rows[written], processed_rows[written + 1]
+    with open('export.ckpt.rows.jsonl', 'a', encoding='utf-8') as f:
+        f.write(json.dumps(next_row) + '\n')
+        f.write(json.dumps(torn_row)[:20])
+
+    second = make_exporter(ZendeskExporter, checkpoint=ExportCheckpoint('export.ckpt'))
+    processed = count_processed(second, monkeypatch)
+    rows = read_csv(second.run_export())
+
+    assert rows == clean_rows
+    # The fully spooled row is reused; the torn one is enriched again
+    assert next_row['article_id'] not in processed
+    assert torn_row['article_id'] in processed
+
+
+def test_unreadable_checkpoint_starts_a_fresh_export(make_exporter):
+    with open('export.ckpt', 'w') as f:
+        f.write('{"position": ')
+
+    filename = make_exporter(ZendeskExporter, checkpoint=ExportCheckpoint('export.ckpt')).run_export('articles.csv')
+
+    assert len(read_csv(filename)) == ARTICLES
+
+
+def fail_offset_page(server, failing_page: int):
+    route = server.route
+
+    def failing_route(path, query, host):
+        if path.endswith('/help_center/articles.json') and query.get('page') == str(failing_page):
+            return 404, {'error': 'RecordNotFound'}
+        return route(path, query, host)
+
+    server.route = failing_route
+
+
+def test_offset_listing_stops_at_the_first_failing_page(server):
+    fail_offset_page(server, 3)
+    server.reset_counters()
+    pages = []
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        for data in iter_offset_pages_parallel(requests.Session(), f"{server.base_url}/help_center/articles.json",
+                                               per_page=10, workers=2):
+            pages.append(data['page'])
+
+    assert pages == [1, 2]
+    # 45 pages exist; only the first one and the buffered look-ahead were requested
+    assert server.reset_counters()['requests'] <= 1 + 2 * 2 + 2
+
+
+def test_failing_listing_page_fails_the_export(make_exporter, server):
+    fail_offset_page(server, 3)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        make_exporter(ZendeskExporter, workers=2).run_export('articles.csv')
+    # No truncated file is left behind
+    assert not os.path.exists('articles.csv')
@@ -0,0 +1,73 @@
+"""Export diffs across CSV and columnar formats."""
+
+import csv
+import json
+
+import pytest
+
+from conftest import ARTICLES
+from zendesk_diff import ExportDiff
+from zendesk_export_improved import ZendeskExporter
+from zendesk_sinks import ArrowSink
+
+COLUMNS = ['article_id', 'article_title', 'status', 'views', 'updated_at']
+
+OLD_ROWS = [
+    {'article_id': 1, 'article_title': 'First', 'status': 'published', 'views': 10, 'updated_at': '2024-01-01T08:00:00Z'},
+    {'article_id': 2, 'article_title': 'Second', 'status': 'published', 'views': 20, 'updated_at': '2024-01-02T08:00:00Z'},
+    {'article_id': 3, 'article_title': 'Third', 'status': 'draft', 'views': 30, 'updated_at': '2024-01-03T08:00:00Z'}
+]
+
+NEW_ROWS = [
+    dict(OLD_ROWS[0], views=15),
+    dict(OLD_ROWS[1], status='draft'),
+    {'article_id': 4, 'article_title': 'Fourth', 'status': 'published', 'views': 0, 'updated_at': '2024-02-01T08:00:00Z'}
+]
+
+
+def write_export(filename, rows):
+    if filename.endswith('.csv'):
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with ArrowSink(filename, COLUMNS, filename.rsplit('.', 1)[1]) as sink:
+            sink.write_rows(rows)
+    return filename
+
+
+def test_csv_and_parquet_exports_of_the_same_data_are_identical(make_exporter):
+    pytest.importorskip('pyarrow')
+    csv_file = make_exporter(ZendeskExporter).run_export('articles.csv')
+    parquet_file = make_exporter(ZendeskExporter, output_format='parquet').run_export('articles.parquet')
+
+    diff = ExportDiff(csv_file, parquet_file)
+    # Typed timestamps and integers normalize to the CSV's text
+    assert list(diff.iter_changes()) == []
+    assert diff.summary.unchanged == ARTICLES
+    assert diff.summary.added_columns == diff.summary.removed_columns == []
+
+
+@pytest.mark.parametrize('new_format', ['csv', 'parquet', 'arrow'])
+def test_delta_file_lists_added_removed_and_changed_articles(tmp_path, new_format):
+    if new_format != 'csv':
+        pytest.importorskip('pyarrow')
+    old_file = write_export(str(tmp_path / 'old.csv'), OLD_ROWS)
+    new_file = write_export(str(tmp_path / f"new.{new_format}"), NEW_ROWS)
+    delta_file = str(tmp_path / 'delta.jsonl')
+
+    summary = ExportDiff(old_file, new_file).write(delta_file)
+
+    with open(delta_file, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert records == [
+        {'change': 'changed', 'article_id': 1, 'columns': {'views': [10, 15]}},
+        {'change': 'changed', 'article_id': 2, 'columns': {'status': ['published', 'draft']}},
+        {'change': 'added', 'article_id': 4,
+         'row': {'article_title': 'Fourth', 'status': 'published', 'views': 0, 'updated_at': '2024-02-01T08:00:00Z'}},
+        {'change': 'removed', 'article_id': 3, 'article_title': 'Third'}
+    ]
+    assert (summary.added, summary.removed, summary.changed, summary.unchanged) == (1, 1, 2, 0)
+    assert summary.column_deltas['views'] == 5
+    assert summary.status_transitions == {'published → draft': 1}
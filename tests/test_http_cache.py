@@ -0,0 +1,76 @@
+"""On-disk HTTP cache: conditional requests, max-age freshness and per-account entries."""
+
+from conftest import ARTICLES, read_csv
+from zendesk_export_improved import ZendeskExporter
+from zendesk_http import create_session
+from zendesk_http_cache import HttpCache
+
+
+def get_page(session, server, page: int = 1):
+    response = session.get(f"{server.base_url}/help_center/articles.json", params={'per_page': 100, 'page': page})
+    response.raise_for_status()
+    return response.json()
+
+
+def test_unchanged_page_is_revalidated_with_a_304(server, tmp_path):
+    cache = HttpCache(str(tmp_path / 'cache'))
+    session = create_session('agent@example.com', 'token', http_cache=cache)
+    server.reset_counters()
+
+    pages = [get_page(session, server) for _ in range(3)]
+
+    assert cache.stats() == {'hits': 0, 'revalidated': 2, 'misses': 1}
+    assert server.reset_counters() == {'requests': 3, 'status_200': 1, 'status_304': 2}
+    # The 304s are answered with the stored body
+    assert pages[1] == pages[2] == pages[0]
+    assert len(pages[0]['articles']) == 100
+
+
+def test_fresh_entry_is_served_without_a_request(server, tmp_path):
+    server.max_age = 60
+    cache = HttpCache(str(tmp_path / 'cache'))
+    session = create_session('agent@example.com', 'token', http_cache=cache)
+    server.reset_counters()
+
+    first = get_page(session, server)
+    second = get_page(session, server)
+    other_page = get_page(session, server, page=2)
+
+    assert second == first
+    assert other_page['page'] == 2
+    assert cache.stats() == {'hits': 1, 'revalidated': 0, 'misses': 2}
+    assert server.reset_counters()['requests'] == 2
+
+
+def test_accounts_sharing_a_cache_directory_keep_separate_entries(server, tmp_path):
+    directory = str(tmp_path / 'cache')
+    first_cache, second_cache = HttpCache(directory), HttpCache(directory)
+    first = create_session('first@example.com', 'token', http_cache=first_cache)
+    second = create_session('second@example.com', 'token', http_cache=second_cache)
+    server.reset_counters()
+
+    get_page(first, server)
+    # Another account never revalidates, let alone reuses, the first account's entry
+    get_page(second, server)
+    assert second_cache.stats() == {'hits': 0, 'revalidated': 0, 'misses': 1}
+    assert server.reset_counters() == {'requests': 2, 'status_200': 2}
+
+    get_page(first, server)
+    get_page(second, server)
+    assert first_cache.stats()['revalidated'] == 1
+    assert second_cache.stats()['revalidated'] == 1
+    url = f"{server.base_url}/help_center/articles.json"
+    assert first_cache.key(url, first.auth) != second_cache.key(url, second.auth)
+
+
+def test_repeated_export_revalidates_every_request(make_exporter, tmp_path):
+    directory = str(tmp_path / 'cache')
+    first_cache = HttpCache(directory)
+    first_rows = read_csv(make_exporter(ZendeskExporter, http_cache=first_cache).run_export('first.csv'))
+    second_cache = HttpCache(directory)
+    second_rows = read_csv(make_exporter(ZendeskExporter, http_cache=second_cache).run_export('second.csv'))
+
+    assert len(first_rows) == ARTICLES
+    assert second_rows == first_rows
+    assert first_cache.stats()['revalidated'] == 0
+    assert second_cache.stats() == {'hits': 0, 'revalidated': first_cache.stats()['misses'], 'misses': 0}
@@ -0,0 +1,48 @@
+"""Incremental exports: merging changed, new and removed articles into the previous export."""
+
+import json
+
+import pytest
+
+from conftest import ARTICLES, read_csv
+from zendesk_export import ZendeskExporter as BasicExporter
+from zendesk_export_improved import ZendeskExporter as ImprovedExporter
+from zendesk_incremental import merge_export_rows
+from zendesk_mock_server import ARTICLE_ID_BASE
+
+
+def test_merge_replaces_changed_rows_in_place_appends_new_ones_and_drops_removed_ones():
+    previous = [{'article_id': '1', 'views': '10'}, {'article_id': '2', 'views': '20'}, {'article_id': '3', 'views': '30'}]
+    changed = [{'article_id': 4, 'views': 40}, {'article_id': 2, 'views': 25}, {'article_id': 3, 'views': 35}]
+
+    merged = merge_export_rows(previous, changed, removed_ids=[3])
+
+    # CSV rows carry string IDs, fresh rows integers; both key the same article
+    assert merged == [{'article_id': '1', 'views': '10'}, {'article_id': 2, 'views': 25}, {'article_id': 4, 'views': 40}]
+
+
+@pytest.mark.parametrize('exporter_class', [BasicExporter, ImprovedExporter])
+def test_incremental_run_merges_changes_into_the_full_export(make_exporter, server, help_center, exporter_class):
+    full_rows = read_csv(make_exporter(exporter_class).run_incremental_export('state.json', 'articles.csv'))
+    with open('state.json') as f:
+        start_time = json.load(f)['start_time']
+
+    help_center.edit(5, title='Edited article')
+    help_center.archive(7)
+    help_center.add_articles(1)
+    server.reset_counters()
+
+    rows = read_csv(make_exporter(exporter_class).run_incremental_export('state.json', 'articles.csv'))
+
+    by_id = {int(row['article_id']): row for row in rows}
+    assert len(rows) == ARTICLES
+    assert by_id[ARTICLE_ID_BASE + 5]['article_title'] == 'Edited article'
+    assert ARTICLE_ID_BASE + 7 not in by_id
+    assert int(rows[-1]['article_id']) == ARTICLE_ID_BASE + ARTICLES
+    # Everything else is carried over unchanged, in its original order
+    unchanged = [row for row in full_rows if int(row['article_id']) not in (ARTICLE_ID_BASE + 5, ARTICLE_ID_BASE + 7)]
+    assert [row for row in rows[:-1] if int(row['article_id']) != ARTICLE_ID_BASE + 5] == unchanged
+    # Only the changes were requested, not the full listing
+    assert server.reset_counters()['requests'] < 10
+    with open('state.json') as f:
+        assert json.load(f)['start_time'] >= start_time
@@ -0,0 +1,20 @@
+"""Request metrics written next to an export."""
+
+import json
+import os
+
+import pytest
+
+from zendesk_export_improved import ZendeskExporter
+
+
+def test_exports_in_different_formats_keep_their_own_metrics(make_exporter):
+    pytest.importorskip('pyarrow')
+    for output_format in ('csv', 'parquet', 'arrow'):
+        make_exporter(ZendeskExporter, output_format=output_format).run_export(f"articles.{output_format}")
+
+    for output_format in ('csv', 'parquet', 'arrow'):
+        assert os.path.exists(f"articles.{output_format}.metrics.prom")
+        with open(f"articles.{output_format}.metrics.json", encoding='utf-8') as f:
+            assert json.load(f)['totals']['requests'] > 0
+    assert not os.path.exists('articles.metrics.json')
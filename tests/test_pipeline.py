@@ -0,0 +1,110 @@
+"""Streaming pipeline: row order, concurrent metrics, fallbacks and shutdown on errors."""
+
+import os
+import threading
+
+import pytest
+
+import zendesk_pipeline
+from conftest import ARTICLES, read_csv
+from zendesk_export import ZendeskExporter as BasicExporter
+from zendesk_export_comprehensive import ZendeskComprehensiveExporter
+from zendesk_export_improved import ZendeskExporter as ImprovedExporter
+from zendesk_http import ZendeskAuthError
+
+
+@pytest.mark.parametrize('exporter_class', [BasicExporter, ImprovedExporter, ZendeskComprehensiveExporter])
+def test_pipeline_writes_the_same_rows_as_sync(make_exporter, exporter_class):
+    sync_file = make_exporter(exporter_class, engine='sync').run_export('sync.csv')
+    pipeline_file = make_exporter(exporter_class, engine='pipeline').run_export('pipeline.csv')
+
+    sync_rows = read_csv(sync_file)
+    assert len(sync_rows) == ARTICLES
+    # Metrics of several pages are fetched at once, but pages are written in listing order
+    assert read_csv(pipeline_file) == sync_rows
+
+
+def test_pipeline_fetches_metrics_of_several_pages_at_once(make_exporter, monkeypatch):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    release = threading.Event()
+    fetch_metrics_bulk = zendesk_pipeline.fetch_metrics_bulk
+
+    def counting_fetch(*args, **kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+            if peak >= 3:
+                release.set()
+        # Hold each batch until several are in flight (or give up after a second)
+        release.wait(1)
+        try:
+            return fetch_metrics_bulk(*args, **kwargs)
+        finally:
+            with lock:
+                active -= 1
+
+    monkeypatch.setattr(zendesk_pipeline, 'fetch_metrics_bulk', counting_fetch)
+    filename = make_exporter(ImprovedExporter, metrics_workers=4).run_export('articles.csv')
+
+    assert peak >= 3
+    assert len(read_csv(filename)) == ARTICLES
+
+
+def test_failing_row_stage_stops_every_stage_and_removes_the_output(make_exporter, monkeypatch):
+    exporter = make_exporter(ImprovedExporter)
+    process_article = exporter.process_article
+    calls = 0
+
+    def failing_process_article(*args):
+        nonlocal calls
+        calls += 1
+        if calls == 150:
+            raise RuntimeError('row shaping failed')
+        return process_article(*args)
+
+    monkeypatch.setattr(exporter, 'process_article', failing_process_article)
+
+    with pytest.raises(RuntimeError, match='row shaping failed'):
+        exporter.run_export('articles.csv')
+
+    assert not os.path.exists('articles.csv')
+    # Listing, author and metrics stages and the metrics pool have all finished
+    assert not [thread for thread in threading.enumerate()
+                if '_run_stage' in thread.name or thread.name.startswith('ThreadPoolExecutor')]
+
+
+def test_failing_metrics_stage_fails_the_export(make_exporter, monkeypatch):
+    def unauthorized(*args, **kwargs):
+        raise ZendeskAuthError('401 Unauthorized')
+
+    monkeypatch.setattr(zendesk_pipeline, 'fetch_metrics_bulk', unauthorized)
+
+    with pytest.raises(ZendeskAuthError):
+        make_exporter(ImprovedExporter).run_export('articles.csv')
+    assert not os.path.exists('articles.csv')
+
+
+@pytest.mark.parametrize('exporter_class', [ImprovedExporter, ZendeskComprehensiveExporter])
+def test_pipeline_falls_back_to_per_article_metrics(make_exporter, server, exporter_class):
+    server.bulk_metrics = False
+    rows = read_csv(make_exporter(exporter_class).run_export('articles.csv'))
+
+    assert len(rows) == ARTICLES
+    assert sum(int(row['views']) for row in rows) > 0
+
+
+def test_comprehensive_pipeline_tries_analytics_and_scraping_once(make_exporter, server, monkeypatch):
+    server.bulk_metrics = False
+    monkeypatch.setattr('zendesk_export_comprehensive.fetch_metrics_individually', lambda *args, **kwargs: {})
+    exporter = make_exporter(ZendeskComprehensiveExporter)
+    tried = []
+    monkeypatch.setattr(exporter, 'try_metrics_method_3', lambda article_ids: tried.append(3) or {})
+    monkeypatch.setattr(exporter, 'try_metrics_method_4', lambda articles: tried.append(4) or {})
+
+    rows = read_csv(exporter.run_export('articles.csv'))
+
+    assert len(rows) == ARTICLES
+    assert tried == [3, 4]
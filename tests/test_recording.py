@@ -0,0 +1,44 @@
+"""Recording API responses and replaying them without the network."""
+
+import pytest
+
+from zendesk_export import ZendeskExporter as BasicExporter
+from zendesk_export_improved import ZendeskExporter as ImprovedExporter
+from zendesk_recording import ApiRecording
+
+
+def read_bytes(filename):
+    with open(filename, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('exporter_class', [BasicExporter, ImprovedExporter])
+def test_replay_reproduces_the_recorded_export(make_exporter, server, exporter_class):
+    recording = ApiRecording('recording', 'record', subdomain='acme')
+    recorded_file = make_exporter(exporter_class, recording=recording).run_export('recorded.csv')
+    recording.close()
+    assert recording.recorded > 0
+
+    # Nothing may reach the network during a replay
+    server.stop()
+    replay = ApiRecording('recording', 'replay')
+    replayed_file = make_exporter(exporter_class, recording=replay).run_export('replayed.csv')
+
+    assert read_bytes(replayed_file) == read_bytes(recorded_file)
+    assert replay.missing == 0
+    assert replay.replayed == recording.recorded
+
+
+def test_unrecorded_request_replays_as_a_404(make_exporter, server):
+    recording = ApiRecording('recording', 'record', subdomain='acme')
+    make_exporter(ImprovedExporter, recording=recording).run_export('recorded.csv')
+    recording.close()
+
+    server.stop()
+    replay = ApiRecording('recording', 'replay')
+    session = make_exporter(ImprovedExporter, recording=replay).session
+    response = session.get(f"{server.base_url}/help_center/articles/999/metrics.json")
+
+    assert response.status_code == 404
+    assert response.json() == {'error': 'RecordNotFound'}
+    assert replay.missing == 1
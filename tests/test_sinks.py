@@ -0,0 +1,104 @@
+"""Output sinks: typed columnar files and the SQLite upsert table."""
+
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import ARTICLES
+from zendesk_export_improved import ZendeskExporter
+from zendesk_sinks import ArrowSink, SqliteSink, iter_rows, read_rows
+
+COLUMNS = ['article_id', 'article_title', 'article_author_name', 'views', 'status', 'updated_at']
+
+
+def make_rows(count: int, authors: int):
+    return [{
+        'article_id': 1000 + index,
+        'article_title': f"Article {index}",
+        # Later batches bring author names the earlier ones did not have
+        'article_author_name': None if index % 13 == 0 else f"Author {index * authors // count}",
+        'views': index * 3,
+        'status': 'draft' if index % 4 == 0 else 'published',
+        'updated_at': f"2024-01-{1 + index % 28:02d}T12:00:00Z"
+    } for index in range(count)]
+
+
+def typed(row):
+    return dict(row, updated_at=datetime.fromisoformat(row['updated_at'].replace('Z', '+00:00')))
+
+
+@pytest.mark.parametrize('output_format', ['parquet', 'arrow'])
+def test_columnar_sink_round_trips_rows_across_batches(tmp_path, output_format):
+    pytest.importorskip('pyarrow')
+    filename = str(tmp_path / f"articles.{output_format}")
+    rows = make_rows(50, authors=10)
+
+    with ArrowSink(filename, COLUMNS, output_format, row_group_rows=7) as sink:
+        sink.write_rows(rows[:20])
+        sink.write_rows(rows[20:])
+
+    assert sink.rows_written == len(rows)
+    expected = [typed(row) for row in rows]
+    for read in (read_rows(filename), list(iter_rows(filename, batch_rows=6))):
+        for row in read:
+            row['updated_at'] = row['updated_at'].astimezone(timezone.utc)
+        assert read == expected
+
+
+def test_arrow_dictionary_grows_with_deltas(tmp_path):
+    pytest.importorskip('pyarrow')
+    import pyarrow.ipc as pa_ipc
+
+    filename = str(tmp_path / 'articles.arrow')
+    rows = make_rows(30, authors=15)
+
+    with ArrowSink(filename, COLUMNS, 'arrow', row_group_rows=5) as sink:
+        sink.write_rows(rows)
+
+    with pa_ipc.open_file(filename) as reader:
+        assert reader.num_record_batches == 6
+        names = [reader.get_batch(index).column('article_author_name') for index in range(reader.num_record_batches)]
+    # Every batch shares one growing dictionary, so earlier entries keep their index
+    dictionaries = [column.dictionary.to_pylist() for column in names]
+    for before, after in zip(dictionaries, dictionaries[1:]):
+        assert after[:len(before)] == before
+    assert len(dictionaries[-1]) == len({row['article_author_name'] for row in rows} - {None})
+
+
+def sqlite_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('SELECT article_id, views FROM articles ORDER BY article_id').fetchall()
+    finally:
+        conn.close()
+
+
+def test_repeated_export_upserts_into_the_same_sqlite_rows(make_exporter):
+    make_exporter(ZendeskExporter, sinks=['sqlite:articles.db']).run_export('first.csv')
+    first = sqlite_rows('articles.db')
+    make_exporter(ZendeskExporter, sinks=['sqlite:articles.db']).run_export('second.csv')
+
+    assert len(first) == ARTICLES
+    assert sqlite_rows('articles.db') == first
+
+
+def test_sqlite_sink_updates_changed_rows_and_adds_missing_columns(tmp_path):
+    path = str(tmp_path / 'articles.db')
+    rows = make_rows(10, authors=5)
+
+    with SqliteSink(path, ['article_id', 'views'], batch_rows=3) as sink:
+        sink.write_rows(rows)
+    # A later export with more columns and changed values
+    with SqliteSink(path, COLUMNS, batch_rows=3) as sink:
+        sink.write_rows(dict(row, views=row['views'] + 1) for row in rows[5:])
+
+    conn = sqlite3.connect(path)
+    try:
+        stored = conn.execute('SELECT article_id, views, status FROM articles ORDER BY article_id').fetchall()
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(articles)')}
+    finally:
+        conn.close()
+    assert columns == set(COLUMNS) | {'exported_at'}
+    assert stored == [(row['article_id'], row['views'], None) for row in rows[:5]] + \
+        [(row['article_id'], row['views'] + 1, row['status']) for row in rows[5:]]
@@ -0,0 +1,619 @@
+"""
+Shared Zendesk Help Center API helpers.
+
+These functions are used by zendesk_export.py, zendesk_export_improved.py and
+zendesk_export_comprehensive.py so the exporters page through the API the same way.
+"""
+
+import math
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from zendesk_http import AdaptiveRateLimiter, ZendeskAuthError, describe_error
+
+
+def iter_cursor_pages(session: requests.Session, url: str, params: Optional[Dict] = None,
+                      page_size: int = 100) -> Iterator[Dict]:
+    """
+    Iterate over a Help Center listing endpoint using cursor pagination.
+
+    Pages are requested with ``page[size]`` and followed through ``links.next``
+    while ``meta.has_more`` is true. Each decoded page is yielded as soon as it
+    arrives, so callers never hold more than one page in memory.
+
+    Args:
+        session: Authenticated requests session
+        url: Listing endpoint URL (e.g. .../help_center/articles.json)
+        params: Extra query parameters for the first request
+        page_size: Number of records per page (maximum 100)
+
+    Yields:
+        Decoded JSON page dictionaries
+    """
+    next_url = url
+    request_params = dict(params or {})
+    request_params['page[size]'] = page_size
+
+    while next_url:
+        response = session.get(next_url, params=request_params)
+        response.raise_for_status()
+
+        data = response.json()
+        yield data
+
+        # The next link already carries the full query string
+        next_url = next_page_url(data)
+        request_params = None
+
+
+def next_page_url(data: Dict) -> Optional[str]:
+    """
+    Return the URL of the page after a cursor-paginated page, if there is one.
+
+    Args:
+        data: Decoded listing page
+
+    Returns:
+        URL of the next page, or None on the last page
+    """
+    meta = data.get('meta')
+    if meta is None:
+        # Endpoint answered with offset pagination; follow next_page instead
+        return data.get('next_page')
+    if meta.get('has_more'):
+        return (data.get('links') or {}).get('next')
+    return None
+
+
+def iter_offset_pages_parallel(session: requests.Session, url: str, params: Optional[Dict] = None,
+                               per_page: int = 100, workers: int = 4, start_page: int = 1) -> Iterator[Dict]:
+    """
+    Fetch an offset-paginated listing with a bounded pool of worker threads.
+
+    The first page is fetched on its own to learn ``page_count`` (or ``count``);
+    the remaining pages are independent and are fanned out over ``workers``
+    threads sharing ``session``. Pages are yielded strictly in page order, and
+    at most ``2 * workers`` pages are buffered ahead of the consumer.
+
+    The first failing request stops every worker: queued pages are cancelled,
+    running workers skip their request, and the original exception is raised
+    to the caller.
+
+    Args:
+        session: Authenticated requests session shared by all workers
+        url: Listing endpoint URL
+        params: Extra query parameters for every request
+        per_page: Number of records per page (maximum 100)
+        workers: Maximum number of concurrent requests
+        start_page: First page to fetch, for resuming an interrupted listing
+
+    Yields:
+        Decoded JSON page dictionaries in page order
+    """
+    base_params = dict(params or {})
+    base_params['per_page'] = per_page
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def fetch(page: int) -> Optional[Dict]:
+        if stop.is_set():
+            return None
+        response = session.get(url, params={**base_params, 'page': page})
+        response.raise_for_status()
+        return response.json()
+
+    def on_done(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            errors.append(future.exception())
+            stop.set()
+
+    first = fetch(start_page)
+    yield first
+
+    page_count = first.get('page_count')
+    if not page_count:
+        page_count = math.ceil((first.get('count') or 0) / per_page)
+    if page_count <= start_page:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending: Deque = deque()
+    next_page = start_page + 1
+
+    try:
+        while pending or next_page <= page_count:
+            while next_page <= page_count and len(pending) < workers * 2:
+                future = pool.submit(fetch, next_page)
+                future.add_done_callback(on_done)
+                pending.append(future)
+                next_page += 1
+
+            data = pending.popleft().result()
+            if data is None:
+                raise errors[0]
+            yield data
+    finally:
+        stop.set()
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def iter_listing_pages(session: requests.Session, url: str, params: Optional[Dict] = None,
+                       page_size: int = 100, workers: int = 1,
+                       resume_from: Optional[Dict] = None) -> Iterator[Tuple[Dict, Dict]]:
+    """
+    Iterate over a listing endpoint, reporting where to resume after every page.
+
+    One worker follows cursor pagination; more workers fetch offset pages in
+    parallel. Each page is yielded with a JSON-serializable position that,
+    passed back as ``resume_from``, continues the listing after that page.
+    A position from a cursor listing always resumes with cursor pagination,
+    and an offset position with offset pagination, whatever ``workers`` is.
+
+    Args:
+        session: Authenticated requests session
+        url: Listing endpoint URL
+        params: Extra query parameters
+        page_size: Number of records per page (maximum 100)
+        workers: Maximum number of concurrent requests
+        resume_from: Position of the last completed page (optional)
+
+    Yields:
+        Tuples of (decoded page, position after that page)
+    """
+    pages = resume_from.get('pages', 0) if resume_from else 0
+    mode = resume_from.get('mode') if resume_from else ('offset' if workers > 1 else 'cursor')
+
+    if mode == 'offset':
+        start_page = resume_from.get('next_page', 1) if resume_from else 1
+        for data in iter_offset_pages_parallel(session, url, params, per_page=page_size,
+                                               workers=max(1, workers), start_page=start_page):
+            pages += 1
+            yield data, {'mode': 'offset', 'next_page': start_page + 1, 'pages': pages}
+            start_page += 1
+        return
+
+    if resume_from:
+        # The saved next link already carries the full query string
+        next_url = resume_from.get('next_url')
+        if not next_url:
+            return
+        source = _iter_cursor_links(session, next_url)
+    else:
+        source = iter_cursor_pages(session, url, params, page_size)
+
+    for data in source:
+        pages += 1
+        yield data, {'mode': 'cursor', 'next_url': next_page_url(data), 'pages': pages}
+
+
+def _iter_cursor_links(session: requests.Session, next_url: str) -> Iterator[Dict]:
+    while next_url:
+        response = session.get(next_url)
+        response.raise_for_status()
+        data = response.json()
+        yield data
+        next_url = next_page_url(data)
+
+
+# Article fields read by the exporters for each output column; any other
+# column is taken from the article field of the same name
+COLUMN_FIELDS = {
+    'article_title': ('title',),
+    'article_link': ('id',),
+    'article_author_name': ('author_id',),
+    'author_email': ('author_id',),
+    'article_id': ('id',),
+    'views': ('id',),
+    'comments': ('id',),
+    'votes': ('id',),
+    'status': ('draft',),
+    'section_name': ('section_id',),
+    'category_id': ('section_id', 'category_id'),
+    'category_name': ('section_id',),
+    'article_body': ('body',)
+}
+
+
+def article_fields(columns: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Article fields needed to produce a set of output columns.
+
+    ``id`` and ``author_id`` are always kept because enrichment looks up
+    metrics and authors by them. The HTML ``body`` is only kept when a column
+    asks for it.
+
+    Args:
+        columns: Output columns
+
+    Returns:
+        Tuple of article field names
+    """
+    fields = {'id': None, 'author_id': None}
+    for column in columns:
+        for field in COLUMN_FIELDS.get(column, (column,)):
+            fields[field] = None
+    return tuple(fields)
+
+
+# Fields stored in ArticleRecord slots; other projected fields go to a small overflow dict
+RECORD_SLOTS = ('id', 'author_id', 'title', 'created_at', 'updated_at', 'draft', 'section_id',
+                'category_id', 'vote_sum', 'vote_count', 'body')
+_RECORD_SLOT_SET = frozenset(RECORD_SLOTS)
+
+
+class ArticleRecord:
+    """
+    Compact in-memory article holding only the projected fields.
+
+    A full article from the API is a dictionary of some thirty keys including
+    the HTML body; a record keeps a handful of slots. It offers the read-only
+    ``get`` / ``[]`` access the exporters use on article dictionaries.
+    """
+
+    __slots__ = RECORD_SLOTS + ('_extra',)
+
+    def __init__(self, article: Dict, fields: Iterable[str]):
+        extra = None
+        for field in fields:
+            if field not in article:
+                continue
+            if field in _RECORD_SLOT_SET:
+                setattr(self, field, article[field])
+            else:
+                if extra is None:
+                    extra = {}
+                extra[field] = article[field]
+        self._extra = extra
+
+    def get(self, field: str, default=None):
+        if field in _RECORD_SLOT_SET:
+            return getattr(self, field, default)
+        return self._extra.get(field, default) if self._extra else default
+
+    def __getitem__(self, field: str):
+        value = self.get(field, ArticleRecord)
+        if value is ArticleRecord:
+            raise KeyError(field)
+        return value
+
+    def __contains__(self, field: str) -> bool:
+        return self.get(field, ArticleRecord) is not ArticleRecord
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(id={self.get('id')!r}, title={self.get('title')!r})"
+
+
+def project_articles(articles: Iterable[Dict], fields: Iterable[str]) -> List[ArticleRecord]:
+    """
+    Reduce the articles of a listing page to compact records.
+
+    Args:
+        articles: Article dictionaries as returned by the API
+        fields: Fields to keep, usually from article_fields
+
+    Returns:
+        List of ArticleRecord
+    """
+    fields = tuple(fields)
+    return [ArticleRecord(article, fields) for article in articles]
+
+
+def user_record(user: Dict) -> Dict:
+    """
+    Reduce a Zendesk user object to the fields the exporters use.
+
+    Args:
+        user: User dictionary as returned by the Users API
+
+    Returns:
+        Dictionary with name, id and email
+    """
+    return {
+        'name': user.get('name') or 'Unknown Author',
+        'id': user.get('id'),
+        'email': user.get('email') or ''
+    }
+
+
+def collect_sideloaded_users(page: Dict, users: Dict[int, Dict]) -> int:
+    """
+    Add the top-level ``users`` sideload of a listing page to an author index.
+
+    Listing requests made with ``include=users`` carry every author of the page
+    in a top-level ``users`` array, so authors can be resolved without any
+    additional requests.
+
+    Args:
+        page: Decoded listing page
+        users: Author index to update, keyed by user ID
+
+    Returns:
+        Number of users added or refreshed
+    """
+    count = 0
+    for user in page.get('users') or []:
+        if user.get('id') is not None:
+            users[user['id']] = user_record(user)
+            count += 1
+    return count
+
+
+def fetch_users_bulk(session: requests.Session, base_url: str, user_ids: Iterable[int],
+                     chunk_size: int = 100, workers: int = 4) -> Dict[int, Dict]:
+    """
+    Resolve users in bulk through /users/show_many.json.
+
+    IDs are grouped into chunks of at most ``chunk_size`` (the endpoint limit is
+    100) and the chunks are requested concurrently. A failing chunk is reported
+    and skipped; its IDs are simply absent from the result so the caller can
+    fall back to single-user lookups for them.
+
+    Args:
+        session: Authenticated requests session
+        base_url: Zendesk API base URL
+        user_ids: User IDs to resolve
+        chunk_size: Number of IDs per request (maximum 100)
+        workers: Maximum number of concurrent requests
+
+    Returns:
+        Dictionary mapping user ID to user information
+    """
+    ids = sorted(set(user_ids))
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+    users: Dict[int, Dict] = {}
+
+    def fetch(chunk: List[int]) -> List[Dict]:
+        url = f"{base_url}/users/show_many.json"
+        response = session.get(url, params={'ids': ','.join(map(str, chunk))})
+        response.raise_for_status()
+        return response.json().get('users', [])
+
+    if not chunks:
+        return users
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+        futures = [pool.submit(fetch, chunk) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                for user in future.result():
+                    if user.get('id') is not None:
+                        users[user['id']] = user_record(user)
+            except ZendeskAuthError:
+                # Queued chunks would only fail the same way
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"⚠️  Bulk user lookup failed for {len(chunk)} users: {describe_error(e)}")
+
+    return users
+
+
+# Budget for the encoded article_ids value; keeps request URLs well below common 8 KB limits
+MAX_IDS_QUERY_LENGTH = 2000
+
+
+def chunk_ids_by_length(ids: Iterable[int], max_length: int = MAX_IDS_QUERY_LENGTH) -> List[List[int]]:
+    """
+    Split IDs into chunks whose comma-separated, URL-encoded form fits ``max_length``.
+
+    Args:
+        ids: IDs to split
+        max_length: Maximum encoded length of one chunk's query value
+
+    Returns:
+        List of ID chunks
+    """
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    length = 0
+
+    for value in ids:
+        # Each separator is sent as %2C
+        size = len(str(value)) + (3 if current else 0)
+        if current and length + size > max_length:
+            chunks.append(current)
+            current, length = [], 0
+            size = len(str(value))
+        current.append(value)
+        length += size
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def metric_record(metric: Dict) -> Dict:
+    """Reduce an article metric object to views, comments and votes."""
+    return {
+        'views': metric.get('views', 0),
+        'comments': metric.get('comments', 0),
+        'votes': metric.get('votes', 0)
+    }
+
+
+def fetch_metrics_bulk(session: requests.Session, base_url: str, article_ids: Iterable[int],
+                       workers: int = 4, max_length: int = MAX_IDS_QUERY_LENGTH) -> Tuple[Dict[int, Dict], int]:
+    """
+    Fetch article metrics from /help_center/articles/metrics.json in chunks.
+
+    Article IDs are split into chunks that keep the request URL short, and the
+    chunks are requested concurrently through the session's shared rate limiter.
+    Results of successful chunks are merged, so one failing chunk only loses the
+    metrics of its own articles.
+
+    Args:
+        session: Authenticated requests session
+        base_url: Zendesk API base URL
+        article_ids: Article IDs to fetch metrics for
+        workers: Maximum number of concurrent requests
+        max_length: Maximum encoded length of one chunk's article_ids value
+
+    Returns:
+        Tuple of (dictionary mapping article ID to metrics, number of failed chunks)
+    """
+    chunks = chunk_ids_by_length(article_ids, max_length)
+    metrics: Dict[int, Dict] = {}
+    failed_chunks = 0
+
+    def fetch(chunk: List[int]) -> List[Dict]:
+        url = f"{base_url}/help_center/articles/metrics.json"
+        response = session.get(url, params={'article_ids': ','.join(map(str, chunk))})
+        response.raise_for_status()
+        return response.json().get('article_metrics', [])
+
+    if not chunks:
+        return metrics, failed_chunks
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+        futures = [pool.submit(fetch, chunk) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                for metric in future.result():
+                    article_id = metric.get('article_id')
+                    if article_id:
+                        metrics[article_id] = metric_record(metric)
+            except ZendeskAuthError:
+                # Queued chunks would only fail the same way
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            except (requests.exceptions.RequestException, ValueError) as e:
+                failed_chunks += 1
+                print(f"⚠️  Metrics request failed for {len(chunk)} articles: {describe_error(e)}")
+
+    return metrics, failed_chunks
+
+
+def fetch_metrics_individually(session: requests.Session, base_url: str, article_ids: Iterable[int],
+                               workers: int = 8, max_rate: Optional[float] = None,
+                               on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[int, Dict]:
+    """
+    Fetch /help_center/articles/{id}/metrics.json for every article with a worker pool.
+
+    Requests run on ``workers`` threads through the session's shared rate
+    limiter. ``max_rate`` additionally caps this stage's throughput. Retryable
+    failures are retried by the session; an article whose request still fails,
+    returns another error status or a body that is not JSON simply has no metrics.
+    A 401 cancels the queued requests and is raised.
+
+    Args:
+        session: Authenticated requests session
+        base_url: Zendesk API base URL
+        article_ids: Article IDs to fetch metrics for
+        workers: Maximum number of concurrent requests
+        max_rate: Throughput ceiling in requests per second (optional)
+        on_progress: Called with (completed, total) roughly every 10% (optional)
+
+    Returns:
+        Dictionary mapping article ID to metrics
+    """
+    ids = list(dict.fromkeys(article_ids))
+    metrics: Dict[int, Dict] = {}
+    ceiling = AdaptiveRateLimiter(rate=max_rate, burst=1, min_rate=max_rate, max_rate=max_rate) if max_rate else None
+
+    def fetch(article_id: int) -> Optional[Dict]:
+        if ceiling:
+            ceiling.acquire()
+        response = session.get(f"{base_url}/help_center/articles/{article_id}/metrics.json")
+        if response.status_code != 200:
+            return None
+        return metric_record(response.json().get('article_metric', {}))
+
+    if not ids:
+        return metrics
+
+    report_every = max(1, len(ids) // 10)
+    completed = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ids)))) as pool:
+        futures = {pool.submit(fetch, article_id): article_id for article_id in ids}
+        for future in as_completed(futures):
+            completed += 1
+            try:
+                metric = future.result()
+                if metric is not None:
+                    metrics[futures[future]] = metric
+            except ZendeskAuthError:
+                # Queued requests would only fail the same way
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            except (requests.exceptions.RequestException, ValueError):
+                # Failed after retries, or the body was not JSON (e.g. an HTML error page)
+                pass
+            if on_progress and (completed % report_every == 0 or completed == len(ids)):
+                on_progress(completed, len(ids))
+
+    return metrics
+
+
+class HelpCenterTaxonomy:
+    """Sections and categories of a Help Center, joined once so each row is resolved with one lookup."""
+
+    # Result for articles whose section is unknown
+    UNRESOLVED = ('', '', '')
+
+    def __init__(self, sections: Iterable[Dict] = (), categories: Iterable[Dict] = ()):
+        category_names = {category['id']: category.get('name', '') for category in categories
+                          if category.get('id') is not None}
+        # section ID -> (category ID, section name, category name)
+        self.sections: Dict[int, Tuple] = {}
+        for section in sections:
+            if section.get('id') is None:
+                continue
+            category_id = section.get('category_id')
+            self.sections[section['id']] = (category_id if category_id is not None else '',
+                                            section.get('name', ''),
+                                            category_names.get(category_id, ''))
+        self.category_count = len(category_names)
+
+    def resolve(self, section_id) -> Tuple:
+        """
+        Look up the category and names of a section.
+
+        Args:
+            section_id: Section ID of an article
+
+        Returns:
+            Tuple of (category ID, section name, category name); empty strings when the section is unknown
+        """
+        return self.sections.get(section_id, self.UNRESOLVED)
+
+    def summary(self) -> str:
+        """One-line summary for the export report."""
+        return f"{len(self.sections)} sections in {self.category_count} categories"
+
+
+def fetch_taxonomy(session: requests.Session, base_url: str, page_size: int = 100) -> HelpCenterTaxonomy:
+    """
+    Fetch every section and category through their listing endpoints.
+
+    Both listings are small (a few pages even for large help centers), so they
+    are read in full once per run instead of looking up each article's
+    section. A failing listing is reported and leaves its part of the taxonomy
+    empty; the export then keeps the IDs the articles carry.
+
+    Args:
+        session: Authenticated requests session
+        base_url: Zendesk API base URL
+        page_size: Number of records per page (maximum 100)
+
+    Returns:
+        HelpCenterTaxonomy joining sections to their categories
+    """
+    listings: Dict[str, List[Dict]] = {'sections': [], 'categories': []}
+
+    for key, records in listings.items():
+        try:
+            for data in iter_cursor_pages(session, f"{base_url}/help_center/{key}.json", page_size=page_size):
+                records.extend(data.get(key, []))
+        except ZendeskAuthError:
+            raise
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  Could not list {key}: {describe_error(e)}")
+
+    return HelpCenterTaxonomy(listings['sections'], listings['categories'])
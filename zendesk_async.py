@@ -0,0 +1,287 @@
+"""
+Asyncio export engine for ZendeskComprehensiveExporter.
+
+Listing, author resolution and metrics enrichment run as overlapping coroutines
+over one aiohttp session with a bounded connection pool. As soon as a listing
+page arrives, its unresolved authors and its article IDs are queued for the
+other two stages, so a full export takes roughly as long as its slowest stage
+instead of the sum of all stages. Requests share the exporter's
+AdaptiveRateLimiter and RetryPolicy with the synchronous code paths.
+
+aiohttp is an optional dependency; exporters fall back to the synchronous
+engine when it is not installed. The on-disk HTTP cache only applies to the
+synchronous requests.Session; API recordings are saved and replayed by both.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+    import yarl
+    from multidict import CIMultiDict, CIMultiDictProxy
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from zendesk_api import collect_sideloaded_users, metric_record, next_page_url, project_articles, user_record
+from zendesk_http import DEFAULT_TIMEOUT, AdaptiveRateLimiter, ZendeskAuthError, decode_json, is_retryable_status
+
+# Statuses that mean the bulk metrics endpoint is unavailable for this account
+BULK_METRICS_UNAVAILABLE = (400, 403, 404)
+
+
+def async_engine_available() -> bool:
+    """Whether the optional aiohttp dependency is installed."""
+    return aiohttp is not None
+
+
+class AsyncExportEngine:
+    def __init__(self, exporter, connections: int = 10):
+        """
+        Initialize the engine.
+
+        Args:
+            exporter: ZendeskComprehensiveExporter providing credentials, limiter, retry policy and caches
+            connections: Maximum number of open connections
+        """
+        self.exporter = exporter
+        self.connections = max(1, connections)
+        self.retry_policy = exporter.session.retry_policy
+        self.articles: List[Dict] = []
+        self.users: Dict[int, Dict] = {}
+        self.metrics: Dict[int, Dict] = {}
+        self._bulk_metrics_available = True
+        self._metrics_slots: Optional[asyncio.Semaphore] = None
+        self._ceiling = None
+        if exporter.metrics_rps:
+            rps = exporter.metrics_rps
+            self._ceiling = AdaptiveRateLimiter(rate=rps, burst=1, min_rate=rps, max_rate=rps)
+
+    def _replay_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        started = time.perf_counter()
+        recorded = self.exporter.session.recording.replay('GET', url, params)
+        status, _, body = recorded or (404, '', b'')
+        self.exporter.instrumentation.record_request(url, status, len(body), time.perf_counter() - started)
+        if status >= 400:
+            request_url = yarl.URL(url).update_query(params) if params else yarl.URL(url)
+            request_info = aiohttp.RequestInfo(request_url, 'GET', CIMultiDictProxy(CIMultiDict()))
+            raise aiohttp.ClientResponseError(request_info, (), status=status,
+                                              message='Not Recorded' if recorded is None else '')
+        return decode_json(body)
+
+    async def _get_json(self, session, url: str, params: Optional[Dict] = None) -> Dict:
+        recording = self.exporter.session.recording
+        if recording is not None and recording.replaying:
+            return self._replay_json(url, params)
+
+        limiter = self.exporter.rate_limiter
+        instrumentation = self.exporter.instrumentation
+        policy = self.retry_policy
+        attempt = 0
+
+        while True:
+            wait = limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            started = time.perf_counter()
+            try:
+                async with session.get(url, params=params) as response:
+                    body = await response.read()
+                    instrumentation.record_request(url, response.status, len(body), time.perf_counter() - started,
+                                                   retry=attempt > 0)
+                    limiter.update_from_headers(response.status, response.headers)
+                    if response.status == 401:
+                        raise ZendeskAuthError(f"401 Unauthorized for {response.url}; check the email and API token")
+                    if not is_retryable_status(response.status) or attempt >= policy.retries:
+                        if recording is not None:
+                            recording.record('GET', str(response.url), response.status,
+                                             response.headers.get('Content-Type', ''), body)
+                        response.raise_for_status()
+                        return decode_json(body)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                instrumentation.record_request(url, e.__class__.__name__, 0, time.perf_counter() - started,
+                                               retry=attempt > 0)
+                if attempt >= policy.retries:
+                    raise
+            await asyncio.sleep(policy.delay(attempt))
+            attempt += 1
+
+    async def _list_articles(self, session, author_queue: asyncio.Queue, metrics_queue: asyncio.Queue) -> None:
+        url = f"{self.exporter.base_url}/help_center/articles.json"
+        params = {'include': 'users', 'page[size]': 100}
+        queued_authors = set()
+        page = 0
+
+        try:
+            while url:
+                data = await self._get_json(session, url, params)
+                page += 1
+                current_articles = project_articles(data.get('articles', []), self.exporter.article_fields)
+                collect_sideloaded_users(data, self.exporter.sideloaded_users)
+                self.articles.extend(current_articles)
+                print(f"   Retrieved {len(current_articles)} articles (page {page})")
+
+                author_ids = {article.get('author_id') for article in current_articles if article.get('author_id')}
+                new_authors = author_ids - queued_authors - self.exporter.sideloaded_users.keys()
+                if new_authors:
+                    queued_authors |= new_authors
+                    await author_queue.put(sorted(new_authors))
+
+                article_ids = [article['id'] for article in current_articles if article.get('id')]
+                if article_ids:
+                    await metrics_queue.put(article_ids)
+
+                url, params = next_page_url(data), None
+        finally:
+            await author_queue.put(None)
+            await metrics_queue.put(None)
+
+    async def _resolve_authors(self, session, queue: asyncio.Queue) -> None:
+        tasks = []
+        batch: List[int] = []
+
+        while True:
+            author_ids = await queue.get()
+            if author_ids is None:
+                break
+            batch.extend(author_ids)
+            while len(batch) >= 100:
+                tasks.append(asyncio.ensure_future(self._resolve_author_chunk(session, batch[:100])))
+                batch = batch[100:]
+
+        if batch:
+            tasks.append(asyncio.ensure_future(self._resolve_author_chunk(session, batch)))
+        await asyncio.gather(*tasks)
+
+    async def _resolve_author_chunk(self, session, user_ids: List[int]) -> None:
+        user_cache = self.exporter.user_cache
+        if user_cache:
+            self.users.update(user_cache.get_many(user_ids))
+
+        remaining_ids = [user_id for user_id in user_ids if user_id not in self.users]
+        if not remaining_ids:
+            return
+
+        fresh_users = {}
+        try:
+            data = await self._get_json(session, f"{self.exporter.base_url}/users/show_many.json",
+                                        {'ids': ','.join(map(str, remaining_ids))})
+            for user in data.get('users', []):
+                if user.get('id') is not None:
+                    fresh_users[user['id']] = user_record(user)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"⚠️  Bulk user lookup failed for {len(remaining_ids)} users: {str(e) or 'timed out'}")
+
+        missing_ids = [user_id for user_id in remaining_ids if user_id not in fresh_users]
+        lookups = await asyncio.gather(*(self._resolve_single_author(session, user_id) for user_id in missing_ids))
+        self.users.update(fresh_users)
+        self.users.update(zip(missing_ids, lookups))
+
+        if user_cache:
+            user_cache.put_many(fresh_users)
+
+    async def _resolve_single_author(self, session, user_id: int) -> Dict:
+        try:
+            data = await self._get_json(session, f"{self.exporter.base_url}/users/{user_id}.json")
+            return dict(user_record(data.get('user', {})), id=user_id)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Retries are exhausted; one unknown author must not abort the export
+            return {
+                'name': f'Unknown Author (ID: {user_id})',
+                'id': user_id,
+                'email': ''
+            }
+
+    async def _enrich_metrics(self, session, queue: asyncio.Queue) -> None:
+        tasks = []
+        while True:
+            article_ids = await queue.get()
+            if article_ids is None:
+                break
+            tasks.append(asyncio.ensure_future(self._fetch_metrics_chunk(session, article_ids)))
+        await asyncio.gather(*tasks)
+
+    async def _fetch_metrics_chunk(self, session, article_ids: List[int]) -> None:
+        if self._bulk_metrics_available:
+            try:
+                data = await self._get_json(session, f"{self.exporter.base_url}/help_center/articles/metrics.json",
+                                            {'article_ids': ','.join(map(str, article_ids))})
+                for metric in data.get('article_metrics', []):
+                    if metric.get('article_id'):
+                        self.metrics[metric['article_id']] = metric_record(metric)
+                return
+            except aiohttp.ClientResponseError as e:
+                if e.status in BULK_METRICS_UNAVAILABLE:
+                    self._bulk_metrics_available = False
+                else:
+                    print(f"⚠️  Metrics request failed for {len(article_ids)} articles: HTTP {e.status} {e.message}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"⚠️  Metrics request failed for {len(article_ids)} articles: {str(e) or 'timed out'}")
+
+        # Bulk endpoint unavailable or failed: fall back to per-article metrics
+        await asyncio.gather(*(self._fetch_article_metric(session, article_id) for article_id in article_ids))
+
+    async def _fetch_article_metric(self, session, article_id: int) -> None:
+        url = f"{self.exporter.base_url}/help_center/articles/{article_id}/metrics.json"
+        async with self._metrics_slots:
+            if self._ceiling:
+                wait = self._ceiling.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                data = await self._get_json(session, url)
+                self.metrics[article_id] = metric_record(data.get('article_metric', {}))
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # Retries are exhausted or the article has no metrics
+                pass
+
+    async def run(self) -> Tuple[List[Dict], Dict[int, Dict], Dict[int, Dict]]:
+        """
+        Run listing, author resolution and metrics enrichment concurrently.
+
+        Returns:
+            Tuple of (articles in listing order, users cache, metrics)
+        """
+        exporter = self.exporter
+        self._metrics_slots = asyncio.Semaphore(exporter.metrics_workers)
+        author_queue: asyncio.Queue = asyncio.Queue()
+        metrics_queue: asyncio.Queue = asyncio.Queue()
+
+        connector = aiohttp.TCPConnector(limit=self.connections)
+        auth = aiohttp.BasicAuth(f"{exporter.email}/token", exporter.api_token)
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        timeout = aiohttp.ClientTimeout(sock_connect=DEFAULT_TIMEOUT[0], sock_read=DEFAULT_TIMEOUT[1])
+
+        async with aiohttp.ClientSession(connector=connector, auth=auth, headers=headers, timeout=timeout) as session:
+            await asyncio.gather(
+                self._list_articles(session, author_queue, metrics_queue),
+                self._resolve_authors(session, author_queue),
+                self._enrich_metrics(session, metrics_queue)
+            )
+
+        users_cache = {}
+        for article in self.articles:
+            author_id = article.get('author_id')
+            if author_id in exporter.sideloaded_users:
+                users_cache[author_id] = exporter.sideloaded_users[author_id]
+        if exporter.user_cache:
+            exporter.user_cache.put_many(users_cache)
+        users_cache.update(self.users)
+
+        return self.articles, users_cache, self.metrics
+
+
+def run_async_engine(exporter, connections: int = 10) -> Tuple[List[Dict], Dict[int, Dict], Dict[int, Dict]]:
+    """
+    Synchronous entry point for the asyncio engine.
+
+    Args:
+        exporter: ZendeskComprehensiveExporter instance
+        connections: Maximum number of open connections
+
+    Returns:
+        Tuple of (articles, users cache, metrics)
+    """
+    return asyncio.run(AsyncExportEngine(exporter, connections).run())
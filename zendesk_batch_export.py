@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Multi-Tenant Zendesk Knowledge Base Export
+
+Exports several Zendesk subdomains in one run. Each tenant is described by its own
+.env config file (the same format as --config-file for the single-tenant exporters).
+Tenants run in parallel in a process pool. Each one has its own session and rate
+limiter, so a slow or throttled tenant never eats into another tenant's budget.
+
+Every tenant writes its export and a log file into the output directory. The
+batch ends with one combined summary (printed and saved as summary.json).
+
+Usage:
+    python zendesk_batch_export.py tenants/acme.env tenants/globex.env
+    python zendesk_batch_export.py --tenant-list tenants.txt --processes 4 --format parquet
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List
+
+from zendesk_export import load_config_from_file
+from zendesk_sinks import OUTPUT_EXTENSIONS, OUTPUT_FORMATS
+
+# Exporter module and class for each --exporter choice
+EXPORTERS = {
+    'basic': ('zendesk_export', 'ZendeskExporter'),
+    'improved': ('zendesk_export_improved', 'ZendeskExporter'),
+    'comprehensive': ('zendesk_export_comprehensive', 'ZendeskComprehensiveExporter')
+}
+
+
+def read_tenant_list(filename: str) -> List[str]:
+    """
+    Read config file paths from a tenant list, one per line.
+
+    Blank lines and lines starting with # are ignored. Relative paths are
+    resolved against the directory of the list file.
+
+    Args:
+        filename: Path to the tenant list
+
+    Returns:
+        List of config file paths
+    """
+    base_dir = os.path.dirname(os.path.abspath(filename))
+    config_files = []
+
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                config_files.append(os.path.join(base_dir, line))
+
+    return config_files
+
+
+def build_tasks(config_files: List[str], options: Dict) -> List[Dict]:
+    """
+    Turn config files into per-tenant export tasks.
+
+    Args:
+        config_files: Tenant config files
+        options: Shared export options from the command line
+
+    Returns:
+        List of task dictionaries, one per tenant
+    """
+    tasks = []
+    used_names = set()
+    extension = OUTPUT_EXTENSIONS[options['output_format']]
+
+    for config_file in config_files:
+        config = load_config_from_file(config_file) if os.path.exists(config_file) else {}
+        name = config.get('ZENDESK_SUBDOMAIN') or os.path.splitext(os.path.basename(config_file))[0]
+
+        # Keep output files apart when two configs point at the same subdomain
+        tenant = name
+        suffix = 2
+        while tenant in used_names:
+            tenant = f"{name}_{suffix}"
+            suffix += 1
+        used_names.add(tenant)
+
+        tasks.append(dict(
+            options,
+            tenant=tenant,
+            config_file=config_file,
+            output_file=os.path.join(options['output_dir'], f"{tenant}.{extension}"),
+            log_file=os.path.join(options['output_dir'], f"{tenant}.log")
+        ))
+
+    return tasks
+
+
+def create_exporter(task: Dict, config: Dict[str, str]):
+    """
+    Create the exporter for one tenant with its own session and rate budget.
+
+    Args:
+        task: Task dictionary from build_tasks
+        config: Tenant configuration
+
+    Returns:
+        Exporter instance
+    """
+    module_name, class_name = EXPORTERS[task['exporter']]
+    exporter_class = getattr(importlib.import_module(module_name), class_name)
+
+    kwargs = {
+        'workers': task['workers'],
+        'engine': task['engine'],
+        'output_format': task['output_format']
+    }
+    if task['exporter'] != 'basic':
+        kwargs['metrics_workers'] = task['metrics_workers']
+
+    exporter = exporter_class(config['ZENDESK_SUBDOMAIN'], config['ZENDESK_EMAIL'],
+                              config['ZENDESK_API_TOKEN'], **kwargs)
+
+    # Per-tenant request budget: ZENDESK_MAX_RPS in the tenant config wins over --max-rps
+    max_rps = config.get('ZENDESK_MAX_RPS') or task.get('max_rps')
+    if max_rps:
+        limiter = exporter.rate_limiter
+        limiter.max_rate = float(max_rps)
+        limiter.rate = min(limiter.rate, limiter.max_rate)
+        limiter.min_rate = min(limiter.min_rate, limiter.max_rate)
+
+    return exporter
+
+
+def tenant_result(task: Dict) -> Dict:
+    """Summary dictionary for a tenant that has not (yet) exported successfully."""
+    return {
+        'tenant': task['tenant'],
+        'config_file': task['config_file'],
+        'status': 'failed',
+        'output_file': '',
+        'log_file': task['log_file'],
+        'articles': 0,
+        'views': 0,
+        'authors': 0,
+        'duration_seconds': 0.0,
+        'error': ''
+    }
+
+
+def export_tenant(task: Dict) -> Dict:
+    """
+    Export a single tenant; runs in a worker process.
+
+    The exporter's progress output goes to the tenant's log file so parallel
+    tenants do not interleave on the console.
+
+    Args:
+        task: Task dictionary from build_tasks
+
+    Returns:
+        Summary dictionary for the tenant
+    """
+    result = tenant_result(task)
+    started = time.time()
+
+    with open(task['log_file'], 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        try:
+            if not os.path.exists(task['config_file']):
+                raise FileNotFoundError(f"Config file {task['config_file']} not found")
+
+            config = load_config_from_file(task['config_file'])
+            missing = [key for key in ('ZENDESK_SUBDOMAIN', 'ZENDESK_EMAIL', 'ZENDESK_API_TOKEN')
+                       if not config.get(key)]
+            if missing:
+                raise ValueError(f"Missing {', '.join(missing)} in {task['config_file']}")
+
+            exporter = create_exporter(task, config)
+            output_file = exporter.run_export(task['output_file'])
+            stats = exporter.export_stats
+
+            result['output_file'] = output_file
+            if stats:
+                result['articles'] = stats.total_articles
+                result['views'] = stats.total_views
+                result['authors'] = stats.unique_authors
+            result['status'] = 'ok' if output_file else 'empty'
+        except Exception as e:
+            print(f"\n❌ Export failed: {e}")
+            result['error'] = str(e)
+
+    result['duration_seconds'] = round(time.time() - started, 2)
+    return result
+
+
+def run_batch(tasks: List[Dict], processes: int) -> List[Dict]:
+    """
+    Export all tenants across a process pool.
+
+    Args:
+        tasks: Task dictionaries from build_tasks
+        processes: Maximum number of tenants exported at the same time
+
+    Returns:
+        Per-tenant summaries, in task order
+    """
+    results: Dict[str, Dict] = {}
+
+    with ProcessPoolExecutor(max_workers=max(1, min(processes, len(tasks)))) as pool:
+        futures = {pool.submit(export_tenant, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = dict(tenant_result(task), error=str(e))
+
+            icon = '✅' if result['status'] == 'ok' else ('⚠️ ' if result['status'] == 'empty' else '❌')
+            detail = result['error'] or f"{result['articles']} articles in {result['duration_seconds']}s"
+            print(f"   {icon} {result['tenant']}: {detail}")
+            results[task['tenant']] = result
+
+    return [results[task['tenant']] for task in tasks]
+
+
+def write_summary(results: List[Dict], output_dir: str, started_at: float) -> str:
+    """
+    Write the combined summary for all tenants.
+
+    Args:
+        results: Per-tenant summaries
+        output_dir: Batch output directory
+        started_at: Unix time the batch started
+
+    Returns:
+        Path of the summary file
+    """
+    summary = {
+        'started_at': datetime.fromtimestamp(started_at).isoformat(timespec='seconds'),
+        'duration_seconds': round(time.time() - started_at, 2),
+        'tenants': len(results),
+        'succeeded': sum(1 for result in results if result['status'] == 'ok'),
+        'failed': sum(1 for result in results if result['status'] == 'failed'),
+        'total_articles': sum(result['articles'] for result in results),
+        'total_views': sum(result['views'] for result in results),
+        'results': results
+    }
+
+    summary_file = os.path.join(output_dir, 'summary.json')
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    return summary_file
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export Zendesk Knowledge Base articles for several tenants in parallel",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python zendesk_batch_export.py tenants/acme.env tenants/globex.env
+  python zendesk_batch_export.py --tenant-list tenants.txt --processes 4
+  python zendesk_batch_export.py --tenant-list tenants.txt --exporter improved --format parquet --max-rps 5
+        """
+    )
+
+    parser.add_argument(
+        'config_files',
+        nargs='*',
+        help='Tenant .env config files'
+    )
+    parser.add_argument(
+        '--tenant-list',
+        help='Text file listing tenant config files, one per line'
+    )
+    parser.add_argument(
+        '--exporter',
+        choices=list(EXPORTERS),
+        default='basic',
+        help='Exporter used for every tenant (default: basic)'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Maximum number of tenants exported at the same time (default: CPU count)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        help='Directory for per-tenant outputs, logs and summary.json (default: zendesk_batch_<timestamp>)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=list(OUTPUT_FORMATS),
+        default='csv',
+        help='Output format for every tenant (default: csv)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['pipeline', 'sync'],
+        default='pipeline',
+        help='Export engine for every tenant (default: pipeline)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Concurrent page requests per tenant when listing articles (default: 1)'
+    )
+    parser.add_argument(
+        '--metrics-workers',
+        type=int,
+        default=8,
+        help='Concurrent per-article metrics requests per tenant (improved/comprehensive, default: 8)'
+    )
+    parser.add_argument(
+        '--max-rps',
+        type=float,
+        help='Request budget per tenant, in requests per second; ZENDESK_MAX_RPS in a tenant config overrides it'
+    )
+
+    args = parser.parse_args()
+
+    config_files = list(args.config_files)
+    if args.tenant_list:
+        config_files.extend(read_tenant_list(args.tenant_list))
+
+    if not config_files:
+        print("❌ No tenants given")
+        print("   Pass tenant config files or use --tenant-list")
+        sys.exit(1)
+
+    output_dir = args.output_dir or f"zendesk_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    os.makedirs(output_dir, exist_ok=True)
+
+    options = {
+        'exporter': args.exporter,
+        'output_dir': output_dir,
+        'output_format': args.format,
+        'engine': args.engine,
+        'workers': args.workers,
+        'metrics_workers': args.metrics_workers,
+        'max_rps': args.max_rps
+    }
+    tasks = build_tasks(config_files, options)
+
+    print("🚀 Starting Multi-Tenant Zendesk Knowledge Base Export")
+    print(f"📋 Tenants: {len(tasks)} ({min(args.processes, len(tasks))} at a time)")
+    print(f"📁 Output directory: {output_dir}")
+
+    started_at = time.time()
+    results = run_batch(tasks, args.processes)
+    summary_file = write_summary(results, output_dir, started_at)
+
+    print("\n📊 Batch Summary:")
+    for result in results:
+        print(f"   {result['tenant']}: {result['status']}, {result['articles']} articles, "
+              f"{result['views']} views, {result['duration_seconds']}s")
+    print(f"   Total Articles: {sum(result['articles'] for result in results)}")
+    print(f"   Total Views: {sum(result['views'] for result in results)}")
+    print(f"   Wall Time: {round(time.time() - started_at, 2)}s")
+    print(f"   Summary File: {summary_file}")
+
+    failed = [result['tenant'] for result in results if result['status'] == 'failed']
+    if failed:
+        print(f"\n❌ {len(failed)} tenant(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+
+    print("\n🎉 Batch export completed successfully!")
+
+if __name__ == "__main__":
+    main()
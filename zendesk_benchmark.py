@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Zendesk Export Benchmark
+
+Runs the exporters against a local mock Zendesk server (zendesk_mock_server.py)
+filled with synthetic data, so throughput changes can be measured without a live
+tenant and compared between runs. Latency, page size, the request quota and
+injected 429s are all configurable.
+
+Each exporter runs in a fresh process so its peak memory is measured on its
+own. For every run the benchmark reports articles per second, requests issued
+(counted by the server), 429s, export RSS and wall time. Export RSS is the peak
+resident set size above the baseline taken once the exporter is imported and
+constructed, so it tracks the memory of the export itself. With --json the results
+are also saved, and --compare prints the change against an earlier results file.
+
+Usage:
+    python zendesk_benchmark.py --articles 10000
+    python zendesk_benchmark.py --articles 5000 --latency 0.05 --rate-429 0.02 --json after.json --compare before.json
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from zendesk_batch_export import EXPORTERS, create_exporter
+from zendesk_mock_server import MockZendeskServer, SyntheticHelpCenter
+from zendesk_sinks import OUTPUT_EXTENSIONS, OUTPUT_FORMATS
+
+# Engines each exporter supports
+EXPORTER_ENGINES = {
+    'basic': ('pipeline', 'sync'),
+    'improved': ('pipeline', 'sync'),
+    'comprehensive': ('pipeline', 'sync', 'async')
+}
+
+# Columns of the results table: (key, heading, format)
+RESULT_COLUMNS = (
+    ('exporter', 'Exporter', '{}'),
+    ('engine', 'Engine', '{}'),
+    ('articles', 'Articles', '{}'),
+    ('articles_per_second', 'Articles/s', '{:.1f}'),
+    ('requests', 'Requests', '{}'),
+    ('rate_limited', '429s', '{}'),
+    ('export_rss_mb', 'Export RSS MB', '{:.1f}'),
+    ('wall_seconds', 'Wall s', '{:.2f}')
+)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1 << 20) if platform.system() == 'Darwin' else peak / 1024
+
+
+def run_exporter(task: Dict) -> Dict:
+    """
+    Export the mock server's articles with one exporter; runs in a fresh process.
+
+    Args:
+        task: Benchmark settings for the run, including the mock server's base_url
+
+    Returns:
+        Result dictionary for the run
+    """
+    result = {
+        'exporter': task['exporter'],
+        'engine': task['engine'],
+        'status': 'failed',
+        'articles': 0,
+        'wall_seconds': 0.0,
+        'articles_per_second': 0.0,
+        'client_requests': 0,
+        'retries': 0,
+        'error': ''
+    }
+    config = {'ZENDESK_SUBDOMAIN': 'benchmark', 'ZENDESK_EMAIL': 'benchmark@example.com',
+              'ZENDESK_API_TOKEN': 'benchmark'}
+
+    with open(task['log_file'], 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        try:
+            exporter = create_exporter(task, config)
+            exporter.base_url = task['base_url']
+            # Modules and the exporter are loaded; only growth beyond this is the export's own
+            result['baseline_rss_mb'] = round(peak_rss_mb(), 1)
+
+            started = time.perf_counter()
+            output_file = exporter.run_export(task['output_file'])
+            result['wall_seconds'] = round(time.perf_counter() - started, 3)
+
+            stats = exporter.export_stats
+            result['articles'] = stats.total_articles if stats else 0
+            result['status'] = 'ok' if output_file else 'empty'
+            if result['wall_seconds']:
+                result['articles_per_second'] = round(result['articles'] / result['wall_seconds'], 1)
+
+            totals = exporter.instrumentation.to_dict()['totals']
+            result['client_requests'] = totals['requests']
+            result['retries'] = totals['retries']
+        except Exception as e:
+            print(f"\n❌ Export failed: {e}")
+            result['error'] = str(e)
+
+    result['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    result['export_rss_mb'] = round(result['peak_rss_mb'] - result.get('baseline_rss_mb', result['peak_rss_mb']), 1)
+    return result
+
+
+def run_benchmark(server: MockZendeskServer, tasks: List[Dict]) -> List[Dict]:
+    """
+    Run each task in its own process against the mock server.
+
+    Args:
+        server: Running mock server
+        tasks: Benchmark tasks
+
+    Returns:
+        Result dictionaries, in task order, with the server's request counts added
+    """
+    # A fresh interpreter per run keeps peak RSS from carrying over between exporters
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    for task in tasks:
+        supported = EXPORTER_ENGINES[task['exporter']]
+        if task['engine'] not in supported:
+            print(f"   ⏭️  {task['exporter']}: no {task['engine']} engine (supports {', '.join(supported)})")
+            continue
+
+        server.reset_counters()
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                result = pool.submit(run_exporter, task).result()
+            except Exception as e:
+                # The worker process itself died
+                result = {'exporter': task['exporter'], 'engine': task['engine'], 'status': 'failed',
+                          'articles': 0, 'wall_seconds': 0.0, 'articles_per_second': 0.0,
+                          'peak_rss_mb': 0.0, 'export_rss_mb': 0.0, 'error': str(e)}
+
+        counters = server.reset_counters()
+        result['run'] = task['run']
+        result['requests'] = counters.get('requests', 0)
+        result['rate_limited'] = counters.get('quota_429', 0) + counters.get('injected_429', 0)
+
+        icon = '✅' if result['status'] == 'ok' else '❌'
+        detail = result['error'] or (f"{result['articles']} articles in {result['wall_seconds']}s, "
+                                     f"{result['requests']} requests")
+        print(f"   {icon} {task['exporter']} ({task['engine']}, run {task['run']}): {detail}")
+        results.append(result)
+
+    return results
+
+
+def format_table(results: List[Dict], baseline: Optional[Dict[str, Dict]] = None) -> str:
+    """
+    Format results as a text table.
+
+    Args:
+        results: Result dictionaries
+        baseline: Earlier results keyed by "exporter/engine"; adds a change column for articles/s
+
+    Returns:
+        Table text
+    """
+    headings = [heading for _, heading, _ in RESULT_COLUMNS]
+    if baseline:
+        headings.append('vs baseline')
+
+    rows = []
+    for result in results:
+        row = [fmt.format(result.get(key, 0)) for key, _, fmt in RESULT_COLUMNS]
+        if baseline:
+            before = baseline.get(f"{result['exporter']}/{result['engine']}", {}).get('articles_per_second')
+            row.append(f"{(result['articles_per_second'] / before - 1) * 100:+.1f}%" if before else '-')
+        rows.append(row)
+
+    widths = [max(len(heading), *(len(row[i]) for row in rows)) for i, heading in enumerate(headings)]
+    lines = ['  '.join(heading.ljust(width) for heading, width in zip(headings, widths)),
+             '  '.join('-' * width for width in widths)]
+    for row in rows:
+        lines.append('  '.join(cell.rjust(width) if i > 1 else cell.ljust(width)
+                               for i, (cell, width) in enumerate(zip(row, widths))))
+    return '\n'.join(lines)
+
+
+def best_results(results: List[Dict]) -> Dict[str, Dict]:
+    """Fastest successful run of each exporter/engine pair, keyed by "exporter/engine"."""
+    best: Dict[str, Dict] = {}
+    for result in results:
+        if result['status'] != 'ok':
+            continue
+        key = f"{result['exporter']}/{result['engine']}"
+        if key not in best or result['articles_per_second'] > best[key]['articles_per_second']:
+            best[key] = result
+    return best
+
+
+def load_baseline(filename: str) -> Dict[str, Dict]:
+    """
+    Load the best runs of an earlier --json results file.
+
+    Args:
+        filename: Results file written by --json
+
+    Returns:
+        Best runs keyed by "exporter/engine"
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        return best_results(json.load(f)['results'])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Zendesk exporters against a local mock server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python zendesk_benchmark.py --articles 10000
+  python zendesk_benchmark.py --articles 5000 --latency 0.05 --rate-429 0.02
+  python zendesk_benchmark.py --exporters improved --no-bulk-metrics --metrics-workers 16
+  python zendesk_benchmark.py --articles 20000 --json after.json --compare before.json
+        """
+    )
+
+    parser.add_argument(
+        '--articles',
+        type=int,
+        default=5000,
+        help='Number of synthetic articles (default: 5000)'
+    )
+    parser.add_argument(
+        '--users',
+        type=int,
+        default=200,
+        help='Number of synthetic authors (default: 200)'
+    )
+    parser.add_argument(
+        '--body-size',
+        type=int,
+        default=4000,
+        help='Length of each article body in characters (default: 4000)'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Seconds the mock server adds to every response (default: 0)'
+    )
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=100,
+        help='Largest page the mock server returns (default: 100)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=int,
+        default=6000,
+        help='Requests per minute the mock server allows and advertises; with 0 no rate-limit headers are sent and the client limiter keeps its starting rate (default: 6000)'
+    )
+    parser.add_argument(
+        '--rate-429',
+        type=float,
+        default=0.0,
+        help='Fraction of requests answered with an injected 429 (default: 0)'
+    )
+    parser.add_argument(
+        '--retry-after',
+        type=float,
+        default=1.0,
+        help='Retry-After of injected 429s, in seconds (default: 1)'
+    )
+    parser.add_argument(
+        '--no-bulk-metrics',
+        action='store_true',
+        help='Make the bulk metrics endpoint unavailable to force per-article metrics'
+    )
+    parser.add_argument(
+        '--exporters',
+        nargs='+',
+        choices=list(EXPORTERS),
+        default=list(EXPORTERS),
+        help='Exporters to run (default: all)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['pipeline', 'sync', 'async'],
+        default='pipeline',
+        help='Export engine (default: pipeline); async runs the comprehensive exporter only'
+    )
+    parser.add_argument(
+        '--format',
+        choices=list(OUTPUT_FORMATS),
+        default='csv',
+        help='Output format (default: csv)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Concurrent page requests when listing articles (default: 1)'
+    )
+    parser.add_argument(
+        '--metrics-workers',
+        type=int,
+        default=8,
+        help='Concurrent per-article metrics requests (improved/comprehensive, default: 8)'
+    )
+    parser.add_argument(
+        '--max-rps',
+        type=float,
+        help='Upper bound for the client rate limiter, in requests per second (default: exporter default)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='Runs per exporter; the table shows every run (default: 1)'
+    )
+    parser.add_argument(
+        '--json',
+        help='Save the settings and results to this JSON file'
+    )
+    parser.add_argument(
+        '--compare',
+        help='Results file from an earlier --json run to compare articles/s against'
+    )
+
+    args = parser.parse_args()
+
+    help_center = SyntheticHelpCenter(args.articles, args.users, body_size=args.body_size)
+    server = MockZendeskServer(help_center, latency=args.latency, page_size=args.page_size,
+                               rate_limit=args.rate_limit, rate_429=args.rate_429,
+                               retry_after=args.retry_after, bulk_metrics=not args.no_bulk_metrics)
+
+    settings = {
+        'articles': args.articles,
+        'users': args.users,
+        'body_size': args.body_size,
+        'latency': args.latency,
+        'page_size': args.page_size,
+        'rate_limit': args.rate_limit,
+        'rate_429': args.rate_429,
+        'bulk_metrics': not args.no_bulk_metrics,
+        'engine': args.engine,
+        'output_format': args.format,
+        'workers': args.workers,
+        'metrics_workers': args.metrics_workers,
+        'max_rps': args.max_rps
+    }
+
+    print("🚀 Starting Zendesk Export Benchmark")
+    print(f"📋 {args.articles} synthetic articles, {args.latency}s latency, page size {args.page_size}, "
+          f"{args.rate_429:.0%} injected 429s")
+
+    with tempfile.TemporaryDirectory(prefix='zendesk_benchmark_') as work_dir, server:
+        print(f"🧪 Mock server at {server.base_url}")
+        tasks = []
+        for run in range(1, max(1, args.repeat) + 1):
+            for exporter in args.exporters:
+                name = f"{exporter}_{run}"
+                tasks.append({
+                    'exporter': exporter,
+                    'engine': args.engine,
+                    'output_format': args.format,
+                    'workers': args.workers,
+                    'metrics_workers': args.metrics_workers,
+                    'max_rps': args.max_rps,
+                    'run': run,
+                    'base_url': server.base_url,
+                    'output_file': os.path.join(work_dir, f"{name}.{OUTPUT_EXTENSIONS[args.format]}"),
+                    'log_file': os.path.join(work_dir, f"{name}.log")
+                })
+        results = run_benchmark(server, tasks)
+
+    if not results:
+        print("❌ Nothing to run")
+        sys.exit(1)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    print("\n📊 Benchmark Results:")
+    print(format_table(results, baseline))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'settings': settings,
+                'results': results
+            }, f, indent=2)
+        print(f"\n💾 Results saved to {args.json}")
+
+    failed = [f"{result['exporter']}/{result['engine']}" for result in results if result['status'] != 'ok']
+    if failed:
+        print(f"\n❌ {len(failed)} run(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Resumable export checkpoints.
+
+A full export of a large knowledge base can run for a long time, and a dropped
+connection or an exhausted retry budget used to throw all of that work away.
+With a checkpoint, the pipeline engine records its progress after every listing
+page. It stores the position of the last completed page (a cursor link or an
+offset page number) in a small JSON state file. The enriched rows go to a
+JSON Lines spool next to it.
+
+A rerun with the same checkpoint writes the spooled rows to the output first.
+It then continues the listing after the last completed page and skips any
+article that was already enriched. The checkpoint files are removed once the
+export completes.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Set
+
+
+class ExportCheckpoint:
+    def __init__(self, path: str):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path: Path of the JSON state file; enriched rows are spooled to ``<path>.rows.jsonl``
+        """
+        self.path = path
+        self.rows_path = f"{path}.rows.jsonl"
+        self.state: Optional[Dict] = None
+        self._rows_file = None
+
+    def load(self) -> Optional[Dict]:
+        """
+        Load the state of an interrupted export.
+
+        Returns:
+            State dictionary, or None when there is nothing to resume
+        """
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+        if 'position' not in state or 'output_file' not in state:
+            return None
+        self.state = state
+        return state
+
+    @property
+    def output_file(self) -> Optional[str]:
+        return self.state.get('output_file') if self.state else None
+
+    @property
+    def output_format(self) -> Optional[str]:
+        return self.state.get('output_format') if self.state else None
+
+    @property
+    def position(self) -> Optional[Dict]:
+        return self.state.get('position') if self.state else None
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """Yield the spooled rows; a torn last line from an interrupted write is skipped."""
+        try:
+            with open(self.rows_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        return
+                    yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def iter_row_batches(self, batch_rows: int = 1000) -> Iterator[List[Dict]]:
+        """Yield the spooled rows in lists of at most ``batch_rows``."""
+        batch: List[Dict] = []
+        for row in self.iter_rows():
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def enriched_ids(self) -> Set[int]:
+        """IDs of the articles whose rows are already spooled."""
+        return {row.get('article_id') for row in self.iter_rows()}
+
+    def start(self, output_file: str, output_format: str) -> None:
+        """
+        Open the spool for appending, keeping the rows of an interrupted run.
+
+        Args:
+            output_file: Output file of this export
+            output_format: Output format of this export
+        """
+        if self.state is None:
+            self.state = {'position': None, 'pages': 0}
+            if os.path.exists(self.rows_path):
+                os.remove(self.rows_path)
+        self.state.update(output_file=output_file, output_format=output_format)
+        self._truncate_torn_line()
+        self._rows_file = open(self.rows_path, 'a', encoding='utf-8')
+
+    def _truncate_torn_line(self) -> None:
+        # Appending after a half-written line would corrupt the next row
+        if not os.path.exists(self.rows_path):
+            return
+        with open(self.rows_path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 65536)
+                f.seek(start)
+                chunk = f.read(position - start)
+                newline = chunk.rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                f.truncate(position)
+
+    def record_page(self, rows: List[Dict], position: Dict) -> None:
+        """
+        Record a completed listing page.
+
+        Rows are appended and flushed before the state moves past the page, so a
+        crash in between re-fetches the page and skips the rows already spooled.
+
+        Args:
+            rows: Processed rows of the page
+            position: Listing position after the page
+        """
+        for row in rows:
+            self._rows_file.write(json.dumps(row, default=str) + '\n')
+        self._rows_file.flush()
+
+        self.state['position'] = position
+        self.state['pages'] = position.get('pages', 0)
+        self.state['saved_at'] = int(time.time())
+        tmp_file = f"{self.path}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.path)
+
+    def close(self) -> None:
+        """Close the spool, keeping the checkpoint for a later resume."""
+        if self._rows_file is not None:
+            self._rows_file.close()
+            self._rows_file = None
+
+    def complete(self) -> None:
+        """Remove the checkpoint after a successful export."""
+        self.close()
+        for path in (self.path, self.rows_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.state = None
+
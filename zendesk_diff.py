@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Zendesk Export Diff
+
+Compares two exports of the same knowledge base (CSV, Parquet or Arrow, in any
+combination) and reports which articles were added, removed or changed. For
+each column it also reports how many rows changed, the net change of numeric
+columns such as ``views``, and status transitions such as
+``published → draft``.
+
+The older export is indexed by ``article_id`` in a hash map. The newer export
+is then streamed past it in a single pass, so only one snapshot is ever held in
+memory. Columnar inputs are memory-mapped and read a batch at a time. Instead
+of two full copies, the result is a compact JSON Lines delta file with one
+record per added, removed or changed article. Changed articles only carry the
+columns that changed, as ``[old, new]`` pairs.
+
+Usage:
+    python zendesk_diff.py zendesk_articles_20250807.csv zendesk_articles_20250808.csv
+    python zendesk_diff.py old.parquet new.parquet --output nightly_delta.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from zendesk_sinks import INT_COLUMNS, iter_rows
+
+KEY_COLUMN = 'article_id'
+
+# Integer columns reported with a net change; IDs are compared as plain values
+DELTA_COLUMNS = tuple(column for column in INT_COLUMNS if not column.endswith('_id'))
+
+# Column kept with removed articles so the delta file stays readable
+TITLE_COLUMN = 'article_title'
+
+
+def normalize(value) -> str:
+    """
+    Canonical text form of a cell, so CSV and typed columnar exports compare equal.
+
+    Timestamps are written the way Zendesk returns them (``2024-01-31T12:00:00Z``).
+    """
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return int(float(value))
+        except ValueError:
+            return None
+
+
+def _delta_value(column: str, value: str):
+    # Numbers are kept numeric in the delta file, everything else as text
+    if column in DELTA_COLUMNS or column == KEY_COLUMN:
+        number = _to_int(value)
+        return value if number is None else number
+    return value
+
+
+def index_snapshot(filename: str) -> Tuple[List[str], Dict[str, Tuple[str, ...]]]:
+    """
+    Index an export by article ID.
+
+    Args:
+        filename: CSV, Parquet or Arrow export
+
+    Returns:
+        Tuple of (columns, rows keyed by article ID as normalized value tuples in column order)
+    """
+    columns: List[str] = []
+    index: Dict[str, Tuple[str, ...]] = {}
+
+    for row in iter_rows(filename):
+        if not columns:
+            columns = list(row)
+        key = normalize(row.get(KEY_COLUMN))
+        if key:
+            index[key] = tuple(normalize(row.get(column)) for column in columns)
+
+    return columns, index
+
+
+class DiffSummary:
+    """Counts collected while diffing two exports."""
+
+    def __init__(self, columns: List[str]):
+        self.columns = columns
+        self.old_rows = 0
+        self.new_rows = 0
+        self.added = 0
+        self.removed = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.column_changes: Dict[str, int] = {column: 0 for column in columns}
+        self.column_deltas: Dict[str, int] = {column: 0 for column in columns if column in DELTA_COLUMNS}
+        self.status_transitions: Dict[str, int] = {}
+        self.added_columns: List[str] = []
+        self.removed_columns: List[str] = []
+
+    def to_dict(self) -> Dict:
+        return {
+            'old_rows': self.old_rows,
+            'new_rows': self.new_rows,
+            'added': self.added,
+            'removed': self.removed,
+            'changed': self.changed,
+            'unchanged': self.unchanged,
+            'column_changes': self.column_changes,
+            'column_deltas': self.column_deltas,
+            'status_transitions': dict(sorted(self.status_transitions.items(), key=lambda item: -item[1])),
+            'added_columns': self.added_columns,
+            'removed_columns': self.removed_columns
+        }
+
+
+class ExportDiff:
+    def __init__(self, old_file: str, new_file: str):
+        """
+        Prepare a comparison of two exports.
+
+        Args:
+            old_file: Earlier export
+            new_file: Later export
+        """
+        self.old_file = old_file
+        self.new_file = new_file
+        self.summary: Optional[DiffSummary] = None
+
+    def iter_changes(self) -> Iterator[Dict]:
+        """
+        Yield the delta records between the two exports.
+
+        ``summary`` is complete once the iterator is exhausted.
+
+        Yields:
+            Delta records: added and changed articles in the newer export's order, then removed ones
+        """
+        old_columns, old_index = index_snapshot(self.old_file)
+        old_positions = {column: position for position, column in enumerate(old_columns)}
+
+        summary: Optional[DiffSummary] = None
+        compare: List[Tuple[str, int]] = []
+        new_columns: List[str] = []
+        old_count = len(old_index)
+
+        for row in iter_rows(self.new_file):
+            if summary is None:
+                new_columns = list(row)
+                # Only columns present in both exports can be compared
+                compare = [(column, old_positions[column]) for column in new_columns
+                           if column in old_positions and column != KEY_COLUMN]
+                summary = self.summary = DiffSummary([column for column, _ in compare])
+                summary.added_columns = [column for column in new_columns if column not in old_positions]
+                summary.removed_columns = [column for column in old_columns if column not in new_columns]
+
+            key = normalize(row.get(KEY_COLUMN))
+            if not key:
+                continue
+            summary.new_rows += 1
+            old = old_index.pop(key, None)
+
+            if old is None:
+                summary.added += 1
+                yield {
+                    'change': 'added',
+                    KEY_COLUMN: _delta_value(KEY_COLUMN, key),
+                    'row': {column: _delta_value(column, normalize(row.get(column))) for column in new_columns
+                            if column != KEY_COLUMN}
+                }
+                continue
+
+            changes = {}
+            for column, position in compare:
+                before = old[position]
+                after = normalize(row.get(column))
+                if before == after:
+                    continue
+                changes[column] = [_delta_value(column, before), _delta_value(column, after)]
+                summary.column_changes[column] += 1
+                if column in summary.column_deltas:
+                    summary.column_deltas[column] += (_to_int(after) or 0) - (_to_int(before) or 0)
+                if column == 'status':
+                    transition = f"{before or '(none)'} → {after or '(none)'}"
+                    summary.status_transitions[transition] = summary.status_transitions.get(transition, 0) + 1
+
+            if changes:
+                summary.changed += 1
+                yield {'change': 'changed', KEY_COLUMN: _delta_value(KEY_COLUMN, key), 'columns': changes}
+            else:
+                summary.unchanged += 1
+
+        if summary is None:
+            # The newer export is empty
+            summary = self.summary = DiffSummary([column for column in old_columns if column != KEY_COLUMN])
+        summary.old_rows = old_count
+
+        # Whatever is left in the index no longer exists
+        title_position = old_positions.get(TITLE_COLUMN)
+        for key, old in old_index.items():
+            summary.removed += 1
+            record = {'change': 'removed', KEY_COLUMN: _delta_value(KEY_COLUMN, key)}
+            if title_position is not None:
+                record[TITLE_COLUMN] = old[title_position]
+            yield record
+
+    def write(self, delta_file: str) -> DiffSummary:
+        """
+        Diff the exports and write the delta file.
+
+        Args:
+            delta_file: Output JSON Lines file
+
+        Returns:
+            DiffSummary of the comparison
+        """
+        with open(delta_file, 'w', encoding='utf-8') as f:
+            for record in self.iter_changes():
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return self.summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare two Zendesk Knowledge Base exports and write the changes as a delta file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python zendesk_diff.py zendesk_articles_20250807.csv zendesk_articles_20250808.csv
+  python zendesk_diff.py old.parquet new.parquet --output nightly_delta.jsonl --summary nightly_summary.json
+        """
+    )
+
+    parser.add_argument(
+        'old_file',
+        help='Earlier export (CSV, Parquet or Arrow)'
+    )
+    parser.add_argument(
+        'new_file',
+        help='Later export (CSV, Parquet or Arrow)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Delta file to write (default: zendesk_diff_<timestamp>.jsonl)'
+    )
+    parser.add_argument(
+        '--summary',
+        help='Also save the summary counts to this JSON file (optional)'
+    )
+
+    args = parser.parse_args()
+
+    for filename in (args.old_file, args.new_file):
+        if not os.path.exists(filename):
+            print(f"❌ Export {filename} not found")
+            sys.exit(1)
+
+    delta_file = args.output or f"zendesk_diff_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+    print("🔍 Comparing Zendesk Knowledge Base exports")
+    print(f"   Old: {args.old_file}")
+    print(f"   New: {args.new_file}")
+
+    try:
+        summary = ExportDiff(args.old_file, args.new_file).write(delta_file)
+    except Exception as e:
+        print(f"\n❌ Diff failed: {e}")
+        sys.exit(1)
+
+    print("\n📊 Diff Summary:")
+    print(f"   Rows: {summary.old_rows} → {summary.new_rows}")
+    print(f"   Added: {summary.added}")
+    print(f"   Removed: {summary.removed}")
+    print(f"   Changed: {summary.changed}")
+    print(f"   Unchanged: {summary.unchanged}")
+    for column, count in summary.column_changes.items():
+        if not count:
+            continue
+        detail = f"   {column}: {count} rows"
+        if column in summary.column_deltas:
+            detail += f", net {summary.column_deltas[column]:+d}"
+        print(detail)
+    for transition, count in summary.status_transitions.items():
+        print(f"   status {transition}: {count}")
+    if summary.added_columns:
+        print(f"   New Columns: {', '.join(summary.added_columns)}")
+    if summary.removed_columns:
+        print(f"   Dropped Columns: {', '.join(summary.removed_columns)}")
+    print(f"   Delta File: {delta_file}")
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(dict(summary.to_dict(), old_file=args.old_file, new_file=args.new_file,
+                           delta_file=delta_file), f, indent=2)
+        print(f"   Summary File: {args.summary}")
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,6 @@ It retrieves: article titles, article links, article author name, author ID, and
 
 Requirements:
 - requests
-- pandas
 - python-dotenv (optional, for environment variables)
 
 Usage:
@@ -16,17 +15,42 @@ Usage:
 """
 
 import requests
-import pandas as pd
 import argparse
-import json
-import os
 import sys
 from datetime import datetime
-from typing import List, Dict, Optional
-import time
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+
+from zendesk_api import (article_fields, collect_sideloaded_users, fetch_metrics_bulk, iter_listing_pages,
+                         project_articles)
+from zendesk_checkpoint import ExportCheckpoint
+from zendesk_http import AdaptiveRateLimiter, create_session
+from zendesk_http_cache import HttpCache
+from zendesk_incremental import run_incremental_export
+from zendesk_instrumentation import Instrumentation
+from zendesk_pipeline import ExportStats, run_pipeline_export
+from zendesk_recording import ApiRecording, recorded_subdomain
+from zendesk_sinks import OUTPUT_EXTENSIONS, OUTPUT_FORMATS, parse_sink_spec, require_output_format, write_csv, write_rows
+from zendesk_user_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_HOURS, UserCache
 
 class ZendeskExporter:
-    def __init__(self, subdomain: str, email: str, api_token: str):
+    # Output columns, in order
+    COLUMN_ORDER = [
+        'article_title',
+        'article_link',
+        'article_author_name',
+        'author_id',
+        'views',
+        'article_id',
+        'created_at',
+        'updated_at',
+        'status'
+    ]
+    
+    def __init__(self, subdomain: str, email: str, api_token: str, workers: int = 1,
+                 user_cache: Optional[UserCache] = None, http_cache: Optional[HttpCache] = None,
+                 engine: str = 'pipeline', output_format: str = 'csv',
+                 checkpoint: Optional[ExportCheckpoint] = None, recording: Optional[ApiRecording] = None,
+                 sinks: Optional[List[str]] = None):
         """
         Initialize the Zendesk exporter.
         
@@ -34,17 +58,41 @@ class ZendeskExporter:
             subdomain: Your Zendesk subdomain (e.g., 'company' for company.zendesk.com)
             email: Your Zendesk email address
             api_token: Your Zendesk API token
+            workers: Number of concurrent page requests when listing articles
+            user_cache: Persistent user cache shared across runs (optional)
+            http_cache: On-disk HTTP cache for conditional requests (optional)
+            engine: 'pipeline' streams each page through enrichment into the output; 'sync' runs each step for all articles
+            output_format: 'csv', 'parquet' or 'arrow'
+            checkpoint: Checkpoint that makes a pipeline export resumable (optional)
+            recording: Recording that saves API responses, or replays them without network access (optional)
+            sinks: Extra sinks that receive the processed rows too, e.g. ['sqlite:articles.db'] (optional)
         """
         self.subdomain = subdomain
         self.email = email
         self.api_token = api_token
+        self.workers = max(1, workers)
+        self.engine = engine
+        require_output_format(output_format)
+        self.output_format = output_format
+        self.sinks = list(sinks or [])
+        for spec in self.sinks:
+            parse_sink_spec(spec)
+        # Article fields kept in memory; bodies and other unused fields are dropped as each page arrives
+        self.article_fields = article_fields(self.COLUMN_ORDER)
         self.base_url = f"https://{subdomain}.zendesk.com/api/v2"
-        self.session = requests.Session()
-        self.session.auth = (f"{email}/token", api_token)
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+        # Authors sideloaded with listing pages (include=users), keyed by user ID
+        self.sideloaded_users: Dict[int, Dict] = {}
+        self.user_cache = user_cache
+        self.checkpoint = checkpoint
+        self.export_stats: Optional[ExportStats] = None
+        
+        # One limiter paces every API call made by this exporter
+        self.rate_limiter = AdaptiveRateLimiter()
+        # Request counts, latencies and stage durations, written next to the output
+        self.instrumentation = Instrumentation()
+        self.session = create_session(email, api_token, self.rate_limiter, pool_size=self.workers,
+                                      http_cache=http_cache, instrumentation=self.instrumentation,
+                                      recording=recording)
         
     def test_connection(self) -> bool:
         """Test the connection to Zendesk API."""
@@ -56,6 +104,51 @@ class ZendeskExporter:
             print(f"❌ Connection failed: {e}")
             return False
     
+    def iter_article_pages(self, resume_from: Optional[Dict] = None) -> Iterator[Tuple[List[Dict], Dict]]:
+        """
+        Stream pages of knowledge articles together with their listing position.
+        
+        Authors sideloaded with each page are collected into ``self.sideloaded_users``.
+        Failed requests are retried by the session; a page that still cannot be
+        fetched raises, so an export never ends with a silently truncated listing.
+        
+        Args:
+            resume_from: Listing position saved by an interrupted export (optional)
+            
+        Yields:
+            Tuples of (articles on the page, position after the page)
+        """
+        url = f"{self.base_url}/help_center/articles.json"
+        params = {
+            'include': 'users'  # Include user information for author details
+        }
+        page = resume_from.get('pages', 0) if resume_from else 0
+        
+        try:
+            for data, position in iter_listing_pages(self.session, url, params, page_size=100,
+                                                     workers=self.workers, resume_from=resume_from):
+                page = position['pages']
+                current_articles = project_articles(data.get('articles', []), self.article_fields)
+                collect_sideloaded_users(data, self.sideloaded_users)
+                print(f"   Retrieved {len(current_articles)} articles (page {page})")
+                yield current_articles, position
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error fetching articles on page {page + 1}: {e}")
+            raise
+    
+    def iter_articles(self) -> Iterator[Dict]:
+        """
+        Stream knowledge articles from Zendesk using cursor pagination.
+        
+        Articles are yielded page by page as they arrive, so callers can start
+        processing before the whole knowledge base has been downloaded.
+        
+        Yields:
+            Article dictionaries
+        """
+        for articles, _ in self.iter_article_pages():
+            yield from articles
+    
     def get_all_articles(self) -> List[Dict]:
         """
         Retrieve all knowledge articles from Zendesk.
@@ -63,45 +156,9 @@ class ZendeskExporter:
         Returns:
             List of article dictionaries
         """
-        articles = []
-        page = 1
-        per_page = 100  # Maximum allowed by Zendesk
-        
         print("📚 Fetching articles from Zendesk...")
         
-        while True:
-            try:
-                url = f"{self.base_url}/help_center/articles.json"
-                params = {
-                    'per_page': per_page,
-                    'page': page,
-                    'include': 'users'  # Include user information for author details
-                }
-                
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                current_articles = data.get('articles', [])
-                
-                if not current_articles:
-                    break
-                
-                articles.extend(current_articles)
-                print(f"   Retrieved {len(current_articles)} articles (page {page})")
-                
-                # Check if there are more pages
-                if len(current_articles) < per_page:
-                    break
-                    
-                page += 1
-                
-                # Rate limiting - be respectful to Zendesk API
-                time.sleep(0.1)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Error fetching articles on page {page}: {e}")
-                break
+        articles = list(self.iter_articles())
         
         print(f"✅ Total articles retrieved: {len(articles)}")
         return articles
@@ -123,31 +180,12 @@ class ZendeskExporter:
             
         print("📊 Fetching article metrics...")
         
-        # Zendesk metrics API endpoint
-        try:
-            url = f"{self.base_url}/help_center/articles/metrics.json"
-            params = {
-                'article_ids': ','.join(map(str, article_ids))
-            }
-            
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            article_metrics = data.get('article_metrics', [])
-            
-            for metric in article_metrics:
-                article_id = metric.get('article_id')
-                if article_id:
-                    metrics[article_id] = {
-                        'views': metric.get('views', 0),
-                        'comments': metric.get('comments', 0),
-                        'votes': metric.get('votes', 0)
-                    }
-                    
-        except requests.exceptions.RequestException as e:
-            print(f"⚠️  Warning: Could not fetch metrics: {e}")
-            print("   Views will be set to 0")
+        # Zendesk metrics API endpoint, queried in URL-sized chunks
+        metrics, failed_chunks = fetch_metrics_bulk(self.session, self.base_url, article_ids)
+        
+        if failed_chunks:
+            print(f"⚠️  Warning: {failed_chunks} metrics request(s) failed")
+            print(f"   Views will be set to 0 for {len(article_ids) - len(metrics)} articles")
         
         return metrics
     
@@ -165,11 +203,47 @@ class ZendeskExporter:
         if user_id in users_cache:
             return users_cache[user_id]
         
-        # If not in cache, return default values
-        return {
+        cached_user = self.user_cache.get(user_id) if self.user_cache else {}
+        
+        # Remember hits and misses for the rest of the run, so each author reaches the user cache once
+        users_cache[user_id] = cached_user or {
             'name': 'Unknown Author',
             'id': user_id
         }
+        return users_cache[user_id]
+    
+    def process_article(self, article: Dict, users_cache: Dict[int, Dict], metrics: Dict[int, Dict]) -> Dict:
+        """
+        Shape a single article into an output row.
+        
+        Args:
+            article: Article dictionary
+            users_cache: Cache of user information
+            metrics: Dictionary of article metrics
+            
+        Returns:
+            Processed article dictionary
+        """
+        article_id = article.get('id')
+        author_id = article.get('author_id')
+        
+        # Get author information
+        author_info = self.get_user_info(author_id, users_cache)
+        
+        # Get metrics
+        article_metrics = metrics.get(article_id, {})
+        
+        return {
+            'article_title': article.get('title', ''),
+            'article_link': f"https://{self.subdomain}.zendesk.com/hc/en-us/articles/{article_id}",
+            'article_author_name': author_info.get('name', 'Unknown Author'),
+            'author_id': author_id,
+            'views': article_metrics.get('views', 0),
+            'article_id': article_id,
+            'created_at': article.get('created_at', ''),
+            'updated_at': article.get('updated_at', ''),
+            'status': article.get('draft', False) and 'draft' or 'published'
+        }
     
     def process_articles(self, articles: List[Dict], users_cache: Dict[int, Dict], metrics: Dict[int, Dict]) -> List[Dict]:
         """
@@ -183,39 +257,13 @@ class ZendeskExporter:
         Returns:
             List of processed article dictionaries
         """
-        processed_articles = []
-        
         print("🔧 Processing articles...")
         
-        for article in articles:
-            article_id = article.get('id')
-            author_id = article.get('author_id')
-            
-            # Get author information
-            author_info = self.get_user_info(author_id, users_cache)
-            
-            # Get metrics
-            article_metrics = metrics.get(article_id, {})
-            
-            processed_article = {
-                'article_title': article.get('title', ''),
-                'article_link': f"https://{self.subdomain}.zendesk.com/hc/en-us/articles/{article_id}",
-                'article_author_name': author_info.get('name', 'Unknown Author'),
-                'author_id': author_id,
-                'views': article_metrics.get('views', 0),
-                'article_id': article_id,
-                'created_at': article.get('created_at', ''),
-                'updated_at': article.get('updated_at', ''),
-                'status': article.get('draft', False) and 'draft' or 'published'
-            }
-            
-            processed_articles.append(processed_article)
-        
-        return processed_articles
+        return [self.process_article(article, users_cache, metrics) for article in articles]
     
     def build_users_cache(self, articles: List[Dict]) -> Dict[int, Dict]:
         """
-        Build a cache of user information from articles that include user data.
+        Build a cache of user information from the users sideloaded while listing.
         
         Args:
             articles: List of article dictionaries
@@ -225,58 +273,99 @@ class ZendeskExporter:
         """
         users_cache = {}
         
-        # Extract user information from articles if available
+        # Listing pages carry their authors in a top-level "users" array
         for article in articles:
-            if 'user' in article and article['user']:
-                user = article['user']
-                user_id = user.get('id')
-                if user_id:
-                    users_cache[user_id] = {
-                        'name': user.get('name', 'Unknown Author'),
-                        'id': user_id
-                    }
+            author_id = article.get('author_id')
+            if author_id in self.sideloaded_users:
+                users_cache[author_id] = self.sideloaded_users[author_id]
+        
+        if self.user_cache:
+            self.user_cache.put_many(users_cache)
         
         return users_cache
     
-    def export_to_csv(self, articles: List[Dict], filename: Optional[str] = None) -> str:
+    def get_output_filename(self, filename: Optional[str] = None) -> str:
+        """
+        Return the output filename, defaulting to a timestamped name.
+        
+        Args:
+            filename: Output filename (optional)
+            
+        Returns:
+            Output filename
+        """
+        if filename:
+            return filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"zendesk_articles_{timestamp}.{OUTPUT_EXTENSIONS[self.output_format]}"
+    
+    def export_to_csv(self, articles: Iterable[Dict], filename: Optional[str] = None) -> str:
         """
         Export articles to CSV file.
         
+        Rows are written as the iterable yields them, in blocks, so memory use
+        does not grow with the number of articles.
+        
         Args:
-            articles: List of processed article dictionaries
+            articles: Processed article dictionaries (any iterable)
             filename: Output filename (optional)
             
         Returns:
             Filename of the exported CSV
         """
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"zendesk_articles_{timestamp}.csv"
+        filename = self.get_output_filename(filename)
         
-        df = pd.DataFrame(articles)
+        count = write_csv(articles, filename, self.COLUMN_ORDER, extra_sinks=self.sinks)
         
-        # Reorder columns to match requirements
-        column_order = [
-            'article_title',
-            'article_link', 
-            'article_author_name',
-            'author_id',
-            'views',
-            'article_id',
-            'created_at',
-            'updated_at',
-            'status'
-        ]
+        print(f"✅ Exported {count} articles to {filename}")
+        return filename
+    
+    def export_rows(self, articles: Iterable[Dict], filename: Optional[str] = None) -> str:
+        """
+        Export articles in the configured output format.
         
-        # Only include columns that exist in the dataframe
-        existing_columns = [col for col in column_order if col in df.columns]
-        df = df[existing_columns]
+        Args:
+            articles: Processed article dictionaries (any iterable)
+            filename: Output filename (optional)
+            
+        Returns:
+            Filename of the export
+        """
+        if self.output_format == 'csv':
+            return self.export_to_csv(articles, filename)
         
-        df.to_csv(filename, index=False, encoding='utf-8')
+        filename = self.get_output_filename(filename)
         
-        print(f"✅ Exported {len(articles)} articles to {filename}")
+        count = write_rows(articles, filename, self.COLUMN_ORDER, self.output_format, self.sinks)
+        
+        print(f"✅ Exported {count} articles to {filename}")
         return filename
     
+    def enrich_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Resolve authors and metrics for articles and shape them into output rows.
+        
+        Args:
+            articles: List of article dictionaries
+            
+        Returns:
+            List of processed article dictionaries
+        """
+        # Build users cache
+        with self.instrumentation.stage('resolve_authors'):
+            users_cache = self.build_users_cache(articles)
+        
+        # Get article IDs for metrics
+        article_ids = [article.get('id') for article in articles if article.get('id')]
+        
+        # Get metrics
+        with self.instrumentation.stage('fetch_metrics'):
+            metrics = self.get_article_metrics(article_ids)
+        
+        # Process articles
+        with self.instrumentation.stage('process_rows'):
+            return self.process_articles(articles, users_cache, metrics)
+    
     def run_export(self, output_file: Optional[str] = None) -> str:
         """
         Run the complete export process.
@@ -294,35 +383,70 @@ class ZendeskExporter:
         if not self.test_connection():
             raise Exception("Failed to connect to Zendesk API")
         
-        # Get all articles
-        articles = self.get_all_articles()
-        
-        if not articles:
+        if self.engine == 'pipeline':
+            # Stream each listing page through enrichment straight into the CSV
+            with self.instrumentation.stage('pipeline'):
+                filename, stats = self.run_pipeline(output_file)
+        else:
+            if self.checkpoint:
+                print("⚠️  Checkpoints only apply to the pipeline engine; this run cannot be resumed")
+            # Get all articles, resolve authors and metrics, then shape the output rows
+            with self.instrumentation.stage('list_articles'):
+                articles = self.get_all_articles()
+            processed_articles = self.enrich_articles(articles) if articles else []
+            with self.instrumentation.stage('write_output'):
+                filename = self.export_rows(processed_articles, output_file) if processed_articles else ""
+            stats = ExportStats(processed_articles)
+        
+        # Totals of the last run, for callers such as the batch exporter
+        self.export_stats = stats
+        
+        if not stats.total_articles:
             print("❌ No articles found")
             return ""
         
-        # Build users cache
-        users_cache = self.build_users_cache(articles)
-        
-        # Get article IDs for metrics
-        article_ids = [article.get('id') for article in articles if article.get('id')]
-        
-        # Get metrics
-        metrics = self.get_article_metrics(article_ids)
-        
-        # Process articles
-        processed_articles = self.process_articles(articles, users_cache, metrics)
-        
-        # Export to CSV
-        filename = self.export_to_csv(processed_articles, output_file)
-        
         # Print summary
         print("\n📊 Export Summary:")
-        print(f"   Total Articles: {len(processed_articles)}")
-        print(f"   Total Views: {sum(article['views'] for article in processed_articles)}")
+        print(f"   Total Articles: {stats.total_articles}")
+        print(f"   Total Views: {stats.total_views}")
+        if self.session.http_cache:
+            print(f"   HTTP Cache: {self.session.http_cache.summary()}")
+        if self.session.recording:
+            print(f"   Recording: {self.session.recording.summary()}")
+        print(f"   Requests: {self.instrumentation.summary()}")
         print(f"   Output File: {filename}")
+        if self.sinks:
+            print(f"   Extra Sinks: {', '.join(self.sinks)}")
+        print(f"   Request Metrics: {', '.join(self.instrumentation.write(filename))}")
         
         return filename
+    
+    def run_pipeline(self, output_file: Optional[str] = None) -> Tuple[str, ExportStats]:
+        """
+        Stream articles page by page through author lookup, metrics lookup and row shaping into the output file.
+        
+        Args:
+            output_file: Output filename (optional)
+            
+        Returns:
+            Tuple of (filename of the export, export totals)
+        """
+        # Authors come from the sideload only, and only the bulk metrics endpoint is used
+        return run_pipeline_export(self, output_file, lookup_authors=False, per_article_metrics=False,
+                                   checkpoint=self.checkpoint)
+    
+    def run_incremental_export(self, state_file: str, output_file: Optional[str] = None) -> str:
+        """
+        Export only the articles changed since the last run and merge them into its output.
+        
+        Args:
+            state_file: Path to the incremental checkpoint file
+            output_file: Output filename (optional)
+            
+        Returns:
+            Filename of the exported CSV
+        """
+        return run_incremental_export(self, state_file, output_file)
 
 def load_config_from_file(config_file: str) -> Dict[str, str]:
     """Load configuration from .env file."""
@@ -371,7 +495,77 @@ Examples:
     )
     parser.add_argument(
         '--output',
-        help='Output CSV filename (optional)'
+        help='Output filename (optional)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=list(OUTPUT_FORMATS),
+        default='csv',
+        help='Output format; parquet and arrow write a typed columnar file and require pyarrow (default: csv)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Concurrent page requests when listing articles (default: 1)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['pipeline', 'sync'],
+        default='pipeline',
+        help='Stream pages through enrichment into the CSV, or run each step for all articles (default: pipeline)'
+    )
+    parser.add_argument(
+        '--user-cache',
+        help='SQLite file used to cache authors across runs (optional)'
+    )
+    parser.add_argument(
+        '--user-cache-ttl',
+        type=float,
+        default=DEFAULT_TTL_HOURS,
+        help=f'Hours before a cached author is fetched again (default: {DEFAULT_TTL_HOURS})'
+    )
+    parser.add_argument(
+        '--user-cache-size',
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f'Maximum number of cached authors (default: {DEFAULT_MAX_ENTRIES})'
+    )
+    parser.add_argument(
+        '--http-cache',
+        help='Directory for an on-disk HTTP cache with ETag revalidation (optional)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only export articles changed since the last run and merge them into its output'
+    )
+    parser.add_argument(
+        '--incremental-state',
+        default='zendesk_export_incremental.json',
+        help='Checkpoint file used by --incremental (default: zendesk_export_incremental.json)'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help='Record progress after every page in this file and resume from it after an interruption (pipeline engine)'
+    )
+    parser.add_argument(
+        '--record',
+        help='Save every raw API response to this directory for offline replay (optional)'
+    )
+    parser.add_argument(
+        '--replay',
+        help='Feed the export from a directory written by --record instead of the API; no network access'
+    )
+    parser.add_argument(
+        '--sink',
+        action='append',
+        help='Also write the rows to sqlite:PATH, upserted by article_id into an indexed table (repeatable)'
+    )
+    parser.add_argument(
+        '--report',
+        action='store_true',
+        help='Write aggregate reports (by author/section/category, top-N) as JSON and CSV next to the export; requires pandas'
     )
     
     args = parser.parse_args()
@@ -387,6 +581,16 @@ Examples:
         email = args.email
         api_token = args.api_token
     
+    if args.record and args.replay:
+        print("❌ --record and --replay cannot be used together")
+        sys.exit(1)
+    
+    # A replay sends nothing over the network, so credentials are optional
+    if args.replay:
+        subdomain = subdomain or recorded_subdomain(args.replay) or 'replay'
+        email = email or 'replay'
+        api_token = api_token or 'replay'
+    
     # Validate required parameters
     if not all([subdomain, email, api_token]):
         print("❌ Missing required parameters")
@@ -394,10 +598,35 @@ Examples:
         print("   Or use --config-file with a .env file")
         sys.exit(1)
     
+    user_cache = None
     try:
         # Create exporter and run export
-        exporter = ZendeskExporter(subdomain, email, api_token)
-        output_file = exporter.run_export(args.output)
+        if args.user_cache:
+            user_cache = UserCache(args.user_cache, args.user_cache_ttl, args.user_cache_size)
+        
+        http_cache = HttpCache(args.http_cache) if args.http_cache else None
+        checkpoint = ExportCheckpoint(args.checkpoint) if args.checkpoint else None
+        if args.report:
+            # pandas is only loaded when a report is asked for
+            from zendesk_reports import require_reports, write_report
+            require_reports()
+        recording = None
+        if args.record or args.replay:
+            recording = ApiRecording(args.replay or args.record, 'replay' if args.replay else 'record', subdomain)
+        
+        exporter = ZendeskExporter(subdomain, email, api_token, workers=args.workers,
+                                   user_cache=user_cache, http_cache=http_cache, engine=args.engine,
+                                   output_format=args.format, checkpoint=checkpoint, recording=recording,
+                                   sinks=args.sink)
+        if args.incremental:
+            output_file = exporter.run_incremental_export(args.incremental_state, args.output)
+        else:
+            output_file = exporter.run_export(args.output)
+        if recording:
+            recording.close()
+        
+        if output_file and args.report:
+            print(f"📈 Report: {', '.join(write_report(output_file))}")
         
         if output_file:
             print(f"\n🎉 Export completed successfully!")
@@ -409,6 +638,9 @@ Examples:
     except Exception as e:
         print(f"\n❌ Export failed: {e}")
         sys.exit(1)
+    finally:
+        if user_cache:
+            user_cache.close()
 
 if __name__ == "__main__":
     main()
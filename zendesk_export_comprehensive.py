@@ -11,32 +11,93 @@ This script tries multiple methods to extract view counts:
 """
 
 import requests
-import pandas as pd
 import argparse
-import json
-import os
 import sys
 from datetime import datetime
-from typing import List, Dict, Optional
-import time
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 import re
-from urllib.parse import urljoin
+
+from zendesk_api import (HelpCenterTaxonomy, article_fields, collect_sideloaded_users, fetch_metrics_bulk,
+                         fetch_metrics_individually, fetch_taxonomy, fetch_users_bulk, iter_listing_pages,
+                         project_articles)
+from zendesk_async import async_engine_available, run_async_engine
+from zendesk_checkpoint import ExportCheckpoint
+from zendesk_http import AdaptiveRateLimiter, ZendeskSession, create_session
+from zendesk_http_cache import HttpCache
+from zendesk_incremental import run_incremental_export
+from zendesk_instrumentation import Instrumentation
+from zendesk_pipeline import ExportStats, run_pipeline_export
+from zendesk_recording import ApiRecording, recorded_subdomain
+from zendesk_sinks import OUTPUT_EXTENSIONS, OUTPUT_FORMATS, parse_sink_spec, require_output_format, write_csv, write_rows
+from zendesk_user_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_HOURS, UserCache
 
 class ZendeskComprehensiveExporter:
-    def __init__(self, subdomain: str, email: str, api_token: str):
+    COLUMN_ORDER = [
+        'article_title',
+        'article_link',
+        'article_author_name',
+        'author_id',
+        'author_email',
+        'views',
+        'comments',
+        'votes',
+        'vote_sum',
+        'vote_count',
+        'article_id',
+        'created_at',
+        'updated_at',
+        'status',
+        'section_id',
+        'section_name',
+        'category_id',
+        'category_name'
+    ]
+    
+    def __init__(self, subdomain: str, email: str, api_token: str, workers: int = 1,
+                 user_cache: Optional[UserCache] = None, http_cache: Optional[HttpCache] = None,
+                 metrics_workers: int = 8, metrics_rps: Optional[float] = None, engine: str = 'pipeline',
+                 output_format: str = 'csv', checkpoint: Optional[ExportCheckpoint] = None,
+                 recording: Optional[ApiRecording] = None, sinks: Optional[List[str]] = None):
         self.subdomain = subdomain
         self.email = email
         self.api_token = api_token
+        self.workers = max(1, workers)
+        self.metrics_workers = max(1, metrics_workers)
+        self.metrics_rps = metrics_rps
+        self.engine = engine
+        require_output_format(output_format)
+        self.output_format = output_format
+        self.sinks = list(sinks or [])
+        for spec in self.sinks:
+            parse_sink_spec(spec)
+        # Article fields kept in memory; bodies and other unused fields are dropped as each page arrives
+        self.article_fields = article_fields(self.COLUMN_ORDER)
+        if engine == 'async' and not async_engine_available():
+            print("⚠️  aiohttp is not installed, using the pipeline engine")
+            self.engine = 'pipeline'
         self.base_url = f"https://{subdomain}.zendesk.com/api/v2"
-        self.session = requests.Session()
-        self.session.auth = (f"{email}/token", api_token)
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
-        
-        # Web scraping session
-        self.web_session = requests.Session()
+        # Authors sideloaded with listing pages (include=users), keyed by user ID
+        self.sideloaded_users: Dict[int, Dict] = {}
+        self.user_cache = user_cache
+        self.checkpoint = checkpoint
+        self.export_stats: Optional[ExportStats] = None
+        # Sections and categories, listed once per run and joined onto every row
+        self.taxonomy: Optional[HelpCenterTaxonomy] = None
+        # Whether the analytics and scraping metrics methods already ran in this pipeline export
+        self.metrics_last_resorts_tried = False
+        
+        # One limiter paces every API call made by this exporter
+        self.rate_limiter = AdaptiveRateLimiter()
+        # Request counts, latencies and stage durations, written next to the output
+        self.instrumentation = Instrumentation()
+        self.session = create_session(email, api_token, self.rate_limiter,
+                                      pool_size=max(self.workers, self.metrics_workers),
+                                      http_cache=http_cache, instrumentation=self.instrumentation,
+                                      recording=recording)
+        
+        # Web scraping session, paced separately at one page per second
+        self.web_session = ZendeskSession(AdaptiveRateLimiter(rate=1.0, burst=1), instrumentation=self.instrumentation,
+                                          recording=recording)
         self.web_session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
@@ -51,44 +112,34 @@ class ZendeskComprehensiveExporter:
             print(f"❌ Connection failed: {e}")
             return False
     
+    def iter_article_pages(self, resume_from: Optional[Dict] = None) -> Iterator[Tuple[List[Dict], Dict]]:
+        """Stream pages of knowledge articles with their listing position; a page that still fails after retries raises."""
+        url = f"{self.base_url}/help_center/articles.json"
+        params = {'include': 'users'}
+        page = resume_from.get('pages', 0) if resume_from else 0
+        
+        try:
+            for data, position in iter_listing_pages(self.session, url, params, page_size=100,
+                                                     workers=self.workers, resume_from=resume_from):
+                page = position['pages']
+                current_articles = project_articles(data.get('articles', []), self.article_fields)
+                collect_sideloaded_users(data, self.sideloaded_users)
+                print(f"   Retrieved {len(current_articles)} articles (page {page})")
+                yield current_articles, position
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error fetching articles on page {page + 1}: {e}")
+            raise
+    
+    def iter_articles(self) -> Iterator[Dict]:
+        """Stream knowledge articles from Zendesk using cursor pagination."""
+        for articles, _ in self.iter_article_pages():
+            yield from articles
+    
     def get_all_articles(self) -> List[Dict]:
         """Retrieve all knowledge articles from Zendesk."""
-        articles = []
-        page = 1
-        per_page = 100
-        
         print("📚 Fetching articles from Zendesk...")
         
-        while True:
-            try:
-                url = f"{self.base_url}/help_center/articles.json"
-                params = {
-                    'per_page': per_page,
-                    'page': page,
-                    'include': 'users'
-                }
-                
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                current_articles = data.get('articles', [])
-                
-                if not current_articles:
-                    break
-                
-                articles.extend(current_articles)
-                print(f"   Retrieved {len(current_articles)} articles (page {page})")
-                
-                if len(current_articles) < per_page:
-                    break
-                    
-                page += 1
-                time.sleep(0.1)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Error fetching articles on page {page}: {e}")
-                break
+        articles = list(self.iter_articles())
         
         print(f"✅ Total articles retrieved: {len(articles)}")
         return articles
@@ -118,60 +169,26 @@ class ZendeskComprehensiveExporter:
     def try_metrics_method_1(self, article_ids: List[int]) -> Dict[int, Dict]:
         """Method 1: Standard metrics API"""
         print("   Trying Method 1: Standard metrics API...")
-        metrics = {}
+        metrics, failed_chunks = fetch_metrics_bulk(self.session, self.base_url, article_ids)
         
-        try:
-            url = f"{self.base_url}/help_center/articles/metrics.json"
-            params = {'article_ids': ','.join(map(str, article_ids))}
-            response = self.session.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                article_metrics = data.get('article_metrics', [])
-                
-                for metric in article_metrics:
-                    article_id = metric.get('article_id')
-                    if article_id:
-                        metrics[article_id] = {
-                            'views': metric.get('views', 0),
-                            'comments': metric.get('comments', 0),
-                            'votes': metric.get('votes', 0)
-                        }
-                print(f"     ✅ Retrieved metrics for {len(metrics)} articles")
-                return metrics
-            else:
-                print(f"     ❌ Failed: {response.status_code}")
-        except Exception as e:
-            print(f"     ❌ Exception: {e}")
+        if metrics:
+            print(f"     ✅ Retrieved metrics for {len(metrics)} articles")
+            if failed_chunks:
+                print(f"     ⚠️  {failed_chunks} chunk(s) failed; {len(article_ids) - len(metrics)} articles have no metrics")
+        else:
+            print("     ❌ Failed")
         
         return metrics
     
     def try_metrics_method_2(self, article_ids: List[int]) -> Dict[int, Dict]:
         """Method 2: Individual article metrics"""
         print("   Trying Method 2: Individual article metrics...")
-        metrics = {}
-        
-        for i, article_id in enumerate(article_ids[:20]):  # Limit to avoid rate limiting
-            try:
-                url = f"{self.base_url}/help_center/articles/{article_id}/metrics.json"
-                response = self.session.get(url)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    metric = data.get('article_metric', {})
-                    metrics[article_id] = {
-                        'views': metric.get('views', 0),
-                        'comments': metric.get('comments', 0),
-                        'votes': metric.get('votes', 0)
-                    }
-                
-                if i % 5 == 0:
-                    print(f"     Progress: {i+1}/{min(20, len(article_ids))}")
-                
-                time.sleep(0.2)  # Rate limiting
-                
-            except Exception:
-                continue
+        metrics = fetch_metrics_individually(
+            self.session, self.base_url, article_ids,
+            workers=self.metrics_workers,
+            max_rate=self.metrics_rps,
+            on_progress=lambda done, total: print(f"     Progress: {done}/{total}")
+        )
         
         if metrics:
             print(f"     ✅ Retrieved metrics for {len(metrics)} articles")
@@ -255,8 +272,6 @@ class ZendeskComprehensiveExporter:
                 if i % 3 == 0:
                     print(f"     Scraping progress: {i+1}/{min(10, len(articles))}")
                 
-                time.sleep(1)  # Be respectful
-                
             except Exception as e:
                 print(f"     Error scraping article {article['id']}: {e}")
                 continue
@@ -302,9 +317,22 @@ class ZendeskComprehensiveExporter:
         
         return metrics
     
+    def get_fallback_metrics(self, articles: List[Dict]) -> Dict[int, Dict]:
+        """Metrics for one pipeline batch after the standard API failed: methods 2 to 4, as in the sync engine."""
+        article_ids = [article.get('id') for article in articles if article.get('id')]
+        metrics = fetch_metrics_individually(self.session, self.base_url, article_ids,
+                                             workers=self.metrics_workers, max_rate=self.metrics_rps)
+        
+        # The analytics and scraping methods run once per export, like in the sync engine
+        if not metrics and not self.metrics_last_resorts_tried:
+            self.metrics_last_resorts_tried = True
+            metrics = self.try_metrics_method_3(article_ids) or self.try_metrics_method_4(articles)
+            if not metrics:
+                print("   ⚠️  Could not retrieve metrics via any method")
+        return metrics
+    
     def build_users_cache_improved(self, articles: List[Dict]) -> Dict[int, Dict]:
         """Build a comprehensive cache of user information."""
-        users_cache = {}
         unique_user_ids = set()
         
         for article in articles:
@@ -314,91 +342,153 @@ class ZendeskComprehensiveExporter:
         
         print(f"👥 Fetching information for {len(unique_user_ids)} unique users...")
         
-        for user_id in unique_user_ids:
-            if user_id not in users_cache:
-                user_info = self.get_user_info_direct(user_id)
-                users_cache[user_id] = user_info
-                time.sleep(0.1)
+        # Authors sideloaded with the listing pages need no further requests
+        users_cache = {user_id: self.sideloaded_users[user_id]
+                       for user_id in unique_user_ids if user_id in self.sideloaded_users}
+        print(f"   {len(users_cache)} users resolved from sideloaded listing data")
+        
+        fresh_users = dict(users_cache)
+        
+        # Then the persistent cache from earlier runs
+        remaining_ids = [user_id for user_id in unique_user_ids if user_id not in users_cache]
+        if remaining_ids and self.user_cache:
+            cached_users = self.user_cache.get_many(remaining_ids)
+            users_cache.update(cached_users)
+            print(f"   {len(cached_users)} users resolved from the persistent user cache")
+        
+        remaining_ids = [user_id for user_id in unique_user_ids if user_id not in users_cache]
+        if remaining_ids:
+            bulk_users = fetch_users_bulk(self.session, self.base_url, remaining_ids)
+            users_cache.update(bulk_users)
+            fresh_users.update(bulk_users)
+        
+        if self.user_cache:
+            self.user_cache.put_many(fresh_users)
+        
+        missing_ids = [user_id for user_id in unique_user_ids if user_id not in users_cache]
+        
+        if missing_ids:
+            print(f"   Falling back to single lookups for {len(missing_ids)} users...")
+        for user_id in missing_ids:
+            users_cache[user_id] = self.get_user_info_direct(user_id)
         
         print(f"✅ User information cached for {len(users_cache)} users")
         return users_cache
     
-    def process_articles(self, articles: List[Dict], users_cache: Dict[int, Dict], metrics: Dict[int, Dict]) -> List[Dict]:
-        """Process articles and extract required information."""
-        processed_articles = []
-        
-        print("🔧 Processing articles...")
-        
-        for article in articles:
-            article_id = article.get('id')
-            author_id = article.get('author_id')
-            
-            author_info = users_cache.get(author_id, {
+    def get_cached_user(self, user_id: int) -> Dict:
+        """Look up a user in the persistent user cache, if one is configured."""
+        if not self.user_cache or user_id is None:
+            return {}
+        return self.user_cache.get(user_id)
+    
+    def get_taxonomy(self) -> HelpCenterTaxonomy:
+        """Return the sections and categories of the Help Center, listing them on first use."""
+        if self.taxonomy is None:
+            with self.instrumentation.stage('fetch_taxonomy'):
+                self.taxonomy = fetch_taxonomy(self.session, self.base_url)
+            print(f"✅ Help Center taxonomy: {self.taxonomy.summary()}")
+        return self.taxonomy
+    
+    def process_article(self, article: Dict, users_cache: Dict[int, Dict], metrics: Dict[int, Dict]) -> Dict:
+        """Shape a single article into an output row."""
+        article_id = article.get('id')
+        author_id = article.get('author_id')
+        
+        author_info = users_cache.get(author_id)
+        if not author_info:
+            # Remember hits and misses for the rest of the run, so each author reaches the user cache once
+            author_info = users_cache[author_id] = self.get_cached_user(author_id) or {
                 'name': f'Unknown Author (ID: {author_id})',
                 'id': author_id,
                 'email': ''
-            })
-            
-            article_metrics = metrics.get(article_id, {})
-            
-            processed_article = {
-                'article_title': article.get('title', ''),
-                'article_link': f"https://{self.subdomain}.zendesk.com/hc/en-us/articles/{article_id}",
-                'article_author_name': author_info.get('name', 'Unknown Author'),
-                'author_id': author_id,
-                'author_email': author_info.get('email', ''),
-                'views': article_metrics.get('views', 0),
-                'comments': article_metrics.get('comments', 0),
-                'votes': article_metrics.get('votes', 0),
-                'article_id': article_id,
-                'created_at': article.get('created_at', ''),
-                'updated_at': article.get('updated_at', ''),
-                'status': article.get('draft', False) and 'draft' or 'published',
-                'section_id': article.get('section_id', ''),
-                'category_id': article.get('category_id', ''),
-                'vote_sum': article.get('vote_sum', 0),
-                'vote_count': article.get('vote_count', 0)
             }
-            
-            processed_articles.append(processed_article)
-        
-        return processed_articles
-    
-    def export_to_csv(self, articles: List[Dict], filename: Optional[str] = None) -> str:
-        """Export articles to CSV file."""
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"zendesk_articles_comprehensive_{timestamp}.csv"
-        
-        df = pd.DataFrame(articles)
-        
-        column_order = [
-            'article_title',
-            'article_link', 
-            'article_author_name',
-            'author_id',
-            'author_email',
-            'views',
-            'comments',
-            'votes',
-            'vote_sum',
-            'vote_count',
-            'article_id',
-            'created_at',
-            'updated_at',
-            'status',
-            'section_id',
-            'category_id'
-        ]
-        
-        existing_columns = [col for col in column_order if col in df.columns]
-        df = df[existing_columns]
-        
-        df.to_csv(filename, index=False, encoding='utf-8')
-        
-        print(f"✅ Exported {len(articles)} articles to {filename}")
+        
+        article_metrics = metrics.get(article_id, {})
+        
+        # Articles only carry their section; category and names come from the taxonomy
+        section_id = article.get('section_id', '')
+        category_id, section_name, category_name = self.get_taxonomy().resolve(section_id)
+        
+        return {
+            'article_title': article.get('title', ''),
+            'article_link': f"https://{self.subdomain}.zendesk.com/hc/en-us/articles/{article_id}",
+            'article_author_name': author_info.get('name', 'Unknown Author'),
+            'author_id': author_id,
+            'author_email': author_info.get('email', ''),
+            'views': article_metrics.get('views', 0),
+            'comments': article_metrics.get('comments', 0),
+            'votes': article_metrics.get('votes', 0),
+            'article_id': article_id,
+            'created_at': article.get('created_at', ''),
+            'updated_at': article.get('updated_at', ''),
+            'status': article.get('draft', False) and 'draft' or 'published',
+            'section_id': section_id,
+            'section_name': section_name,
+            'category_id': article.get('category_id') or category_id,
+            'category_name': category_name,
+            'vote_sum': article.get('vote_sum', 0),
+            'vote_count': article.get('vote_count', 0)
+        }
+    
+    def process_articles(self, articles: List[Dict], users_cache: Dict[int, Dict], metrics: Dict[int, Dict]) -> List[Dict]:
+        """Process articles and extract required information."""
+        print("🔧 Processing articles...")
+        
+        return [self.process_article(article, users_cache, metrics) for article in articles]
+    
+    def get_output_filename(self, filename: Optional[str] = None) -> str:
+        """Return the output filename, defaulting to a timestamped name."""
+        if filename:
+            return filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"zendesk_articles_comprehensive_{timestamp}.{OUTPUT_EXTENSIONS[self.output_format]}"
+    
+    def export_to_csv(self, articles: Iterable[Dict], filename: Optional[str] = None) -> str:
+        """Stream processed articles into a CSV file."""
+        filename = self.get_output_filename(filename)
+        
+        count = write_csv(articles, filename, self.COLUMN_ORDER, extra_sinks=self.sinks)
+        
+        print(f"✅ Exported {count} articles to {filename}")
         return filename
     
+    def export_rows(self, articles: Iterable[Dict], filename: Optional[str] = None) -> str:
+        """Export articles in the configured output format."""
+        if self.output_format == 'csv':
+            return self.export_to_csv(articles, filename)
+        
+        filename = self.get_output_filename(filename)
+        
+        count = write_rows(articles, filename, self.COLUMN_ORDER, self.output_format, self.sinks)
+        
+        print(f"✅ Exported {count} articles to {filename}")
+        return filename
+    
+    def enrich_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Resolve authors and metrics for articles and shape them into output rows."""
+        with self.instrumentation.stage('resolve_authors'):
+            users_cache = self.build_users_cache_improved(articles)
+        with self.instrumentation.stage('fetch_metrics'):
+            metrics = self.get_article_metrics_comprehensive(articles)
+        with self.instrumentation.stage('process_rows'):
+            return self.process_articles(articles, users_cache, metrics)
+    
+    def enrich_articles_async(self) -> List[Dict]:
+        """List, resolve authors and fetch metrics as overlapping coroutines, then shape the rows."""
+        print("📚 Fetching articles, authors and metrics concurrently (async engine)...")
+        articles, users_cache, metrics = run_async_engine(self, connections=max(self.workers, self.metrics_workers))
+        
+        print(f"✅ Total articles retrieved: {len(articles)}")
+        print(f"✅ User information cached for {len(users_cache)} users")
+        
+        if articles and not metrics:
+            # Analytics and scraping fallbacks stay synchronous
+            article_ids = [article.get('id') for article in articles if article.get('id')]
+            metrics = self.try_metrics_method_3(article_ids) or self.try_metrics_method_4(articles)
+        print(f"✅ Retrieved metrics for {len(metrics)} articles")
+        
+        return self.process_articles(articles, users_cache, metrics)
+    
     def run_export(self, output_file: Optional[str] = None) -> str:
         """Run the complete export process."""
         print("🚀 Starting Comprehensive Zendesk Knowledge Base Export")
@@ -407,26 +497,60 @@ class ZendeskComprehensiveExporter:
         if not self.test_connection():
             raise Exception("Failed to connect to Zendesk API")
         
-        articles = self.get_all_articles()
+        # Section and category names are listed again for every run
+        self.taxonomy = None
+        self.metrics_last_resorts_tried = False
         
-        if not articles:
+        if self.engine == 'pipeline':
+            with self.instrumentation.stage('pipeline'):
+                filename, stats = self.run_pipeline(output_file)
+        else:
+            if self.checkpoint:
+                print("⚠️  Checkpoints only apply to the pipeline engine; this run cannot be resumed")
+            if self.engine == 'async':
+                with self.instrumentation.stage('async_engine'):
+                    processed_articles = self.enrich_articles_async()
+            else:
+                with self.instrumentation.stage('list_articles'):
+                    articles = self.get_all_articles()
+                processed_articles = self.enrich_articles(articles) if articles else []
+            with self.instrumentation.stage('write_output'):
+                filename = self.export_rows(processed_articles, output_file) if processed_articles else ""
+            stats = ExportStats(processed_articles)
+        
+        # Totals of the last run, for callers such as the batch exporter
+        self.export_stats = stats
+        
+        if not stats.total_articles:
             print("❌ No articles found")
             return ""
         
-        users_cache = self.build_users_cache_improved(articles)
-        metrics = self.get_article_metrics_comprehensive(articles)
-        processed_articles = self.process_articles(articles, users_cache, metrics)
-        filename = self.export_to_csv(processed_articles, output_file)
-        
         # Print summary
         print("\n📊 Export Summary:")
-        print(f"   Total Articles: {len(processed_articles)}")
-        print(f"   Total Views: {sum(article['views'] for article in processed_articles)}")
-        print(f"   Articles with Views: {sum(1 for article in processed_articles if article['views'] > 0)}")
-        print(f"   Unique Authors: {len(set(article['author_id'] for article in processed_articles))}")
+        print(f"   Total Articles: {stats.total_articles}")
+        print(f"   Total Views: {stats.total_views}")
+        print(f"   Articles with Views: {stats.articles_with_views}")
+        print(f"   Unique Authors: {stats.unique_authors}")
+        if self.session.http_cache:
+            print(f"   HTTP Cache: {self.session.http_cache.summary()}")
+        if self.session.recording:
+            print(f"   Recording: {self.session.recording.summary()}")
+        print(f"   Requests: {self.instrumentation.summary()}")
         print(f"   Output File: {filename}")
+        if self.sinks:
+            print(f"   Extra Sinks: {', '.join(self.sinks)}")
+        print(f"   Request Metrics: {', '.join(self.instrumentation.write(filename))}")
         
         return filename
+    
+    def run_pipeline(self, output_file: Optional[str] = None) -> Tuple[str, ExportStats]:
+        """Stream articles page by page through author lookup, metrics lookup and row shaping into the output file."""
+        return run_pipeline_export(self, output_file, checkpoint=self.checkpoint, metrics_pages=self.metrics_workers,
+                                   metrics_fallback=self.get_fallback_metrics)
+    
+    def run_incremental_export(self, state_file: str, output_file: Optional[str] = None) -> str:
+        """Export only the articles changed since the last run and merge them into its output."""
+        return run_incremental_export(self, state_file, output_file)
 
 def load_config_from_file(config_file: str) -> Dict[str, str]:
     """Load configuration from .env file."""
@@ -460,7 +584,38 @@ Examples:
     parser.add_argument('--email', help='Your Zendesk email address')
     parser.add_argument('--api-token', help='Your Zendesk API token')
     parser.add_argument('--config-file', help='Path to .env file containing configuration')
-    parser.add_argument('--output', help='Output CSV filename (optional)')
+    parser.add_argument('--output', help='Output filename (optional)')
+    parser.add_argument('--format', choices=list(OUTPUT_FORMATS), default='csv',
+                        help='Output format; parquet and arrow write a typed columnar file and require pyarrow (default: csv)')
+    parser.add_argument('--workers', type=int, default=1, help='Concurrent page requests when listing articles (default: 1)')
+    parser.add_argument('--engine', choices=['pipeline', 'sync', 'async'], default='pipeline',
+                        help='Stream pages through enrichment into the CSV (default), run each step for all articles, '
+                             'or use overlapping coroutines (requires aiohttp); pipeline and sync both fall back to '
+                             'per-article metrics, the analytics API and scraping')
+    parser.add_argument('--metrics-workers', type=int, default=8,
+                        help='Concurrent requests when fetching per-article metrics, and listing pages whose bulk '
+                             'metrics are fetched at once by the pipeline engine (default: 8)')
+    parser.add_argument('--metrics-rps', type=float,
+                        help='Throughput ceiling for per-article metrics, in requests per second (optional)')
+    parser.add_argument('--user-cache', help='SQLite file used to cache authors across runs (optional)')
+    parser.add_argument('--user-cache-ttl', type=float, default=DEFAULT_TTL_HOURS,
+                        help=f'Hours before a cached author is fetched again (default: {DEFAULT_TTL_HOURS})')
+    parser.add_argument('--user-cache-size', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f'Maximum number of cached authors (default: {DEFAULT_MAX_ENTRIES})')
+    parser.add_argument('--http-cache', help='Directory for an on-disk HTTP cache with ETag revalidation (optional)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only export articles changed since the last run and merge them into its output')
+    parser.add_argument('--incremental-state', default='zendesk_export_comprehensive_incremental.json',
+                        help='Checkpoint file used by --incremental (default: zendesk_export_comprehensive_incremental.json)')
+    parser.add_argument('--checkpoint',
+                        help='Record progress after every page in this file and resume from it after an interruption (pipeline engine)')
+    parser.add_argument('--record', help='Save every raw API response to this directory for offline replay (optional)')
+    parser.add_argument('--replay',
+                        help='Feed the export from a directory written by --record instead of the API; no network access')
+    parser.add_argument('--sink', action='append',
+                        help='Also write the rows to sqlite:PATH, upserted by article_id (repeatable)')
+    parser.add_argument('--report', action='store_true',
+                        help='Write aggregate reports (by author/section/category, top-N) as JSON and CSV next to the export; requires pandas')
     
     args = parser.parse_args()
     
@@ -474,15 +629,51 @@ Examples:
         email = args.email
         api_token = args.api_token
     
+    if args.record and args.replay:
+        print("❌ --record and --replay cannot be used together")
+        sys.exit(1)
+    
+    # A replay sends nothing over the network, so credentials are optional
+    if args.replay:
+        subdomain = subdomain or recorded_subdomain(args.replay) or 'replay'
+        email = email or 'replay'
+        api_token = api_token or 'replay'
+    
     if not all([subdomain, email, api_token]):
         print("❌ Missing required parameters")
         print("   Please provide --subdomain, --email, and --api-token")
         print("   Or use --config-file with a .env file")
         sys.exit(1)
     
+    user_cache = None
     try:
-        exporter = ZendeskComprehensiveExporter(subdomain, email, api_token)
-        output_file = exporter.run_export(args.output)
+        if args.user_cache:
+            user_cache = UserCache(args.user_cache, args.user_cache_ttl, args.user_cache_size)
+        
+        http_cache = HttpCache(args.http_cache) if args.http_cache else None
+        checkpoint = ExportCheckpoint(args.checkpoint) if args.checkpoint else None
+        if args.report:
+            # pandas is only loaded when a report is asked for
+            from zendesk_reports import require_reports, write_report
+            require_reports()
+        recording = None
+        if args.record or args.replay:
+            recording = ApiRecording(args.replay or args.record, 'replay' if args.replay else 'record', subdomain)
+        
+        exporter = ZendeskComprehensiveExporter(subdomain, email, api_token, workers=args.workers,
+                                                user_cache=user_cache, http_cache=http_cache,
+                                                metrics_workers=args.metrics_workers, metrics_rps=args.metrics_rps,
+                                                engine=args.engine, output_format=args.format,
+                                                checkpoint=checkpoint, recording=recording, sinks=args.sink)
+        if args.incremental:
+            output_file = exporter.run_incremental_export(args.incremental_state, args.output)
+        else:
+            output_file = exporter.run_export(args.output)
+        if recording:
+            recording.close()
+        
+        if output_file and args.report:
+            print(f"📈 Report: {', '.join(write_report(output_file))}")
         
         if output_file:
             print(f"\n🎉 Export completed successfully!")
@@ -494,6 +685,9 @@ Examples:
     except Exception as e:
         print(f"\n❌ Export failed: {e}")
         sys.exit(1)
+    finally:
+        if user_cache:
+            user_cache.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,362 @@
+"""
+HTTP session helpers shared by the Zendesk exporters.
+
+Every exporter talks to Zendesk through a ZendeskSession, a requests.Session
+that paces its calls with an AdaptiveRateLimiter and can revalidate GET
+requests against an on-disk HttpCache. The limiter is a token bucket
+whose refill rate follows the rate-limit headers Zendesk returns, so throughput
+tracks the account's real quota instead of a fixed sleep between requests.
+
+Failed requests are classified by a RetryPolicy. Rate limiting (429), transient
+server errors (5xx), timeouts and dropped connections are retried with jittered
+exponential backoff. 401 fails the run at once, and 403 is returned to the caller
+without retrying, since neither improves by asking again.
+
+Response bodies are decoded with orjson when it is installed, straight from
+the raw bytes; otherwise the stdlib decoder behind requests is used as before.
+
+An attached ApiRecording either saves every GET response to disk or, when
+replaying, answers GET requests from disk without any network access.
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+import requests
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+from zendesk_http_cache import HttpCache
+from zendesk_instrumentation import Instrumentation
+from zendesk_recording import ApiRecording
+
+# JSON decoder used for API responses, chosen once at import
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def decode_json(content: bytes) -> Any:
+    """
+    Decode a JSON response body with the selected backend.
+
+    Bodies orjson rejects (such as non-UTF-8 text) are handed to the stdlib
+    decoder instead, which accepts the same input it always did.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+class ZendeskResponse(requests.Response):
+    """requests.Response whose json() decodes the raw body with the selected backend."""
+
+    def json(self, **kwargs) -> Any:
+        if kwargs or orjson is None:
+            return super().json(**kwargs)
+        try:
+            return orjson.loads(self.content)
+        except orjson.JSONDecodeError:
+            # Let requests handle other encodings and raise its usual errors
+            return super().json()
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    """Parse a numeric header value, returning None when missing or malformed."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket driven by Zendesk rate-limit headers.
+
+    After each response the refill rate is recomputed from ``X-Rate-Limit``
+    (requests per minute), ``X-Rate-Limit-Remaining`` and ``ratelimit-reset``
+    (seconds until the window resets), spreading the remaining quota over the
+    rest of the window. A 429 or a ``Retry-After`` header pauses the bucket
+    until the server says requests may resume.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10, min_rate: float = 0.2, max_rate: float = 100.0):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Initial refill rate in requests per second
+            burst: Maximum number of requests that may be issued back to back
+            min_rate: Lower bound for the adjusted rate
+            max_rate: Upper bound for the adjusted rate
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = float(burst)
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take one token from the bucket.
+
+        Returns:
+            Number of seconds the caller must wait before issuing its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+
+    def acquire(self) -> None:
+        """Block until the caller may issue its next request."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update_from_response(self, response: requests.Response) -> None:
+        """
+        Adjust the refill rate from a response's rate-limit headers.
+
+        Args:
+            response: Response returned by Zendesk
+        """
+        self.update_from_headers(response.status_code, response.headers)
+
+    def update_from_headers(self, status_code: int, headers) -> None:
+        """
+        Adjust the refill rate from a status code and rate-limit headers.
+
+        Args:
+            status_code: HTTP status of the response
+            headers: Case-insensitive response headers
+        """
+        limit = _header_float(headers, 'X-Rate-Limit')
+        remaining = _header_float(headers, 'X-Rate-Limit-Remaining')
+        reset = _header_float(headers, 'ratelimit-reset')
+        retry_after = _header_float(headers, 'Retry-After')
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if status_code == 429 or retry_after is not None:
+                pause = retry_after if retry_after is not None else (reset or 60.0)
+                self.paused_until = max(self.paused_until, now + pause)
+                self.tokens = min(self.tokens, 0.0)
+                return
+
+            if remaining is not None:
+                window = reset if reset and reset > 0 else 60.0
+                if remaining <= 0:
+                    self.paused_until = max(self.paused_until, now + window)
+                    return
+                rate = remaining / window
+                if limit:
+                    rate = min(rate, limit / 60.0)
+            elif limit:
+                rate = limit / 60.0
+            else:
+                return
+
+            self.rate = max(self.min_rate, min(self.max_rate, rate))
+
+
+# Statuses worth asking again for: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Connect and read timeouts applied when a request does not set its own
+DEFAULT_TIMEOUT: Tuple[float, float] = (10.0, 60.0)
+
+
+class ZendeskAuthError(requests.exceptions.HTTPError):
+    """Raised on 401: the credentials are rejected, so no later request can succeed either."""
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """Whether a response status is worth retrying."""
+    return status_code in RETRY_STATUSES
+
+
+def describe_error(error: BaseException) -> str:
+    """Short description of a request error, without the (possibly very long) request URL."""
+    response = getattr(error, 'response', None)
+    if response is not None:
+        return f"HTTP {response.status_code} {response.reason or ''}".strip()
+    return str(error) or error.__class__.__name__
+
+
+class RetryPolicy:
+    def __init__(self, retries: int = 4, backoff: float = 0.5, max_backoff: float = 30.0):
+        """
+        Initialize the retry policy.
+
+        Args:
+            retries: Additional attempts after a retryable failure
+            backoff: Base delay in seconds; doubles with every attempt
+            max_backoff: Upper bound for a single delay
+        """
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt: int) -> float:
+        """
+        Backoff before retry number ``attempt + 1``.
+
+        Half of the exponential delay is fixed and half is random, so workers
+        that failed together do not retry in lockstep.
+        """
+        ceiling = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class ZendeskSession(requests.Session):
+    """
+    requests.Session that paces every request through an AdaptiveRateLimiter.
+
+    When an HttpCache is attached, GET requests are revalidated against the
+    cache with If-None-Match / If-Modified-Since before anything is downloaded.
+    Retryable failures are retried according to the session's RetryPolicy.
+    Every attempt that reaches the network is reported to the Instrumentation.
+    An ApiRecording in record mode saves each final GET response; in replay
+    mode it answers GET requests instead of the network.
+    """
+
+    def __init__(self, limiter: Optional[AdaptiveRateLimiter] = None, http_cache: Optional[HttpCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None, instrumentation: Optional[Instrumentation] = None,
+                 recording: Optional[ApiRecording] = None):
+        super().__init__()
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.http_cache = http_cache
+        self.recording = recording
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.instrumentation = instrumentation or Instrumentation()
+        self.timeout = DEFAULT_TIMEOUT
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        response = self._recorded_request(method, url, *args, **kwargs)
+        if orjson is not None:
+            response.__class__ = ZendeskResponse
+        return response
+
+    def _recorded_request(self, method, url, *args, **kwargs) -> requests.Response:
+        recording = self.recording
+        if recording is None or method.upper() != 'GET' or args:
+            return self._cached_request(method, url, *args, **kwargs)
+
+        full_url = self.prepare_request(requests.Request(method, url, params=kwargs.get('params'))).url
+        if recording.replaying:
+            started = time.perf_counter()
+            response = recording.replay_response(method, full_url)
+            self.instrumentation.record_request(full_url, response.status_code, len(response.content),
+                                                time.perf_counter() - started)
+            return response
+
+        response = self._cached_request(method, url, *args, **kwargs)
+        recording.record_response(method, full_url, response)
+        return response
+
+    def _cached_request(self, method, url, *args, **kwargs) -> requests.Response:
+        if self.http_cache is None or method.upper() != 'GET' or args:
+            return self._paced_request(method, url, *args, **kwargs)
+
+        cache = self.http_cache
+        full_url = self.prepare_request(requests.Request(method, url, params=kwargs.get('params'))).url
+        key = cache.key(full_url, self.auth)
+        entry = cache.lookup(key)
+
+        if entry and cache.is_fresh(entry):
+            return cache.record_hit(key, entry, full_url)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            headers.update(cache.conditional_headers(entry))
+
+        response = self._paced_request(method, url, headers=headers, **kwargs)
+        if entry and response.status_code == 304:
+            return cache.record_revalidation(key, entry, response, full_url)
+
+        cache.store(key, response)
+        return response
+
+    def _paced_request(self, method, url, *args, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        policy = self.retry_policy
+        attempt = 0
+
+        while True:
+            self.limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.instrumentation.record_request(url, e.__class__.__name__, 0, time.perf_counter() - started,
+                                                    retry=attempt > 0)
+                if attempt >= policy.retries:
+                    raise
+            else:
+                self.instrumentation.record_request(url, response.status_code, len(response.content),
+                                                    time.perf_counter() - started, retry=attempt > 0)
+                # A 429 also pauses the limiter until Retry-After has passed
+                self.limiter.update_from_response(response)
+                if response.status_code == 401:
+                    raise ZendeskAuthError(f"401 Unauthorized for {response.url}; check the email and API token",
+                                           response=response)
+                if not is_retryable_status(response.status_code) or attempt >= policy.retries:
+                    return response
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+
+
+def create_session(email: str, api_token: str, limiter: Optional[AdaptiveRateLimiter] = None,
+                   pool_size: int = 10, http_cache: Optional[HttpCache] = None,
+                   retry_policy: Optional[RetryPolicy] = None,
+                   instrumentation: Optional[Instrumentation] = None,
+                   recording: Optional[ApiRecording] = None) -> ZendeskSession:
+    """
+    Create an authenticated, rate-limited session for the Zendesk API.
+
+    Args:
+        email: Your Zendesk email address
+        api_token: Your Zendesk API token
+        limiter: Rate limiter to share with other sessions (optional)
+        pool_size: Number of pooled connections, at least one per worker thread
+        http_cache: On-disk cache for conditional GET requests (optional)
+        retry_policy: Retry classification and backoff (optional)
+        instrumentation: Collector for request measurements (optional)
+        recording: Recording that saves or replays responses (optional)
+
+    Returns:
+        Configured ZendeskSession
+    """
+    session = ZendeskSession(limiter, http_cache, retry_policy, instrumentation, recording)
+    session.auth = (f"{email}/token", api_token)
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    })
+    if pool_size > 10:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    return session
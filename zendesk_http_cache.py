@@ -0,0 +1,168 @@
+"""
+On-disk HTTP cache for Zendesk API sessions.
+
+GET responses that carry an ETag or Last-Modified header are stored on disk with
+their validators. The next request for the same URL is sent as a conditional
+request (If-None-Match / If-Modified-Since); a 304 answer is then served from the
+stored body, so an unchanged listing page costs a header round trip instead of a
+full JSON download. Responses that are still fresh according to their
+Cache-Control max-age are served without any request at all.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Headers kept with a cached body; everything else is per-response noise
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+
+class HttpCache:
+    def __init__(self, directory: str):
+        """
+        Open (or create) an HTTP cache directory.
+
+        Args:
+            directory: Directory holding cached bodies and their metadata
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, url: str, auth=None) -> str:
+        """
+        Build the cache key for a URL.
+
+        The authenticated user is part of the key so caches shared between
+        accounts never serve one account's data to another.
+        """
+        identity = auth[0] if isinstance(auth, tuple) else ''
+        return hashlib.sha256(f"{identity} GET {url}".encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Return the stored metadata for a key, or None when nothing usable is cached."""
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Whether an entry may be served without revalidation."""
+        return time.time() < entry.get('stored_at', 0) + entry.get('max_age', 0)
+
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """Validator headers for a conditional request."""
+        headers = {}
+        stored = entry.get('headers', {})
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+
+    def build_response(self, key: str, entry: Dict, url: str) -> requests.Response:
+        """Rebuild a 200 response from a cached entry."""
+        _, body_path = self._paths(key)
+        with open(body_path, 'rb') as f:
+            content = f.read()
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response._content = content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+    def record_hit(self, key: str, entry: Dict, url: str) -> requests.Response:
+        """Serve a fresh entry without touching the network."""
+        with self._lock:
+            self.hits += 1
+        return self.build_response(key, entry, url)
+
+    def record_revalidation(self, key: str, entry: Dict, not_modified: requests.Response,
+                            url: str) -> requests.Response:
+        """Serve the stored body for a 304 and refresh the entry's validators."""
+        headers = dict(entry.get('headers', {}))
+        for name in STORED_HEADERS:
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+        entry = dict(entry, headers=headers, stored_at=time.time(), max_age=_max_age(headers))
+
+        meta_path, _ = self._paths(key)
+        _write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+
+        with self._lock:
+            self.revalidated += 1
+
+        response = self.build_response(key, entry, url)
+        # Keep the live response's rate-limit headers for the limiter
+        response.headers.update({k: v for k, v in not_modified.headers.items() if k not in response.headers})
+        return response
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Store a successful response if it carries validators or a max-age."""
+        with self._lock:
+            self.misses += 1
+
+        if response.status_code != 200:
+            return
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        max_age = _max_age(headers)
+        if not (headers.get('ETag') or headers.get('Last-Modified') or max_age):
+            return
+
+        meta_path, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        _write_atomic(body_path, response.content)
+        _write_atomic(meta_path, json.dumps({
+            'url': response.url,
+            'headers': headers,
+            'stored_at': time.time(),
+            'max_age': max_age
+        }).encode('utf-8'))
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, revalidation and miss counts for this run."""
+        with self._lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+    def summary(self) -> str:
+        """One-line summary for the export report."""
+        stats = self.stats()
+        return f"{stats['hits']} hits, {stats['revalidated']} revalidated (304), {stats['misses']} misses"
+
+
+def _max_age(headers: Dict[str, str]) -> int:
+    cache_control = headers.get('Cache-Control', '')
+    if 'no-cache' in cache_control or 'no-store' in cache_control or 'must-revalidate' in cache_control:
+        return 0
+    match = re.search(r'max-age=(\d+)', cache_control)
+    return int(match.group(1)) if match else 0
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,214 @@
+"""
+Incremental article export.
+
+Instead of re-listing the whole knowledge base, an incremental run asks the Help
+Center incremental articles endpoint for everything changed since the previous
+run and merges those articles into the previous export by article_id. The start
+time for the next run and the path of the latest export are kept in a small
+JSON checkpoint file.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import requests
+
+from zendesk_api import ArticleRecord, collect_sideloaded_users
+from zendesk_sinks import read_rows
+
+
+def load_incremental_state(state_file: str) -> Optional[Dict]:
+    """
+    Load the incremental checkpoint.
+
+    Args:
+        state_file: Path to the checkpoint file
+
+    Returns:
+        Checkpoint dictionary, or None when no usable checkpoint exists
+    """
+    try:
+        with open(state_file, 'r') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable checkpoint {state_file}: {e}")
+        return None
+
+    if 'start_time' not in state or not os.path.exists(state.get('output_file', '')):
+        return None
+    return state
+
+
+def save_incremental_state(state_file: str, start_time: int, output_file: str) -> None:
+    """
+    Write the incremental checkpoint atomically.
+
+    Args:
+        state_file: Path to the checkpoint file
+        start_time: Unix time the next run should start from
+        output_file: Path of the export the next run merges into
+    """
+    state = {
+        'start_time': int(start_time),
+        'output_file': output_file,
+        'saved_at': int(time.time())
+    }
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, state_file)
+
+
+def iter_incremental_pages(session: requests.Session, base_url: str, start_time: int) -> Iterator[Dict]:
+    """
+    Iterate over /help_center/incremental/articles.json from ``start_time``.
+
+    Args:
+        session: Authenticated requests session
+        base_url: Zendesk API base URL
+        start_time: Unix time to start from
+
+    Yields:
+        Decoded JSON page dictionaries
+    """
+    url = f"{base_url}/help_center/incremental/articles.json"
+    params = {'start_time': int(start_time), 'include': 'users'}
+
+    while url:
+        response = session.get(url, params=params)
+        response.raise_for_status()
+
+        data = response.json()
+        yield data
+
+        # next_page already carries start_time; stop once the stream stops advancing
+        next_page = data.get('next_page')
+        if not next_page or data.get('end_of_stream') or not data.get('articles') or next_page == response.url:
+            break
+        url, params = next_page, None
+
+
+def is_removed_article(article: Dict) -> bool:
+    """Entries flagged as archived or deleted are removed from the merged export."""
+    return bool(article.get('archived') or article.get('deleted'))
+
+
+def get_changed_articles(exporter, start_time: int) -> Tuple[List[Dict], Set[int], int]:
+    """
+    Collect the articles changed since ``start_time``.
+
+    Args:
+        exporter: Exporter whose session, base URL, article fields and sideloaded users are used
+        start_time: Unix time to start from
+
+    Returns:
+        Tuple of (changed articles, removed article IDs, next start time)
+    """
+    changed: Dict[int, Dict] = {}
+    removed_ids: Set[int] = set()
+    end_time = start_time
+
+    for data in iter_incremental_pages(exporter.session, exporter.base_url, start_time):
+        collect_sideloaded_users(data, exporter.sideloaded_users)
+        for article in data.get('articles', []):
+            article_id = article.get('id')
+            if article_id is None:
+                continue
+            if is_removed_article(article):
+                removed_ids.add(article_id)
+                changed.pop(article_id, None)
+            else:
+                changed[article_id] = ArticleRecord(article, exporter.article_fields)
+                removed_ids.discard(article_id)
+        end_time = max(end_time, int(data.get('end_time') or end_time))
+
+    return list(changed.values()), removed_ids, end_time
+
+
+def merge_export_rows(previous_rows: Iterable[Dict], changed_rows: Iterable[Dict],
+                      removed_ids: Iterable[int]) -> List[Dict]:
+    """
+    Merge changed and removed articles into a previous export by article_id.
+
+    Rows of the previous export keep their order; changed articles replace them
+    in place and new articles are appended at the end.
+
+    Args:
+        previous_rows: Rows of the previous export
+        changed_rows: Processed rows for changed or new articles
+        removed_ids: IDs of articles to drop
+
+    Returns:
+        Merged list of rows
+    """
+    removed = {str(article_id) for article_id in removed_ids}
+    merged: Dict[str, Dict] = {}
+
+    for row in previous_rows:
+        key = str(row.get('article_id'))
+        if key not in removed:
+            merged[key] = row
+    for row in changed_rows:
+        key = str(row.get('article_id'))
+        if key not in removed:
+            merged[key] = row
+
+    return list(merged.values())
+
+
+def run_incremental_export(exporter, state_file: str, output_file: Optional[str] = None) -> str:
+    """
+    Run an incremental export for any of the exporters.
+
+    Without a checkpoint a full export is run and becomes the base for the next
+    run. Otherwise only the articles changed since the checkpoint are enriched
+    and merged into the previous export. View counts of unchanged articles are
+    carried over from the previous export.
+
+    Args:
+        exporter: Exporter instance providing run_export, enrich_articles and export_rows
+        state_file: Path to the checkpoint file
+        output_file: Output filename (optional)
+
+    Returns:
+        Filename of the export
+    """
+    state = load_incremental_state(state_file)
+    run_started_at = int(time.time())
+
+    if state is None:
+        print(f"ℹ️  No incremental checkpoint at {state_file}, running a full export")
+        filename = exporter.run_export(output_file)
+        if filename:
+            save_incremental_state(state_file, run_started_at, filename)
+        return filename
+
+    print("🚀 Starting Incremental Zendesk Knowledge Base Export")
+    print(f"📋 Target: {exporter.subdomain}.zendesk.com")
+    print(f"🕒 Changes since: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(state['start_time']))}")
+
+    if not exporter.test_connection():
+        raise Exception("Failed to connect to Zendesk API")
+
+    changed_articles, removed_ids, end_time = get_changed_articles(exporter, state['start_time'])
+    print(f"✅ {len(changed_articles)} changed and {len(removed_ids)} removed articles")
+
+    changed_rows = exporter.enrich_articles(changed_articles) if changed_articles else []
+    previous_rows = read_rows(state['output_file'])
+    merged_rows = merge_export_rows(previous_rows, changed_rows, removed_ids)
+
+    filename = exporter.export_rows(merged_rows, output_file)
+    save_incremental_state(state_file, max(end_time, state['start_time']), filename)
+
+    print("\n📊 Incremental Export Summary:")
+    print(f"   Previous Articles: {len(previous_rows)}")
+    print(f"   Changed Articles: {len(changed_rows)}")
+    print(f"   Removed Articles: {len(removed_ids)}")
+    print(f"   Total Articles: {len(merged_rows)}")
+    print(f"   Output File: {filename}")
+
+    return filename
@@ -0,0 +1,246 @@
+"""
+Request and stage instrumentation for export runs.
+
+Every exporter owns an Instrumentation that its ZendeskSession (and the async
+engine) report each HTTP attempt to. Requests are grouped by endpoint family,
+the API path with numeric IDs folded into ``{id}``. Each family records its
+request count, status codes, retries, response bytes and a latency histogram.
+Export steps are timed as named stages. In the pipeline engine, stage times
+are busy times that overlap each other, so they can add up to more than the
+run's wall time.
+
+After an export the numbers are written next to the output file as JSON
+(``<output>.metrics.json``) and in the Prometheus text format
+(``<output>.metrics.prom``).
+"""
+
+import bisect
+import contextlib
+import json
+import re
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Tuple
+from urllib.parse import urlsplit
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = 'zendesk_export'
+
+_NUMERIC_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Group a request URL by endpoint.
+
+    ``https://x.zendesk.com/api/v2/help_center/articles/42/metrics.json``
+    becomes ``help_center/articles/{id}/metrics``. Requests outside the API,
+    such as scraped Help Center pages, are grouped as ``web``.
+    """
+    path = urlsplit(url).path
+    if '/api/v2/' not in path:
+        return 'web'
+    path = path.split('/api/v2/', 1)[1]
+    if path.endswith('.json'):
+        path = path[:-5]
+    return _NUMERIC_SEGMENT.sub('/{id}', '/' + path)[1:]
+
+
+def _pick(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class EndpointStats:
+    """Counters and latency samples for one endpoint family."""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.bytes = 0
+        self.statuses: Dict[str, int] = {}
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latencies = array('d')
+
+    def add(self, status: str, size: int, seconds: float, retry: bool) -> None:
+        self.requests += 1
+        self.retries += retry
+        self.bytes += size
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not status.isdigit():
+            self.errors += 1
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum += seconds
+        self.latencies.append(seconds)
+
+    def to_dict(self) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.bucket_counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+        ordered = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'statuses': dict(sorted(self.statuses.items())),
+            'latency_seconds': {
+                'sum': round(self.latency_sum, 6),
+                'mean': round(self.latency_sum / self.requests, 6) if self.requests else 0.0,
+                'p50': round(_pick(ordered, 0.5), 6),
+                'p90': round(_pick(ordered, 0.9), 6),
+                'p99': round(_pick(ordered, 0.99), 6),
+                'max': round(ordered[-1], 6) if ordered else 0.0,
+                'buckets': buckets
+            }
+        }
+
+
+class Instrumentation:
+    """Thread-safe collector for request and stage measurements of one export."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, url: str, status, size: int, seconds: float, retry: bool = False) -> None:
+        """
+        Record one HTTP attempt.
+
+        Args:
+            url: Requested URL
+            status: HTTP status code, or an exception class name when no response arrived
+            size: Response body size in bytes
+            seconds: Time from sending the request to the end of the body
+            retry: Whether the attempt repeated a failed one
+        """
+        family = endpoint_family(url)
+        with self._lock:
+            stats = self.endpoints.get(family)
+            if stats is None:
+                stats = self.endpoints[family] = EndpointStats()
+            stats.add(str(status), size, seconds, retry)
+
+    def add_stage_time(self, name: str, seconds: float) -> None:
+        """Add time spent in a named stage."""
+        with self._lock:
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += seconds
+            stage['calls'] += 1
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of a named stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - started)
+
+    def timed(self, name: str, items: Iterable) -> Iterator:
+        """Yield from an iterable, counting the time spent producing each item as a stage."""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add_stage_time(name, time.perf_counter() - started)
+            yield item
+
+    def to_dict(self) -> Dict:
+        """Snapshot of all measurements as plain data."""
+        with self._lock:
+            endpoints = {family: stats.to_dict() for family, stats in sorted(self.endpoints.items())}
+            stages = {name: {'seconds': round(stage['seconds'], 6), 'calls': int(stage['calls'])}
+                      for name, stage in self.stages.items()}
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'duration_seconds': round(time.time() - self.started_at, 3),
+            'totals': {
+                'requests': sum(endpoint['requests'] for endpoint in endpoints.values()),
+                'retries': sum(endpoint['retries'] for endpoint in endpoints.values()),
+                'bytes': sum(endpoint['bytes'] for endpoint in endpoints.values()),
+                'rate_limited': sum(endpoint['statuses'].get('429', 0) for endpoint in endpoints.values())
+            },
+            'endpoints': endpoints,
+            'stages': stages
+        }
+
+    def to_prometheus(self) -> str:
+        """Render the measurements in the Prometheus text exposition format."""
+        data = self.to_dict()
+        lines = []
+
+        def header(name: str, kind: str, text: str) -> str:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            return f"{METRIC_PREFIX}_{name}"
+
+        metric = header('requests_total', 'counter', 'HTTP attempts by endpoint family and status.')
+        for family, endpoint in data['endpoints'].items():
+            for status, count in endpoint['statuses'].items():
+                lines.append(f'{metric}{{endpoint="{family}",status="{status}"}} {count}')
+
+        metric = header('retries_total', 'counter', 'HTTP attempts that repeated a failed attempt.')
+        for family, endpoint in data['endpoints'].items():
+            lines.append(f'{metric}{{endpoint="{family}"}} {endpoint["retries"]}')
+
+        metric = header('response_bytes_total', 'counter', 'Response body bytes by endpoint family.')
+        for family, endpoint in data['endpoints'].items():
+            lines.append(f'{metric}{{endpoint="{family}"}} {endpoint["bytes"]}')
+
+        metric = header('request_duration_seconds', 'histogram', 'HTTP attempt latency by endpoint family.')
+        for family, endpoint in data['endpoints'].items():
+            latency = endpoint['latency_seconds']
+            for bound, count in latency['buckets'].items():
+                lines.append(f'{metric}_bucket{{endpoint="{family}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{endpoint="{family}"}} {latency["sum"]}')
+            lines.append(f'{metric}_count{{endpoint="{family}"}} {endpoint["requests"]}')
+
+        metric = header('stage_duration_seconds', 'gauge', 'Time spent in each export stage.')
+        for name, stage in data['stages'].items():
+            lines.append(f'{metric}{{stage="{name}"}} {stage["seconds"]}')
+
+        metric = header('duration_seconds', 'gauge', 'Wall time of the export run.')
+        lines.append(f"{metric} {data['duration_seconds']}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, output_file: str) -> Tuple[str, str]:
+        """
+        Write the measurements next to an export.
+
+        Args:
+            output_file: Path of the export the measurements belong to
+
+        Returns:
+            Tuple of (JSON path, Prometheus text path)
+        """
+        # Keep the extension so CSV, Parquet and Arrow exports of one name do not share a file
+        json_file = f"{output_file}.metrics.json"
+        prom_file = f"{output_file}.metrics.prom"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(prom_file, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        return json_file, prom_file
+
+    def summary(self) -> str:
+        """One-line summary for the export output."""
+        totals = self.to_dict()['totals']
+        return (f"{totals['requests']} requests, {totals['retries']} retries, "
+                f"{totals['rate_limited']} rate limited, {totals['bytes'] / 1e6:.1f} MB")
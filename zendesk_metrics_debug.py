@@ -3,20 +3,18 @@
 Debug script to investigate Zendesk metrics API access and find the correct endpoints.
 """
 
-import requests
 import json
 import sys
+from typing import Optional
 from zendesk_export import load_config_from_file
+from zendesk_http import ZendeskAuthError, create_session
+from zendesk_http_cache import HttpCache
 
-def test_metrics_endpoints(subdomain: str, email: str, api_token: str):
+def test_metrics_endpoints(subdomain: str, email: str, api_token: str, http_cache_dir: Optional[str] = None):
     """Test various metrics endpoints to find the correct one."""
     
-    session = requests.Session()
-    session.auth = (f"{email}/token", api_token)
-    session.headers.update({
-        'Content-Type': 'application/json',
-        'Accept': 'application/json'
-    })
+    http_cache = HttpCache(http_cache_dir) if http_cache_dir else None
+    session = create_session(email, api_token, http_cache=http_cache)
     
     base_url = f"https://{subdomain}.zendesk.com/api/v2"
     
@@ -34,6 +32,11 @@ def test_metrics_endpoints(subdomain: str, email: str, api_token: str):
             print(f"   Response: {json.dumps(data, indent=2)[:200]}...")
         else:
             print(f"   Error: {response.text[:200]}...")
+    except ZendeskAuthError:
+        # Every other endpoint would be rejected the same way
+        print("   Status: 401")
+        print("   This usually means invalid credentials (email or API token)")
+        return
     except Exception as e:
         print(f"   Exception: {e}")
     
@@ -121,6 +124,9 @@ def test_metrics_endpoints(subdomain: str, email: str, api_token: str):
             print(f"   Help Center: {hc_data.get('help_center', {}).get('name', 'Unknown')}")
     except Exception as e:
         print(f"   Exception: {e}")
+    
+    if http_cache:
+        print(f"\nHTTP Cache: {http_cache.summary()}")
 
 def main():
     if len(sys.argv) > 1 and sys.argv[1] == '--config-file':
@@ -129,15 +135,16 @@ def main():
         subdomain = config.get('ZENDESK_SUBDOMAIN')
         email = config.get('ZENDESK_EMAIL')
         api_token = config.get('ZENDESK_API_TOKEN')
+        http_cache_dir = sys.argv[4] if len(sys.argv) > 4 and sys.argv[3] == '--http-cache' else None
     else:
-        print("Usage: python3 zendesk_metrics_debug.py --config-file zendesk_config.env")
+        print("Usage: python3 zendesk_metrics_debug.py --config-file zendesk_config.env [--http-cache DIR]")
         sys.exit(1)
     
     if not all([subdomain, email, api_token]):
         print("❌ Missing configuration")
         sys.exit(1)
     
-    test_metrics_endpoints(subdomain, email, api_token)
+    test_metrics_endpoints(subdomain, email, api_token, http_cache_dir)
 
 if __name__ == "__main__":
     main()
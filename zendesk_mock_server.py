@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Zendesk Help Center API.
+
+Serves deterministic synthetic articles, users, sections, categories and
+article metrics for the endpoints the exporters use, so exports can be run and
+timed without touching a live tenant. Articles are generated from their index
+on every request, so even millions of articles take no memory on the server.
+Edited, archived and added articles are remembered and reported by the
+incremental articles endpoint.
+
+The server mimics Zendesk's behaviour where it matters for performance:
+- cursor (``page[size]``) and offset (``per_page``/``page``) pagination, with a
+  configurable maximum page size
+- ``include=users`` sideloading
+- a per-minute request quota advertised through ``X-Rate-Limit``,
+  ``X-Rate-Limit-Remaining`` and ``ratelimit-reset`` and enforced with 429s
+- optional random 429 injection with ``Retry-After``
+- an ``ETag`` on every successful response, answered with ``304 Not Modified``
+  when a client sends it back in ``If-None-Match``, and an optional
+  ``Cache-Control`` max-age
+- a fixed per-request latency
+
+Usage:
+    python zendesk_mock_server.py --articles 50000 --latency 0.05 --port 8080
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+# Base IDs of the synthetic records
+ARTICLE_ID_BASE = 1000000
+USER_ID_BASE = 10000
+SECTION_ID_BASE = 360000
+CATEGORY_ID_BASE = 200000
+
+_ARTICLE_PATH = re.compile(r'/api/v2/help_center/articles/(\d+)/metrics\.json$')
+_USER_PATH = re.compile(r'/api/v2/users/(\d+)\.json$')
+
+
+class SyntheticHelpCenter:
+    def __init__(self, articles: int = 1000, users: int = 50, sections: int = 20, categories: int = 4,
+                 body_size: int = 4000):
+        """
+        Describe a synthetic Help Center.
+
+        Args:
+            articles: Number of articles
+            users: Number of distinct authors
+            sections: Number of sections
+            categories: Number of categories
+            body_size: Length of each article's HTML body, in characters
+        """
+        self.article_count = max(0, articles)
+        self.user_count = max(1, users)
+        self.section_count = max(1, sections)
+        self.category_count = max(1, categories)
+        self.body = '<p>' + 'Lorem ipsum dolor sit amet. ' * (max(0, body_size) // 28) + '</p>'
+        # Index -> overridden fields, and index -> Unix time of the last change
+        self.edits: Dict[int, Dict] = {}
+        self.changes: Dict[int, float] = {}
+
+    def article(self, index: int) -> Dict:
+        """Article number ``index`` (0-based)."""
+        article_id = ARTICLE_ID_BASE + index
+        day = index % 365
+        article = {
+            'id': article_id,
+            'url': f"/api/v2/help_center/articles/{article_id}.json",
+            'html_url': f"/hc/en-us/articles/{article_id}",
+            'title': f"Synthetic article {index}",
+            'body': self.body,
+            'locale': 'en-us',
+            'author_id': USER_ID_BASE + index % self.user_count,
+            'section_id': SECTION_ID_BASE + index % self.section_count,
+            'draft': index % 9 == 0,
+            'promoted': False,
+            'position': 0,
+            'vote_sum': index % 7,
+            'vote_count': index % 11,
+            'comments_disabled': False,
+            'label_names': ['synthetic'],
+            'created_at': f"2023-{1 + day // 31 % 12:02d}-{1 + day % 28:02d}T08:00:00Z",
+            'updated_at': f"2024-{1 + day // 31 % 12:02d}-{1 + day % 28:02d}T12:30:00Z",
+            'edited_at': f"2024-{1 + day // 31 % 12:02d}-{1 + day % 28:02d}T12:30:00Z"
+        }
+        article.update(self.edits.get(index, {}))
+        return article
+
+    def articles(self, start: int, count: int) -> List[Dict]:
+        return [self.article(index) for index in range(start, min(start + count, self.article_count))]
+
+    def edit(self, index: int, **fields) -> None:
+        """Change fields of article number ``index``, as an agent editing it would."""
+        now = time.time()
+        updated_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now))
+        self.edits[index] = dict(self.edits.get(index, {}), updated_at=updated_at, edited_at=updated_at, **fields)
+        self.changes[index] = now
+
+    def archive(self, index: int) -> None:
+        """Archive article number ``index``; only the incremental endpoint reports the archival."""
+        self.edit(index, archived=True)
+
+    def add_articles(self, count: int) -> None:
+        """Publish ``count`` new articles after the existing ones."""
+        now = time.time()
+        for index in range(self.article_count, self.article_count + count):
+            self.changes[index] = now
+        self.article_count += count
+
+    def changed_articles(self, start_time: float) -> List[Tuple[float, Dict]]:
+        """(change time, article) of every article changed at or after ``start_time``, oldest first."""
+        changes = sorted((changed_at, index) for index, changed_at in self.changes.items() if changed_at >= start_time)
+        return [(changed_at, self.article(index)) for changed_at, index in changes]
+
+    def user(self, user_id: int) -> Optional[Dict]:
+        index = user_id - USER_ID_BASE
+        if not 0 <= index < self.user_count:
+            return None
+        return {'id': user_id, 'name': f"Author {index}", 'email': f"author{index}@example.com", 'role': 'agent'}
+
+    def metric(self, article_id: int) -> Optional[Dict]:
+        index = article_id - ARTICLE_ID_BASE
+        if not 0 <= index < self.article_count:
+            return None
+        return {'article_id': article_id, 'views': (index * 37) % 5000, 'comments': index % 5, 'votes': index % 13}
+
+    def section(self, index: int) -> Dict:
+        return {'id': SECTION_ID_BASE + index, 'name': f"Section {index}",
+                'category_id': CATEGORY_ID_BASE + index % self.category_count}
+
+    def category(self, index: int) -> Dict:
+        return {'id': CATEGORY_ID_BASE + index, 'name': f"Category {index}"}
+
+
+class MockZendeskServer:
+    def __init__(self, help_center: SyntheticHelpCenter, latency: float = 0.0, page_size: int = 100,
+                 rate_limit: int = 6000, rate_429: float = 0.0, retry_after: float = 1.0,
+                 bulk_metrics: bool = True, max_age: int = 0, host: str = '127.0.0.1', port: int = 0):
+        """
+        Configure the mock server.
+
+        Args:
+            help_center: Synthetic data to serve
+            latency: Seconds added to every response
+            page_size: Largest page the listing endpoints return
+            rate_limit: Requests allowed per minute; 0 disables the quota
+            rate_429: Fraction of requests answered with an injected 429
+            retry_after: Retry-After value of injected 429s, in seconds
+            bulk_metrics: Serve /help_center/articles/metrics.json (404 otherwise)
+            max_age: Cache-Control max-age of successful responses, in seconds; 0 sends none
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+        """
+        self.help_center = help_center
+        self.latency = latency
+        self.page_size = max(1, page_size)
+        self.rate_limit = max(0, rate_limit)
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.bulk_metrics = bulk_metrics
+        self.max_age = max(0, max_age)
+        self.counters: Dict[str, int] = {}
+        self._window: Tuple[int, int] = (0, 0)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """API base URL to use in place of https://<subdomain>.zendesk.com/api/v2."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v2"
+
+    def start(self) -> 'MockZendeskServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'MockZendeskServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def reset_counters(self) -> Dict[str, int]:
+        """Return the request counters and start counting from zero."""
+        with self._lock:
+            counters, self.counters = self.counters, {}
+        return counters
+
+    def take_quota(self) -> Tuple[int, int]:
+        """
+        Count a request against the per-minute quota.
+
+        Returns:
+            Tuple of (remaining requests, seconds until the window resets); remaining is -1 when exhausted
+        """
+        now = time.time()
+        window = int(now // 60)
+        reset = 60 - int(now % 60)
+        if not self.rate_limit:
+            return 1, reset
+        with self._lock:
+            start, used = self._window
+            if start != window:
+                used = 0
+            used += 1
+            self._window = (window, used)
+        return self.rate_limit - used, reset
+
+    def route(self, path: str, query: Dict[str, str], host: str) -> Tuple[int, Dict]:
+        """
+        Answer one API request.
+
+        Returns:
+            Tuple of (status code, JSON body)
+        """
+        help_center = self.help_center
+
+        if path == '/api/v2/help_center/articles.json':
+            data = self._page(path, query, host, 'articles', help_center.article_count, help_center.articles)
+            return 200, self._sideload_users(data, query)
+
+        if path == '/api/v2/help_center/incremental/articles.json':
+            start_time = int(query.get('start_time') or 0)
+            changes = help_center.changed_articles(start_time)
+            page = changes[:self.page_size]
+            end_time = int(page[-1][0]) if page else start_time
+            more = len(changes) > len(page)
+            data = {
+                'articles': [article for _, article in page],
+                'count': len(page),
+                'end_time': end_time,
+                'end_of_stream': not more,
+                'next_page': f"{host}{path}?{urlencode(dict(query, start_time=end_time))}" if more else None
+            }
+            return 200, self._sideload_users(data, query)
+
+        if path == '/api/v2/help_center/sections.json':
+            return 200, self._page(path, query, host, 'sections', help_center.section_count,
+                                   lambda start, count: [help_center.section(index) for index in
+                                                         range(start, min(start + count, help_center.section_count))])
+
+        if path == '/api/v2/help_center/categories.json':
+            return 200, self._page(path, query, host, 'categories', help_center.category_count,
+                                   lambda start, count: [help_center.category(index) for index in
+                                                         range(start, min(start + count, help_center.category_count))])
+
+        if path == '/api/v2/help_center/articles/metrics.json':
+            if not self.bulk_metrics:
+                return 404, {'error': 'RecordNotFound'}
+            ids = [int(value) for value in query.get('article_ids', '').split(',') if value.isdigit()]
+            return 200, {'article_metrics': [metric for metric in map(help_center.metric, ids) if metric]}
+
+        if path == '/api/v2/users/show_many.json':
+            ids = [int(value) for value in query.get('ids', '').split(',') if value.isdigit()]
+            return 200, {'users': [user for user in map(help_center.user, ids) if user]}
+
+        match = _ARTICLE_PATH.match(path)
+        if match:
+            metric = help_center.metric(int(match.group(1)))
+            return (200, {'article_metric': metric}) if metric else (404, {'error': 'RecordNotFound'})
+
+        match = _USER_PATH.match(path)
+        if match:
+            user = help_center.user(int(match.group(1)))
+            return (200, {'user': user}) if user else (404, {'error': 'RecordNotFound'})
+
+        return 404, {'error': 'InvalidEndpoint'}
+
+    def _sideload_users(self, data: Dict, query: Dict[str, str]) -> Dict:
+        if 'users' in query.get('include', ''):
+            author_ids = {article['author_id'] for article in data['articles']}
+            data['users'] = [self.help_center.user(user_id) for user_id in sorted(author_ids)]
+        return data
+
+    def _page(self, path: str, query: Dict[str, str], host: str, key: str, total: int, fetch) -> Dict:
+        if 'page[size]' in query:
+            # Cursor pagination; the cursor is simply the next offset
+            size = min(self.page_size, max(1, int(query['page[size]'])))
+            start = int(query.get('page[after]') or 0)
+            more = start + size < total
+            next_query = dict(query, **{'page[after]': start + size})
+            return {
+                key: fetch(start, size),
+                'meta': {'has_more': more, 'after_cursor': str(start + size) if more else None},
+                'links': {'next': f"{host}{path}?{urlencode(next_query)}" if more else None}
+            }
+
+        per_page = min(self.page_size, max(1, int(query.get('per_page') or 30)))
+        page = max(1, int(query.get('page') or 1))
+        page_count = (total + per_page - 1) // per_page
+        next_query = dict(query, page=page + 1, per_page=per_page)
+        return {
+            key: fetch((page - 1) * per_page, per_page),
+            'page': page,
+            'per_page': per_page,
+            'page_count': page_count,
+            'count': total,
+            'next_page': f"{host}{path}?{urlencode(next_query)}" if page < page_count else None
+        }
+
+
+def _make_handler(server: MockZendeskServer):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, like the real API, so client connection pools are exercised
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def send_body(self, status: int, data: Dict, headers: Dict[str, str]) -> None:
+            self.send_bytes(status, json.dumps(data).encode('utf-8'), headers)
+
+        def send_bytes(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if server.latency:
+                time.sleep(server.latency)
+
+            parts = urlsplit(self.path)
+            query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+            server.count('requests')
+
+            remaining, reset = server.take_quota()
+            headers = {}
+            if server.rate_limit:
+                headers = {
+                    'X-Rate-Limit': str(server.rate_limit),
+                    'X-Rate-Limit-Remaining': str(max(0, remaining)),
+                    'ratelimit-reset': str(reset)
+                }
+
+            if remaining < 0:
+                server.count('quota_429')
+                self.send_body(429, {'error': 'TooManyRequests'}, dict(headers, **{'Retry-After': str(reset)}))
+                return
+            if server.rate_429 and random.random() < server.rate_429:
+                server.count('injected_429')
+                self.send_body(429, {'error': 'TooManyRequests'}, dict(headers, **{'Retry-After': f"{server.retry_after:g}"}))
+                return
+
+            status, data = server.route(parts.path, query, f"http://{self.headers.get('Host')}")
+            if status != 200:
+                server.count(f"status_{status}")
+                self.send_body(status, data, headers)
+                return
+
+            body = json.dumps(data).encode('utf-8')
+            headers['ETag'] = f'"{hashlib.sha1(body).hexdigest()}"'
+            if server.max_age:
+                headers['Cache-Control'] = f"private, max-age={server.max_age}"
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                server.count('status_304')
+                self.send_bytes(304, b'', headers)
+                return
+            server.count('status_200')
+            self.send_bytes(200, body, headers)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a synthetic Zendesk Help Center API for offline exports and benchmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python zendesk_mock_server.py --articles 50000 --port 8080
+  python zendesk_mock_server.py --articles 5000 --latency 0.1 --rate-429 0.02
+        """
+    )
+
+    parser.add_argument(
+        '--articles',
+        type=int,
+        default=1000,
+        help='Number of synthetic articles (default: 1000)'
+    )
+    parser.add_argument(
+        '--users',
+        type=int,
+        default=50,
+        help='Number of synthetic authors (default: 50)'
+    )
+    parser.add_argument(
+        '--body-size',
+        type=int,
+        default=4000,
+        help='Length of each article body in characters (default: 4000)'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Seconds added to every response (default: 0)'
+    )
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=100,
+        help='Largest page the listing endpoints return (default: 100)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=int,
+        default=6000,
+        help='Requests allowed per minute, 0 for no quota (default: 6000)'
+    )
+    parser.add_argument(
+        '--rate-429',
+        type=float,
+        default=0.0,
+        help='Fraction of requests answered with an injected 429 (default: 0)'
+    )
+    parser.add_argument(
+        '--no-bulk-metrics',
+        action='store_true',
+        help='Answer the bulk metrics endpoint with 404 to force per-article metrics'
+    )
+    parser.add_argument(
+        '--max-age',
+        type=int,
+        default=0,
+        help='Cache-Control max-age of successful responses in seconds, 0 for none (default: 0)'
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Interface to listen on (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8080,
+        help='Port to listen on (default: 8080)'
+    )
+
+    args = parser.parse_args()
+
+    help_center = SyntheticHelpCenter(args.articles, args.users, body_size=args.body_size)
+    server = MockZendeskServer(help_center, latency=args.latency, page_size=args.page_size,
+                               rate_limit=args.rate_limit, rate_429=args.rate_429,
+                               bulk_metrics=not args.no_bulk_metrics, max_age=args.max_age,
+                               host=args.host, port=args.port)
+
+    print(f"🧪 Serving {args.articles} synthetic articles at {server.base_url}")
+    print("   Point an exporter's base_url at it; press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 Requests served: {server.reset_counters()}")
+
+if __name__ == "__main__":
+    main()
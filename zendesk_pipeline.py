@@ -0,0 +1,357 @@
+"""
+Streaming export pipeline.
+
+A phased export fetches every article, then every author, then every metric,
+and only then writes its output. ExportPipeline runs those steps as stages
+connected by bounded queues instead. Each listing page moves through author
+lookup, metrics lookup, row shaping and the output sink as soon as it
+arrives. When a stage falls behind, its full input queue blocks the stages
+before it. Time to the first written row and peak memory therefore stay flat
+however many articles the account has.
+
+With an ExportCheckpoint, every written page is also recorded, so an
+interrupted export resumes after its last completed page.
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from zendesk_api import fetch_metrics_bulk, fetch_metrics_individually, fetch_users_bulk
+from zendesk_checkpoint import ExportCheckpoint
+from zendesk_sinks import open_sink
+
+# Listing pages buffered between two stages before the upstream stage blocks
+DEFAULT_QUEUE_SIZE = 4
+
+# Listing pages whose metrics are fetched at the same time
+DEFAULT_METRICS_PAGES = 4
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class ExportStats:
+    """Running totals for the export summary, so rows need not be kept in memory."""
+
+    def __init__(self, rows: Iterable[Dict] = ()):
+        self.total_articles = 0
+        self.total_views = 0
+        self.articles_with_views = 0
+        self.author_ids = set()
+        self.add(rows)
+
+    def add(self, rows: Iterable[Dict]) -> None:
+        """Count a batch of processed article rows."""
+        for row in rows:
+            views = row.get('views') or 0
+            self.total_articles += 1
+            self.total_views += views
+            if views > 0:
+                self.articles_with_views += 1
+            self.author_ids.add(row.get('author_id'))
+
+    @property
+    def unique_authors(self) -> int:
+        return len(self.author_ids)
+
+
+class ExportPipeline:
+    def __init__(self, exporter, sink, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 lookup_authors: bool = True, per_article_metrics: bool = True,
+                 checkpoint: Optional[ExportCheckpoint] = None, metrics_pages: int = DEFAULT_METRICS_PAGES,
+                 metrics_fallback: Optional[Callable[[List[Dict]], Dict[int, Dict]]] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            exporter: Exporter providing iter_article_pages, process_article, the API session and instrumentation
+            sink: Output sink receiving processed rows
+            queue_size: Batches buffered between two stages
+            lookup_authors: Resolve authors missing from the sideload through the Users API
+            per_article_metrics: Fall back to per-article metrics when the bulk endpoint fails
+            checkpoint: Started checkpoint recording every written page (optional)
+            metrics_pages: Listing pages whose metrics are fetched at the same time
+            metrics_fallback: Fetches metrics for a batch of articles once the bulk endpoint fails
+                (default: per-article metrics)
+        """
+        self.exporter = exporter
+        self.sink = sink
+        self.queue_size = max(1, queue_size)
+        self.lookup_authors = lookup_authors
+        self.per_article_metrics = per_article_metrics
+        self.checkpoint = checkpoint
+        self.metrics_pages = max(1, metrics_pages)
+        self.metrics_fallback = metrics_fallback
+        self.instrumentation = exporter.instrumentation
+        self.stats = ExportStats()
+        # Authors resolved so far, keyed by user ID; far smaller than the article set
+        self.users: Dict[int, Dict] = {}
+        # Authors the persistent user cache did not have, so later pages do not ask it again
+        self._user_cache_misses = set()
+        self._bulk_metrics_available = True
+        # Batches fall back one at a time, each with the fallback's full concurrency and rate ceiling
+        self._fallback_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def _put(self, stage_queue: queue.Queue, item) -> bool:
+        # Block while the queue is full, but give up once another stage has failed
+        while not self._stop.is_set():
+            try:
+                stage_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, stage_queue: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return stage_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _run_stage(self, stage, output: queue.Queue, *args) -> None:
+        try:
+            stage(output, *args)
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            self._put(output, _DONE)
+
+    def _list_stage(self, output: queue.Queue) -> None:
+        resume_from = self.checkpoint.position if self.checkpoint else None
+        # Articles spooled by an interrupted run are not enriched again
+        enriched_ids = self.checkpoint.enriched_ids() if resume_from else set()
+
+        pages = self.instrumentation.timed('list_articles', self.exporter.iter_article_pages(resume_from))
+        for articles, position in pages:
+            if enriched_ids:
+                articles = [article for article in articles if article.get('id') not in enriched_ids]
+            # Each page travels with its listing position so the checkpoint can move past it
+            if not self._put(output, (articles, position)):
+                return
+
+    def _author_stage(self, output: queue.Queue, source: queue.Queue) -> None:
+        while True:
+            item = self._get(source)
+            if item is _DONE:
+                return
+            with self.instrumentation.stage('resolve_authors'):
+                self.resolve_authors(item[0])
+            if not self._put(output, item):
+                return
+
+    def _metrics_stage(self, output: queue.Queue, source: queue.Queue) -> None:
+        # Metrics of several pages are fetched at once; pages are passed on in listing order
+        in_flight: Deque[Tuple[Future, List[Dict], Dict]] = deque()
+        with ThreadPoolExecutor(max_workers=self.metrics_pages) as pool:
+            try:
+                while True:
+                    item = self._get(source)
+                    if item is _DONE:
+                        break
+                    articles, position = item
+                    in_flight.append((pool.submit(self._timed_fetch_metrics, articles), articles, position))
+                    if len(in_flight) >= self.metrics_pages and not self._forward_metrics(output, in_flight):
+                        return
+                while in_flight:
+                    if not self._forward_metrics(output, in_flight):
+                        return
+            finally:
+                for future, _, _ in in_flight:
+                    future.cancel()
+
+    def _forward_metrics(self, output: queue.Queue, in_flight: Deque[Tuple[Future, List[Dict], Dict]]) -> bool:
+        future, articles, position = in_flight.popleft()
+        return self._put(output, (articles, future.result(), position))
+
+    def _timed_fetch_metrics(self, articles: List[Dict]) -> Dict[int, Dict]:
+        with self.instrumentation.stage('fetch_metrics'):
+            return self.fetch_metrics(articles)
+
+    def resolve_authors(self, articles: List[Dict]) -> None:
+        """
+        Resolve the authors of one batch that have not been seen before.
+
+        Authors come from the listing sideload first, then the persistent user
+        cache, then /users/show_many.json and finally single-user lookups.
+        """
+        exporter = self.exporter
+        author_ids = {article.get('author_id') for article in articles if article.get('author_id')}
+        remaining_ids = [user_id for user_id in author_ids if user_id not in self.users]
+        if not remaining_ids:
+            return
+
+        fresh_users = {user_id: exporter.sideloaded_users[user_id]
+                       for user_id in remaining_ids if user_id in exporter.sideloaded_users}
+        self.users.update(fresh_users)
+
+        remaining_ids = [user_id for user_id in remaining_ids if user_id not in self.users]
+        uncached_ids = [user_id for user_id in remaining_ids if user_id not in self._user_cache_misses]
+        if uncached_ids and exporter.user_cache:
+            cached_users = exporter.user_cache.get_many(uncached_ids)
+            self.users.update(cached_users)
+            self._user_cache_misses.update(user_id for user_id in uncached_ids if user_id not in cached_users)
+
+        remaining_ids = [user_id for user_id in remaining_ids if user_id not in self.users]
+        if remaining_ids and self.lookup_authors:
+            bulk_users = fetch_users_bulk(exporter.session, exporter.base_url, remaining_ids)
+            self.users.update(bulk_users)
+            fresh_users.update(bulk_users)
+            for user_id in remaining_ids:
+                if user_id not in self.users:
+                    self.users[user_id] = exporter.get_user_info_direct(user_id)
+
+        if exporter.user_cache:
+            exporter.user_cache.put_many(fresh_users)
+
+    def fetch_metrics(self, articles: List[Dict]) -> Dict[int, Dict]:
+        """
+        Fetch metrics for one batch of articles.
+
+        The bulk endpoint is used until a batch fails outright. After that, each
+        batch goes through the metrics fallback, or is fetched per article, when
+        per-article metrics are enabled. Called from several threads at once.
+        """
+        exporter = self.exporter
+        article_ids = [article.get('id') for article in articles if article.get('id')]
+        if not article_ids:
+            return {}
+
+        if self._bulk_metrics_available:
+            metrics, failed_chunks = fetch_metrics_bulk(exporter.session, exporter.base_url, article_ids, workers=1)
+            if metrics or not failed_chunks or not self.per_article_metrics:
+                return metrics
+            with self._fallback_lock:
+                if self._bulk_metrics_available:
+                    print("⚠️  Standard metrics API failed, falling back for the remaining articles")
+                    self._bulk_metrics_available = False
+
+        with self._fallback_lock:
+            if self.metrics_fallback:
+                return self.metrics_fallback(articles)
+            return fetch_metrics_individually(
+                exporter.session, exporter.base_url, article_ids,
+                workers=exporter.metrics_workers,
+                max_rate=exporter.metrics_rps
+            )
+
+    def replay_checkpoint(self) -> None:
+        """Write the rows spooled by an interrupted run to the sink."""
+        for rows in self.checkpoint.iter_row_batches():
+            self.sink.write_rows(rows)
+            self.stats.add(rows)
+
+    def run(self) -> ExportStats:
+        """
+        Run all stages until the listing is exhausted or a stage fails.
+
+        Row shaping and the sink run on the calling thread; listing, author
+        lookup and metrics lookup each run on their own thread.
+
+        Returns:
+            Totals for the rows written to the sink
+        """
+        listed: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        authored: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        enriched: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        threads = [
+            threading.Thread(target=self._run_stage, args=(self._list_stage, listed), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._author_stage, authored, listed), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._metrics_stage, enriched, authored), daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(enriched)
+                if item is _DONE:
+                    break
+                articles, metrics, position = item
+                with self.instrumentation.stage('process_rows'):
+                    rows = [self.exporter.process_article(article, self.users, metrics) for article in articles]
+                with self.instrumentation.stage('write_output'):
+                    self.sink.write_rows(rows)
+                    self.stats.add(rows)
+                    if self.checkpoint:
+                        self.checkpoint.record_page(rows, position)
+        except BaseException as e:
+            self._errors.append(e)
+            raise
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
+
+
+def run_pipeline_export(exporter, output_file: Optional[str] = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+                        lookup_authors: bool = True, per_article_metrics: bool = True,
+                        checkpoint: Optional[ExportCheckpoint] = None, metrics_pages: int = DEFAULT_METRICS_PAGES,
+                        metrics_fallback: Optional[Callable[[List[Dict]], Dict[int, Dict]]] = None
+                        ) -> Tuple[str, ExportStats]:
+    """
+    Stream an export for any of the exporters straight into its output file.
+
+    Args:
+        exporter: Exporter providing COLUMN_ORDER, output_format, sinks, get_output_filename and process_article
+        output_file: Output filename (optional)
+        queue_size: Batches buffered between two stages
+        lookup_authors: Resolve authors missing from the sideload through the Users API
+        per_article_metrics: Fall back to per-article metrics when the bulk endpoint fails
+        checkpoint: Checkpoint to resume from and record progress in (optional)
+        metrics_pages: Listing pages whose metrics are fetched at the same time
+        metrics_fallback: Fetches metrics for a batch of articles once the bulk endpoint fails
+            (default: per-article metrics)
+
+    Returns:
+        Tuple of (filename, export totals); the filename is empty when no articles were found
+    """
+    resuming = checkpoint is not None and checkpoint.load() is not None
+    if resuming and checkpoint.output_format != exporter.output_format:
+        raise ValueError(f"Checkpoint {checkpoint.path} belongs to a {checkpoint.output_format} export; "
+                         f"rerun with --format {checkpoint.output_format} or remove it")
+
+    # A resumed export keeps writing to the file it started, unless told otherwise
+    filename = exporter.get_output_filename(output_file or (checkpoint.output_file if resuming else None))
+    if resuming:
+        print(f"♻️  Resuming from checkpoint {checkpoint.path} after page {checkpoint.state.get('pages', 0)}")
+    print("📚 Streaming articles through the export pipeline...")
+
+    sink = open_sink(filename, exporter.COLUMN_ORDER, exporter.output_format, exporter.sinks)
+    pipeline = ExportPipeline(exporter, sink, queue_size, lookup_authors, per_article_metrics, checkpoint,
+                              metrics_pages, metrics_fallback)
+    try:
+        if checkpoint:
+            checkpoint.start(filename, exporter.output_format)
+            pipeline.replay_checkpoint()
+        stats = pipeline.run()
+    except BaseException:
+        sink.close()
+        os.remove(filename)
+        if checkpoint:
+            checkpoint.close()
+            print(f"💾 Progress saved in {checkpoint.path}; rerun with the same checkpoint to resume")
+        raise
+    sink.close()
+    if checkpoint:
+        checkpoint.complete()
+
+    if not stats.total_articles:
+        os.remove(filename)
+        return "", stats
+
+    print(f"✅ Exported {stats.total_articles} articles to {filename}")
+    return filename, stats
@@ -0,0 +1,218 @@
+"""
+Record and replay raw Zendesk API responses.
+
+With ``--record DIR`` every API response an export receives is saved under
+DIR. Bodies are gzip-compressed and content-addressed: the file name is the
+SHA-256 of the raw body, so identical responses are stored once. A
+``manifest.jsonl`` file maps each request (method and normalized URL) to its
+status code, content type and body hash.
+
+With ``--replay DIR`` the exporters are fed from a recording instead of the
+network. Nothing is sent, the rate limiter is bypassed, and every body is
+checked against its hash as it is read. A full snapshot can then be re-shaped
+or re-exported in seconds, with the same result every time. Requests missing
+from the recording are answered with a 404, the same way Zendesk answers an
+unknown resource. Replays must use the listing options of the recorded run
+(``--workers``, ``--incremental``), since those decide which URLs are requested.
+"""
+
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+MANIFEST_FILE = 'manifest.jsonl'
+MANIFEST_FORMAT = 'zendesk-api-recording'
+MANIFEST_VERSION = 1
+
+RECORDING_MODES = ('record', 'replay')
+
+# Missing requests reported individually before the rest are only counted
+MAX_MISSING_WARNINGS = 5
+
+
+def recorded_subdomain(directory: str) -> Optional[str]:
+    """Subdomain a recording was made for, or None when unknown or unreadable."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.loads(f.readline() or '{}').get('subdomain')
+    except (OSError, ValueError):
+        return None
+
+
+def request_key(method: str, url: str, params: Optional[Dict] = None) -> str:
+    """
+    Normalize a request into its manifest key.
+
+    The scheme and host are dropped, so a recording can be replayed under any
+    subdomain or against a local server, and query parameters are sorted so
+    their order and encoding do not matter.
+    """
+    if params:
+        url = requests.Request(method, url, params=params).prepare().url
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.path}?{query}" if query else f"{method.upper()} {parts.path}"
+
+
+class ApiRecording:
+    def __init__(self, directory: str, mode: str = 'record', subdomain: Optional[str] = None):
+        """
+        Open a recording directory.
+
+        Args:
+            directory: Directory holding the manifest and compressed bodies
+            mode: 'record' to save responses, 'replay' to serve them
+            subdomain: Subdomain being recorded, kept in the manifest so replays build the same article URLs
+
+        Raises:
+            ValueError: For an unknown mode or an unreadable manifest
+            FileNotFoundError: When replaying a directory without a manifest
+        """
+        if mode not in RECORDING_MODES:
+            raise ValueError(f"Unknown recording mode {mode!r}; expected one of {', '.join(RECORDING_MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        self.entries: Dict[str, Dict] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.missing = 0
+        self.stored_bytes = 0
+        self._manifest = None
+        self._lock = threading.Lock()
+
+        if mode == 'replay':
+            self._load_manifest()
+        else:
+            os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+            # A new recording replaces the previous manifest; bodies are kept and shared
+            self._manifest = open(self.manifest_path, 'w', encoding='utf-8')
+            self._write_line({'format': MANIFEST_FORMAT, 'version': MANIFEST_VERSION,
+                              'subdomain': subdomain, 'recorded_at': int(time.time())})
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _load_manifest(self) -> None:
+        if not os.path.exists(self.manifest_path):
+            raise FileNotFoundError(f"No recording found in {self.directory} ({MANIFEST_FILE} is missing)")
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline() or '{}')
+            if header.get('format') != MANIFEST_FORMAT:
+                raise ValueError(f"{self.manifest_path} is not an API recording manifest")
+            for line in f:
+                # A torn last line means the recording run was interrupted mid-write
+                if not line.endswith('\n'):
+                    break
+                entry = json.loads(line)
+                # A request made twice keeps its last response
+                self.entries[entry['key']] = entry
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'objects', digest[:2], f"{digest}.gz")
+
+    def _write_line(self, data: Dict) -> None:
+        self._manifest.write(json.dumps(data) + '\n')
+        self._manifest.flush()
+
+    def record(self, method: str, url: str, status: int, content_type: str, body: bytes) -> None:
+        """
+        Save one response.
+
+        Args:
+            method: HTTP method of the request
+            url: Full request URL, including the query string
+            status: HTTP status of the response
+            content_type: Content-Type of the response
+            body: Raw response body
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        stored = 0
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # mtime=0 keeps the compressed file identical for identical bodies
+            data = gzip.compress(body, compresslevel=6, mtime=0)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            stored = len(data)
+
+        entry = {'key': request_key(method, url), 'status': status, 'content_type': content_type,
+                 'sha256': digest, 'size': len(body)}
+        with self._lock:
+            self._write_line(entry)
+            self.entries[entry['key']] = entry
+            self.recorded += 1
+            self.stored_bytes += stored
+
+    def record_response(self, method: str, url: str, response: requests.Response) -> None:
+        """Save a requests response received for ``url``."""
+        self.record(method, url, response.status_code, response.headers.get('Content-Type', ''), response.content)
+
+    def replay(self, method: str, url: str, params: Optional[Dict] = None) -> Optional[Tuple[int, str, bytes]]:
+        """
+        Look up a recorded response.
+
+        Returns:
+            Tuple of (status, content type, body), or None when the request was not recorded
+
+        Raises:
+            ValueError: When a stored body no longer matches its hash
+        """
+        key = request_key(method, url, params)
+        entry = self.entries.get(key)
+        if entry is None:
+            with self._lock:
+                self.missing += 1
+                missing = self.missing
+            if missing <= MAX_MISSING_WARNINGS:
+                print(f"⚠️  Not in recording {self.directory}: {key}")
+            return None
+
+        with open(self._object_path(entry['sha256']), 'rb') as f:
+            body = gzip.decompress(f.read())
+        if hashlib.sha256(body).hexdigest() != entry['sha256']:
+            raise ValueError(f"Recorded body for {key} is corrupt")
+
+        with self._lock:
+            self.replayed += 1
+        return entry['status'], entry['content_type'], body
+
+    def replay_response(self, method: str, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """Rebuild a requests response from the recording; unrecorded requests get a 404."""
+        recorded = self.replay(method, url, params)
+        status, content_type, body = recorded or (404, 'application/json', b'{"error":"RecordNotFound"}')
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = http.client.responses.get(status, '') if recorded else 'Not Recorded'
+        response.url = requests.Request(method, url, params=params).prepare().url
+        response.headers = CaseInsensitiveDict({'Content-Type': content_type})
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+    def close(self) -> None:
+        """Close the manifest of a recording run."""
+        if self._manifest is not None:
+            self._manifest.close()
+            self._manifest = None
+
+    def summary(self) -> str:
+        """One-line summary for the export report."""
+        if self.replaying:
+            return f"{self.replayed} responses replayed from {self.directory}, {self.missing} not recorded"
+        return (f"{self.recorded} responses recorded to {self.directory}, "
+                f"{self.stored_bytes / 1e6:.1f} MB of new compressed bodies")
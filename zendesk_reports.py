@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Aggregate reports over exported articles.
+
+Loads an export (CSV, Parquet, Arrow) or a SQLite sink table into typed pandas
+columns and builds its aggregates with vectorised group-bys, so multi-million
+row history tables are summarised in seconds:
+- overview: totals, draft ratio and update-age percentiles
+- views, votes and draft ratios by author, section and category
+- top-N lists: most viewed, most voted and stalest drafts
+
+Reports are written next to the export as ``<output>.report.json`` and one
+``<output>.report_<table>.csv`` per table. pandas is an optional dependency.
+
+Usage:
+    python zendesk_reports.py zendesk_articles_20250808_195429.csv
+    python zendesk_reports.py sqlite:zendesk_articles.db --top 25 --format json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    pd = None
+
+from zendesk_sinks import INT_COLUMNS, TIMESTAMP_COLUMNS, parse_sink_spec, require_output_format
+
+REPORT_FORMATS = ('json', 'csv')
+
+DEFAULT_TOP_N = 10
+
+# Count columns summed per group, when the export has them
+METRIC_COLUMNS = ('views', 'comments', 'votes', 'vote_sum', 'vote_count')
+
+# Columns a report reads; anything else in the export is skipped while loading
+REPORT_COLUMNS = ('article_id', 'article_title', 'article_link', 'article_author_name', 'author_id',
+                  'section_id', 'section_name', 'category_id', 'category_name', 'status',
+                  'created_at', 'updated_at') + METRIC_COLUMNS
+
+# Group-by tables: (table name, key column, label column shown next to the key)
+GROUPINGS = (
+    ('by_author', 'author_id', 'article_author_name'),
+    ('by_section', 'section_id', 'section_name'),
+    ('by_category', 'category_id', 'category_name')
+)
+
+AGE_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def reports_available() -> bool:
+    """Whether the optional pandas dependency is installed."""
+    return pd is not None
+
+
+def require_reports() -> None:
+    """
+    Check that reports can be built.
+
+    Raises:
+        ImportError: When pandas is not installed
+    """
+    if not reports_available():
+        raise ImportError("Reports require pandas (pip install pandas)")
+
+
+def _typed(frame: 'pd.DataFrame') -> 'pd.DataFrame':
+    # Vectorised conversion of text columns (CSV, SQLite) into nullable ints and UTC timestamps
+    for column in frame.columns:
+        if column in INT_COLUMNS:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype('Int64')
+        elif column in TIMESTAMP_COLUMNS:
+            frame[column] = pd.to_datetime(frame[column], utc=True, errors='coerce')
+    return frame
+
+
+def load_frame(source: str) -> 'pd.DataFrame':
+    """
+    Load the report columns of an export into a typed DataFrame.
+
+    Args:
+        source: CSV, Parquet (.parquet) or Arrow IPC (.arrow) export, or 'sqlite:PATH' for a SQLite sink
+
+    Returns:
+        DataFrame with nullable integer counts and IDs and UTC timestamps
+    """
+    require_reports()
+    if source.startswith('sqlite:'):
+        _, path = parse_sink_spec(source)
+        # A connection's own context manager only ends a transaction; closing() releases the file
+        with contextlib.closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+            available = [row[1] for row in conn.execute('PRAGMA table_info("articles")')]
+            columns = [column for column in REPORT_COLUMNS if column in available]
+            if not columns:
+                raise ValueError(f"No articles table in {path}")
+            frame = pd.read_sql_query(f'SELECT {", ".join(columns)} FROM articles', conn)
+        return _typed(frame)
+
+    if source.endswith('.parquet') or source.endswith('.arrow'):
+        require_output_format('parquet' if source.endswith('.parquet') else 'arrow')
+        import pyarrow.ipc as pa_ipc
+        import pyarrow.parquet as pq
+        if source.endswith('.parquet'):
+            schema = pq.read_schema(source)
+            table = pq.read_table(source, columns=[column for column in REPORT_COLUMNS if column in schema.names],
+                                  memory_map=True)
+        else:
+            with pa_ipc.open_file(source) as reader:
+                table = reader.read_all()
+            table = table.select([column for column in REPORT_COLUMNS if column in table.column_names])
+        return _typed(table.to_pandas())
+
+    frame = pd.read_csv(source, usecols=lambda column: column in REPORT_COLUMNS, dtype=str,
+                        keep_default_na=False, na_values=[''])
+    return _typed(frame)
+
+
+def _records(frame: 'pd.DataFrame') -> List[Dict]:
+    return json.loads(frame.to_json(orient='records', date_format='iso', date_unit='s'))
+
+
+def build_report(frame: 'pd.DataFrame', top_n: int = DEFAULT_TOP_N,
+                 now: datetime = None) -> Tuple[Dict, Dict[str, 'pd.DataFrame']]:
+    """
+    Aggregate an export.
+
+    Args:
+        frame: Typed DataFrame from load_frame
+        top_n: Rows in each top-N table
+        now: Reference time for update ages (default: current time)
+
+    Returns:
+        Tuple of (overview dictionary, tables keyed by name)
+    """
+    now = pd.Timestamp(now or datetime.now(timezone.utc))
+    metrics = [column for column in METRIC_COLUMNS if column in frame.columns]
+    is_draft = frame['status'].eq('draft') if 'status' in frame.columns else pd.Series(False, index=frame.index)
+    age_days = None
+    if 'updated_at' in frame.columns:
+        age_days = (now - frame['updated_at']).dt.total_seconds() / 86400
+
+    overview = {
+        'articles': int(len(frame)),
+        'drafts': int(is_draft.sum()),
+        'draft_ratio': round(float(is_draft.mean()), 4) if len(frame) else 0.0,
+        'totals': {column: int(frame[column].sum()) for column in metrics}
+    }
+    if 'author_id' in frame.columns:
+        overview['authors'] = int(frame['author_id'].nunique())
+    if age_days is not None and age_days.notna().any():
+        quantiles = age_days.quantile(list(AGE_PERCENTILES))
+        overview['update_age_days'] = {f"p{int(q * 100)}": round(float(quantiles[q]), 1) for q in AGE_PERCENTILES}
+        overview['update_age_days']['max'] = round(float(age_days.max()), 1)
+
+    tables: Dict[str, pd.DataFrame] = {}
+    work = frame.assign(_draft=is_draft.astype('int64'))
+    if age_days is not None:
+        work['_age_days'] = age_days
+
+    for name, key, label in GROUPINGS:
+        if key not in work.columns:
+            continue
+        aggregations = {'articles': ('article_id', 'size'), 'drafts': ('_draft', 'sum')}
+        if label in work.columns:
+            aggregations = {label: (label, 'first'), **aggregations}
+        aggregations.update({column: (column, 'sum') for column in metrics})
+        if age_days is not None:
+            aggregations['median_update_age_days'] = ('_age_days', 'median')
+        grouped = work.groupby(key, sort=False, dropna=True).agg(**aggregations)
+        grouped['draft_ratio'] = (grouped['drafts'] / grouped['articles']).round(4)
+        if 'median_update_age_days' in grouped.columns:
+            grouped['median_update_age_days'] = grouped['median_update_age_days'].round(1)
+        order = 'views' if 'views' in grouped.columns else 'articles'
+        tables[name] = grouped.sort_values(order, ascending=False, kind='stable').reset_index()
+
+    listing = [column for column in ('article_id', 'article_title', 'article_author_name', 'status',
+                                     'updated_at') if column in frame.columns]
+    if 'views' in frame.columns:
+        tables['top_viewed'] = frame.nlargest(top_n, 'views')[listing + ['views']].reset_index(drop=True)
+    vote_column = next((column for column in ('vote_sum', 'votes') if column in frame.columns), None)
+    if vote_column:
+        tables['top_voted'] = frame.nlargest(top_n, vote_column)[listing + [vote_column]].reset_index(drop=True)
+    if age_days is not None:
+        drafts = work.loc[is_draft & age_days.notna(), listing + ['_age_days']]
+        stale = drafts.nlargest(top_n, '_age_days').rename(columns={'_age_days': 'update_age_days'})
+        stale['update_age_days'] = stale['update_age_days'].round(1)
+        tables['stale_drafts'] = stale.reset_index(drop=True)
+
+    return overview, tables
+
+
+def write_report(source: str, output_base: str = None, top_n: int = DEFAULT_TOP_N,
+                 formats: Sequence[str] = REPORT_FORMATS) -> List[str]:
+    """
+    Build the report for an export and write it next to it.
+
+    Args:
+        source: Export file or 'sqlite:PATH'
+        output_base: Path prefix of the report files (default: the export path without extension)
+        top_n: Rows in each top-N table
+        formats: Any of 'json' and 'csv'
+
+    Returns:
+        Paths of the written report files
+    """
+    frame = load_frame(source)
+    overview, tables = build_report(frame, top_n)
+    base = output_base or os.path.splitext(source.split(':', 1)[1] if source.startswith('sqlite:') else source)[0]
+    written = []
+
+    if 'json' in formats:
+        json_file = f"{base}.report.json"
+        report = {
+            'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'source': source,
+            'overview': overview
+        }
+        report.update({name: _records(table) for name, table in tables.items()})
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        written.append(json_file)
+
+    if 'csv' in formats:
+        for name, table in tables.items():
+            csv_file = f"{base}.report_{name}.csv"
+            table.to_csv(csv_file, index=False, date_format='%Y-%m-%dT%H:%M:%SZ')
+            written.append(csv_file)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build aggregate reports over a Zendesk Knowledge Base export",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python zendesk_reports.py zendesk_articles_20250808_195429.csv
+  python zendesk_reports.py zendesk_articles.parquet --top 25
+  python zendesk_reports.py sqlite:zendesk_articles.db --format json --output-base reports/nightly
+        """
+    )
+
+    parser.add_argument(
+        'source',
+        help='Export file (CSV, Parquet or Arrow) or sqlite:PATH for a SQLite sink'
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=DEFAULT_TOP_N,
+        help=f'Rows in each top-N table (default: {DEFAULT_TOP_N})'
+    )
+    parser.add_argument(
+        '--format',
+        nargs='+',
+        choices=list(REPORT_FORMATS),
+        default=list(REPORT_FORMATS),
+        help='Report formats to write (default: json csv)'
+    )
+    parser.add_argument(
+        '--output-base',
+        help='Path prefix of the report files (default: the export path without extension)'
+    )
+
+    args = parser.parse_args()
+
+    if not args.source.startswith('sqlite:') and not os.path.exists(args.source):
+        print(f"❌ Export {args.source} not found")
+        sys.exit(1)
+
+    try:
+        files = write_report(args.source, args.output_base, args.top, args.format)
+    except Exception as e:
+        print(f"❌ Report failed: {e}")
+        sys.exit(1)
+
+    print(f"📈 Report written: {', '.join(files)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,588 @@
+"""
+Output sinks for processed article rows.
+
+Sinks take rows as they are produced and write them incrementally, so an
+export never holds the full result set in memory. Rows are formatted into an
+in-memory block and written to disk one block at a time.
+
+Besides CSV, rows can be written as Parquet or Arrow IPC files with a typed
+schema: int64 IDs and counts, UTC timestamps, and dictionary-encoded status and
+author names. These formats need the optional pyarrow dependency.
+
+Rows can also be sent to extra sinks next to the output file. ``sqlite:PATH``
+upserts them into a SQLite database keyed by article_id, so repeated exports
+update one queryable table in place.
+"""
+
+import csv
+import importlib.util
+import io
+import itertools
+import sqlite3
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# pyarrow modules, imported by require_output_format on first columnar use; CSV and
+# SQLite exports never pay for loading pyarrow
+pa = None
+pa_ipc = None
+pq = None
+
+OUTPUT_FORMATS = ('csv', 'parquet', 'arrow')
+
+# File extension used for default output filenames
+OUTPUT_EXTENSIONS = {'csv': 'csv', 'parquet': 'parquet', 'arrow': 'arrow'}
+
+# Rows formatted in memory before a block is written to disk
+DEFAULT_BLOCK_ROWS = 1000
+
+# OS-level write buffer for output files
+FILE_BUFFER_BYTES = 1 << 20
+
+# Rows per Parquet row group / Arrow record batch
+DEFAULT_ROW_GROUP_ROWS = 10000
+
+INT_COLUMNS = ('author_id', 'article_id', 'section_id', 'category_id',
+               'views', 'comments', 'votes', 'vote_sum', 'vote_count')
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+# Low-cardinality text columns, stored once per distinct value
+DICTIONARY_COLUMNS = ('status', 'article_author_name')
+
+# Extra sink kinds, given as KIND:PATH
+SINK_KINDS = ('sqlite',)
+
+# Columns indexed in SQLite sinks, when the exporter writes them
+SQLITE_INDEX_COLUMNS = ('author_id', 'section_id', 'status', 'updated_at')
+
+
+class CsvSink:
+    def __init__(self, filename: str, columns: List[str], block_rows: int = DEFAULT_BLOCK_ROWS):
+        """
+        Open the output file and write the header row.
+
+        Args:
+            filename: Output CSV filename
+            columns: Column order of the output; keys not listed are ignored
+            block_rows: Number of rows buffered before a block is written
+        """
+        self.filename = filename
+        self.columns = list(columns)
+        self.block_rows = max(1, block_rows)
+        self.rows_written = 0
+        self._pending = 0
+        self._file = open(filename, 'w', newline='', encoding='utf-8', buffering=FILE_BUFFER_BYTES)
+        self._block = io.StringIO()
+        self._writer = csv.DictWriter(self._block, fieldnames=self.columns, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write_rows(self, rows: Iterable[Dict]) -> None:
+        """Append processed article rows, writing a block whenever the buffer fills up."""
+        for row in rows:
+            self._writer.writerow(row)
+            self._pending += 1
+            self.rows_written += 1
+            if self._pending >= self.block_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered block to the file."""
+        self._file.write(self._block.getvalue())
+        self._file.flush()
+        self._block.seek(0)
+        self._block.truncate()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Write any remaining rows and close the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'CsvSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_csv(rows: Iterable[Dict], filename: str, columns: List[str],
+              block_rows: int = DEFAULT_BLOCK_ROWS, extra_sinks: Sequence[str] = ()) -> int:
+    """
+    Stream rows into a CSV file in a fixed column order.
+
+    Args:
+        rows: Processed article rows; any iterable, consumed once
+        filename: Output CSV filename
+        columns: Column order of the output
+        block_rows: Number of rows buffered before a block is written
+        extra_sinks: Sink specs (e.g. 'sqlite:articles.db') that receive the same rows
+
+    Returns:
+        Number of rows written
+    """
+    with attach_sinks(CsvSink(filename, columns, block_rows), columns, extra_sinks) as sink:
+        sink.write_rows(rows)
+    return sink.rows_written
+
+
+def arrow_available() -> bool:
+    """Whether the optional pyarrow dependency is installed."""
+    return pa is not None or importlib.util.find_spec('pyarrow') is not None
+
+
+def _import_pyarrow() -> None:
+    global pa, pa_ipc, pq
+    if pa is None:
+        import pyarrow.ipc as pa_ipc
+        import pyarrow.parquet as pq
+        import pyarrow as pa
+
+
+def require_output_format(output_format: str) -> None:
+    """
+    Check that an output format is known and its dependencies are installed.
+
+    pyarrow is imported here the first time a Parquet or Arrow format is checked.
+
+    Raises:
+        ValueError: For an unknown format
+        ImportError: When pyarrow is needed but not installed
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}; expected one of {', '.join(OUTPUT_FORMATS)}")
+    if output_format == 'csv':
+        return
+    if not arrow_available():
+        raise ImportError(f"{output_format} output requires pyarrow (pip install pyarrow)")
+    _import_pyarrow()
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+def _to_timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime) or value is None:
+        return value
+    if value == '':
+        return None
+    try:
+        # Zendesk timestamps are ISO 8601 in UTC ("2024-01-31T12:00:00Z")
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _to_str(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _to_timestamp_text(value) -> Optional[str]:
+    # ISO 8601 text in UTC, which SQLite sorts and compares correctly
+    timestamp = _to_timestamp(value)
+    if timestamp is None:
+        return None
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def article_schema(columns: List[str]):
+    """
+    Build the Arrow schema for a list of output columns.
+
+    Args:
+        columns: Output columns, in order
+
+    Returns:
+        pyarrow.Schema
+    """
+    fields = []
+    for column in columns:
+        if column in INT_COLUMNS:
+            column_type = pa.int64()
+        elif column in TIMESTAMP_COLUMNS:
+            column_type = pa.timestamp('s', tz='UTC')
+        elif column in DICTIONARY_COLUMNS:
+            column_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            column_type = pa.string()
+        fields.append(pa.field(column, column_type))
+    return pa.schema(fields)
+
+
+def _converter(column: str) -> Callable:
+    if column in INT_COLUMNS:
+        return _to_int
+    if column in TIMESTAMP_COLUMNS:
+        return _to_timestamp
+    return _to_str
+
+
+class ArrowSink:
+    def __init__(self, filename: str, columns: List[str], output_format: str = 'parquet',
+                 row_group_rows: int = DEFAULT_ROW_GROUP_ROWS):
+        """
+        Open a Parquet or Arrow IPC file for streaming writes.
+
+        Args:
+            filename: Output filename
+            columns: Column order of the output; keys not listed are ignored
+            output_format: 'parquet' or 'arrow'
+            row_group_rows: Number of rows per row group (Parquet) or record batch (Arrow)
+        """
+        require_output_format(output_format)
+        self.filename = filename
+        self.columns = list(columns)
+        self.output_format = output_format
+        self.row_group_rows = max(1, row_group_rows)
+        self.rows_written = 0
+        self.schema = article_schema(self.columns)
+        self._converters = [_converter(column) for column in self.columns]
+        self._buffers: List[List] = [[] for _ in self.columns]
+        # Dictionary columns share one growing dictionary across all batches;
+        # Arrow IPC files only allow dictionary deltas, not replacements
+        self._dictionaries: Dict[str, Dict[str, int]] = {column: {} for column in self.columns
+                                                         if column in DICTIONARY_COLUMNS}
+
+        if output_format == 'parquet':
+            self._writer = pq.ParquetWriter(filename, self.schema, compression='zstd')
+        else:
+            options = pa_ipc.IpcWriteOptions(compression='zstd', emit_dictionary_deltas=True)
+            self._writer = pa_ipc.new_file(filename, self.schema, options=options)
+
+    def write_rows(self, rows: Iterable[Dict]) -> None:
+        """Append processed article rows, writing a row group whenever the buffer fills up."""
+        for row in rows:
+            for buffer, column, convert in zip(self._buffers, self.columns, self._converters):
+                buffer.append(convert(row.get(column)))
+            if len(self._buffers[0]) >= self.row_group_rows:
+                self.flush()
+
+    def _array(self, column: str, values: List):
+        field = self.schema.field(column)
+        if column not in self._dictionaries:
+            return pa.array(values, type=field.type)
+
+        dictionary = self._dictionaries[column]
+        indices = []
+        for value in values:
+            if value is None:
+                indices.append(None)
+            else:
+                indices.append(dictionary.setdefault(value, len(dictionary)))
+        return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()),
+                                              pa.array(list(dictionary), type=pa.string()))
+
+    def flush(self) -> None:
+        """Write the buffered rows as one row group."""
+        count = len(self._buffers[0]) if self._buffers else 0
+        if not count:
+            return
+        arrays = [self._array(column, buffer) for column, buffer in zip(self.columns, self._buffers)]
+        self._writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        self.rows_written += count
+        self._buffers = [[] for _ in self.columns]
+
+    def close(self) -> None:
+        """Write any remaining rows and finalize the file."""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._writer = None
+
+    def __enter__(self) -> 'ArrowSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SqliteSink:
+    def __init__(self, path: str, columns: List[str], batch_rows: int = DEFAULT_BLOCK_ROWS,
+                 table: str = 'articles'):
+        """
+        Open (or create) a SQLite database and its article table.
+
+        Rows are upserted by article_id, so a repeated export updates the table
+        in place. Columns missing from an existing table are added, which lets
+        every exporter write to the same database.
+
+        Args:
+            path: SQLite database file
+            columns: Columns of the exported rows; must include article_id
+            batch_rows: Number of rows upserted per transaction
+            table: Table name
+        """
+        if 'article_id' not in columns:
+            raise ValueError("A SQLite sink needs an article_id column to key its rows")
+        self.path = path
+        self.columns = list(columns)
+        self.batch_rows = max(1, batch_rows)
+        self.table = table
+        self.rows_written = 0
+        # Each row records the export that last wrote it; articles deleted in Zendesk keep an older value
+        self.exported_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        self._converters = [_sqlite_converter(column) for column in self.columns]
+        self._key_position = self.columns.index('article_id')
+        self._pending: List[Tuple] = []
+
+        self._conn = sqlite3.connect(path)
+        # WAL lets readers query the table while an export is writing to it
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_table()
+
+        names = [f'"{name}"' for name in self.columns + ['exported_at']]
+        updates = ', '.join(f'{name} = excluded.{name}' for name in names if name != '"article_id"')
+        self._upsert = (f'INSERT INTO "{table}" ({", ".join(names)}) VALUES ({", ".join("?" * len(names))}) '
+                        f'ON CONFLICT(article_id) DO UPDATE SET {updates}')
+
+    def _create_table(self) -> None:
+        definitions = ['article_id INTEGER PRIMARY KEY']
+        for column in self.columns:
+            if column != 'article_id':
+                definitions.append(f'"{column}" {_sqlite_type(column)}')
+        definitions.append('exported_at TEXT')
+
+        with self._conn:
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({", ".join(definitions)})')
+            existing = {row[1] for row in self._conn.execute(f'PRAGMA table_info("{self.table}")')}
+            for column in self.columns + ['exported_at']:
+                if column not in existing:
+                    self._conn.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{column}" {_sqlite_type(column)}')
+                    existing.add(column)
+            for column in SQLITE_INDEX_COLUMNS:
+                if column in existing:
+                    self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.table}_{column}" '
+                                       f'ON "{self.table}" ("{column}")')
+
+    def write_rows(self, rows: Iterable[Dict]) -> None:
+        """Queue processed article rows, upserting a batch whenever the buffer fills up."""
+        for row in rows:
+            values = tuple(convert(row.get(column)) for column, convert in zip(self.columns, self._converters))
+            # Rows without an article ID cannot be keyed
+            if values[self._key_position] is None:
+                continue
+            self._pending.append(values + (self.exported_at,))
+            if len(self._pending) >= self.batch_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        """Upsert the queued rows in one transaction."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(self._upsert, self._pending)
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        """Upsert any remaining rows and close the database."""
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.execute("PRAGMA optimize")
+        self._conn.close()
+        self._conn = None
+
+    def __enter__(self) -> 'SqliteSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _sqlite_type(column: str) -> str:
+    return 'INTEGER' if column in INT_COLUMNS else 'TEXT'
+
+
+def _sqlite_converter(column: str) -> Callable:
+    if column in INT_COLUMNS:
+        return _to_int
+    if column in TIMESTAMP_COLUMNS:
+        return _to_timestamp_text
+    return _to_str
+
+
+def parse_sink_spec(spec: str) -> Tuple[str, str]:
+    """
+    Split an extra sink spec such as 'sqlite:articles.db'.
+
+    Returns:
+        Tuple of (kind, path)
+
+    Raises:
+        ValueError: For an unknown kind or a missing path
+    """
+    kind, _, path = spec.partition(':')
+    if kind not in SINK_KINDS or not path:
+        raise ValueError(f"Unknown sink {spec!r}; expected one of {', '.join(f'{kind}:PATH' for kind in SINK_KINDS)}")
+    return kind, path
+
+
+def open_extra_sink(spec: str, columns: List[str]):
+    """
+    Open an extra sink from its spec.
+
+    Args:
+        spec: Sink spec, e.g. 'sqlite:articles.db'
+        columns: Columns of the exported rows
+
+    Returns:
+        SqliteSink
+    """
+    _, path = parse_sink_spec(spec)
+    return SqliteSink(path, columns)
+
+
+class TeeSink:
+    """Sends the same rows to a primary sink and any number of extra sinks."""
+
+    def __init__(self, sinks: List):
+        self.sinks = sinks
+
+    @property
+    def rows_written(self) -> int:
+        return self.sinks[0].rows_written
+
+    def write_rows(self, rows: Iterable[Dict]) -> None:
+        """Write rows to every sink, one block at a time so any iterable can be shared."""
+        iterator = iter(rows)
+        while True:
+            block = list(itertools.islice(iterator, DEFAULT_BLOCK_ROWS))
+            if not block:
+                return
+            for sink in self.sinks:
+                sink.write_rows(block)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self) -> 'TeeSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach_sinks(sink, columns: List[str], extra_sinks: Sequence[str] = ()):
+    """
+    Combine a sink with extra sinks.
+
+    Args:
+        sink: Primary sink
+        columns: Columns of the exported rows
+        extra_sinks: Sink specs, e.g. ['sqlite:articles.db']
+
+    Returns:
+        The sink itself without extra sinks, otherwise a TeeSink
+    """
+    if not extra_sinks:
+        return sink
+    return TeeSink([sink] + [open_extra_sink(spec, columns) for spec in extra_sinks])
+
+
+def open_sink(filename: str, columns: List[str], output_format: str = 'csv', extra_sinks: Sequence[str] = ()):
+    """
+    Open a streaming sink for an output format.
+
+    Args:
+        filename: Output filename
+        columns: Column order of the output
+        output_format: 'csv', 'parquet' or 'arrow'
+        extra_sinks: Sink specs (e.g. 'sqlite:articles.db') that receive the same rows
+
+    Returns:
+        CsvSink or ArrowSink, or a TeeSink when extra sinks are given
+    """
+    require_output_format(output_format)
+    if output_format == 'csv':
+        return attach_sinks(CsvSink(filename, columns), columns, extra_sinks)
+    return attach_sinks(ArrowSink(filename, columns, output_format), columns, extra_sinks)
+
+
+def write_rows(rows: Iterable[Dict], filename: str, columns: List[str], output_format: str = 'csv',
+               extra_sinks: Sequence[str] = ()) -> int:
+    """
+    Stream rows into a file in any supported output format.
+
+    Args:
+        rows: Processed article rows; any iterable, consumed once
+        filename: Output filename
+        columns: Column order of the output
+        output_format: 'csv', 'parquet' or 'arrow'
+        extra_sinks: Sink specs (e.g. 'sqlite:articles.db') that receive the same rows
+
+    Returns:
+        Number of rows written
+    """
+    with open_sink(filename, columns, output_format, extra_sinks) as sink:
+        sink.write_rows(rows)
+    return sink.rows_written
+
+
+def read_rows(filename: str) -> List[Dict]:
+    """
+    Read the rows of a previous export, choosing the reader from the file extension.
+
+    Args:
+        filename: CSV, Parquet (.parquet) or Arrow IPC (.arrow) file
+
+    Returns:
+        List of row dictionaries
+    """
+    if filename.endswith('.parquet'):
+        require_output_format('parquet')
+        return pq.read_table(filename).to_pylist()
+    if filename.endswith('.arrow'):
+        require_output_format('arrow')
+        with pa_ipc.open_file(filename) as reader:
+            return reader.read_all().to_pylist()
+    with open(filename, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def iter_rows(filename: str, batch_rows: int = DEFAULT_ROW_GROUP_ROWS) -> Iterator[Dict]:
+    """
+    Stream the rows of a previous export, choosing the reader from the file extension.
+
+    Parquet and Arrow IPC files are memory-mapped and converted one batch at a
+    time, so only the current batch is held as Python objects.
+
+    Args:
+        filename: CSV, Parquet (.parquet) or Arrow IPC (.arrow) file
+        batch_rows: Rows converted at a time from a Parquet file
+
+    Yields:
+        Row dictionaries
+    """
+    if filename.endswith('.parquet'):
+        require_output_format('parquet')
+        for batch in pq.ParquetFile(filename, memory_map=True).iter_batches(batch_size=batch_rows):
+            yield from batch.to_pylist()
+        return
+    if filename.endswith('.arrow'):
+        require_output_format('arrow')
+        with pa.memory_map(filename) as source:
+            reader = pa_ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                yield from reader.get_batch(index).to_pylist()
+        return
+    with open(filename, 'r', newline='', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
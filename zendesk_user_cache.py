@@ -0,0 +1,116 @@
+"""
+Persistent Zendesk user cache.
+
+Authors rarely change between runs, so resolved users are kept in a small SQLite
+database keyed by user ID. Entries expire after a TTL, and the least recently
+used entries are evicted once the cache grows past its size limit.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable
+
+DEFAULT_TTL_HOURS = 168
+DEFAULT_MAX_ENTRIES = 50000
+
+
+class UserCache:
+    def __init__(self, path: str, ttl_hours: float = DEFAULT_TTL_HOURS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Open (or create) the on-disk user cache.
+
+        Args:
+            path: SQLite database file
+            ttl_hours: Hours after which a cached user is fetched again
+            max_entries: Maximum number of users kept; least recently used go first
+        """
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL DEFAULT '',
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS users_accessed_at ON users (accessed_at)")
+        self._conn.commit()
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Look up users that are cached and not expired.
+
+        Args:
+            user_ids: User IDs to look up
+
+        Returns:
+            Dictionary mapping user ID to user information for every fresh hit
+        """
+        ids = list(set(user_ids))
+        users: Dict[int, Dict] = {}
+        if not ids:
+            return users
+
+        now = time.time()
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, name, email FROM users WHERE id IN ({placeholders}) AND fetched_at >= ?",
+                    (*chunk, now - self.ttl)
+                ).fetchall()
+                for user_id, name, email in rows:
+                    users[user_id] = {'name': name, 'id': user_id, 'email': email}
+
+            if users:
+                self._conn.executemany("UPDATE users SET accessed_at = ? WHERE id = ?",
+                                       [(now, user_id) for user_id in users])
+                self._conn.commit()
+
+            # Lookups come from several threads; count under the same lock
+            self.hits += len(users)
+            self.misses += len(ids) - len(users)
+        return users
+
+    def get(self, user_id: int) -> Dict:
+        """Look up a single user, returning an empty dictionary on a miss."""
+        return self.get_many([user_id]).get(user_id, {})
+
+    def put_many(self, users: Dict[int, Dict]) -> None:
+        """
+        Store freshly resolved users and enforce the size limit.
+
+        Args:
+            users: Dictionary mapping user ID to user information
+        """
+        if not users:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO users (id, name, email, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                [(user_id, user.get('name', 'Unknown Author'), user.get('email', ''), now, now)
+                 for user_id, user in users.items()]
+            )
+            self._conn.execute("DELETE FROM users WHERE fetched_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM users WHERE id NOT IN (SELECT id FROM users ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()